@@ -0,0 +1,142 @@
+import os
+import sys
+import csv
+import glob
+import time
+import shutil
+import signal
+import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+FIELDS = ("map", "status", "cost", "moves", "seconds")
+
+
+def parse_result(line):
+    """Separa uma linha ``N;E;...;custo`` em ``(movimentos, custo)``."""
+    parts = line.strip().split(";")
+    return ";".join(parts[:-1]), parts[-1]
+
+
+def _kill_job(proc, grace=5):
+    # SIGTERM no grupo do job: flia.cli repassa aos planejadores, que estao
+    # em sessoes proprias; quem nao sair em ``grace`` segundos leva SIGKILL.
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            break
+        try:
+            proc.communicate(timeout=grace)
+            break
+        except subprocess.TimeoutExpired:
+            pass
+
+
+def run_script(map_path, script, extra_args, timeout):
+    """Resolve um mapa com ``script`` num diretorio temporario proprio, para
+    que os domain.pddl/problem.pddl/sas_plan de jobs paralelos nunca se
+    choquem."""
+    workdir = tempfile.mkdtemp(prefix="flia-")
+    start = time.perf_counter()
+    try:
+        with open(map_path) as f:
+            proc = subprocess.Popen(
+                [sys.executable, os.path.join(REPO_DIR, script), *extra_args],
+                stdin=f, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                cwd=workdir, start_new_session=True,
+            )
+            try:
+                stdout, _ = proc.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                _kill_job(proc)
+                raise
+        status = proc.returncode
+        lines = [line for line in stdout.splitlines() if line.strip()]
+        moves, cost = parse_result(lines[-1]) if status == 0 and lines else ("", "")
+    except subprocess.TimeoutExpired:
+        status, moves, cost = "timeout", "", ""
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {"map": map_path, "status": status, "cost": cost, "moves": moves,
+            "seconds": round(time.perf_counter() - start, 3)}
+
+
+def run_native(map_path, optimal, corridors=None):
+    from flia.game_map import EnhancedGameMap
+    from flia.native import solve
+
+    start = time.perf_counter()
+    with open(map_path) as f:
+        game_map = EnhancedGameMap(f.read().splitlines())
+    plan = solve(game_map, optimal=optimal, corridors=corridors)
+    moves, cost = parse_result(plan) if plan is not None else ("", "")
+    return {"map": map_path, "status": 0 if plan is not None else 1, "cost": cost,
+            "moves": moves, "seconds": round(time.perf_counter() - start, 3)}
+
+
+def solve_all(paths, jobs=None, script="SAT.py", extra_args=(), timeout=None,
+              native=False, optimal=False, corridors=None):
+    """Resolve todos os mapas de ``paths`` em paralelo e devolve um dict de
+    resultado por mapa, na ordem de ``paths``."""
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        if native:
+            futures = {pool.submit(run_native, p, optimal, corridors): p for p in paths}
+        else:
+            futures = {pool.submit(run_script, p, script, list(extra_args), timeout): p
+                       for p in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                results[path] = future.result()
+            except Exception as exc:
+                results[path] = {"map": path, "status": f"error: {exc}", "cost": "",
+                                 "moves": "", "seconds": ""}
+    return [results[p] for p in paths]
+
+
+def print_table(rows, out=sys.stdout):
+    widths = {k: max(len(k), *(len(str(r[k])) for r in rows)) for k in FIELDS if k != "moves"}
+    header = "  ".join(k.ljust(widths[k]) for k in widths) + "  moves"
+    print(header, file=out)
+    for r in rows:
+        print("  ".join(str(r[k]).ljust(widths[k]) for k in widths) + "  " + r["moves"], file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve varios mapas em paralelo.")
+    parser.add_argument("patterns", nargs="+", help="arquivos ou globs, ex.: 'ent*.txt'")
+    parser.add_argument("--script", default="SAT.py", help="variante usada para cada mapa")
+    parser.add_argument("--jobs", type=int, default=None, help="processos (padrao: nucleos)")
+    parser.add_argument("--timeout", type=float, default=None, help="limite por mapa, em segundos")
+    parser.add_argument("--native", action="store_true", help="usa native_search em vez do planejador")
+    parser.add_argument("--optimal", action="store_true", help="com --native, busca custo minimo")
+    parser.add_argument("--corridors", action="store_true", default=None,
+                        help="com --native, atravessa corredores num passo so (padrao sem "
+                             "--optimal)")
+    parser.add_argument("--no-corridors", dest="corridors", action="store_false", default=None,
+                        help="com --native, anda celula a celula (padrao com --optimal)")
+    parser.add_argument("--csv", help="grava a tabela de resultados neste arquivo")
+    args, extra_args = parser.parse_known_args()
+
+    paths = sorted({p for pattern in args.patterns for p in glob.glob(pattern)})
+    if not paths:
+        parser.error("nenhum mapa encontrado")
+    rows = solve_all(paths, jobs=args.jobs, script=args.script, extra_args=extra_args,
+                     timeout=args.timeout, native=args.native, optimal=args.optimal,
+                     corridors=args.corridors)
+    print_table(rows)
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    if any(r["status"] != 0 for r in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
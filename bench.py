@@ -0,0 +1,236 @@
+import os
+import re
+import sys
+import glob
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+from flia.game_map import EnhancedGameMap
+from flia.encodings import ENCODINGS
+from flia.planner import PLANNERS, run_planner
+from flia.plan import plan_cost
+from flia.reachability import UnsolvableMap, prune_unreachable
+
+FIELDS = ("encoding", "map", "status", "gen_s", "objects", "init", "bytes",
+          "translate_s", "plan_s", "length", "cost")
+BASELINE = "bench_baseline.json"
+
+# Metricas comparadas com a linha de base: (limite relativo, folga absoluta).
+# Tempos oscilam, entao so contam quando crescem alem dos dois; tamanhos,
+# comprimento e custo do plano sao deterministicos.
+THRESHOLDS = {
+    "gen_s": (0.5, 0.01),
+    "translate_s": (0.25, 0.5),
+    "plan_s": (0.25, 0.5),
+    "objects": (0.0, 0),
+    "init": (0.0, 0),
+    "bytes": (0.05, 0),
+    "length": (0.0, 0),
+    "cost": (0.0, 0),
+}
+
+
+def problem_size(problem):
+    """``(objetos, fatos iniciais)`` de um problem.pddl."""
+    objects = 0
+    m = re.search(r"\(:objects([^()]*)\)", problem)
+    if m:
+        tokens = m.group(1).split()
+        objects = sum(1 for i, t in enumerate(tokens)
+                      if t != "-" and (i == 0 or tokens[i - 1] != "-"))
+    facts = 0
+    start = problem.find("(:init")
+    if start >= 0:
+        depth = 0
+        for c in problem[start:]:
+            if c == "(":
+                depth += 1
+                if depth == 2:
+                    facts += 1
+            elif c == ")":
+                depth -= 1
+                if depth == 0:
+                    break
+    return objects, facts
+
+
+def _median(values):
+    return round(statistics.median(values), 4) if values else ""
+
+
+def _best(values):
+    # a geracao e curta e so perde para ruido (GC, escalonador): vale o minimo
+    return round(min(values), 4) if values else ""
+
+
+def translate_time(planner, domain, problem):
+    """Segundos do tradutor do Fast Downward de ``planner`` sobre
+    domain/problem, sem passar pelo cache; None se ele falhar."""
+    with tempfile.TemporaryDirectory(prefix="flia-bench-") as tmp:
+        paths = []
+        for name, text in (("domain.pddl", domain), ("problem.pddl", problem)):
+            paths.append(os.path.join(tmp, name))
+            with open(paths[-1], "w") as f:
+                f.write(text)
+        comando = [PLANNERS[planner].path, "--sas-file", os.path.join(tmp, "output.sas"),
+                   "--translate", *paths]
+        start = time.perf_counter()
+        try:
+            result = subprocess.run(comando, capture_output=True, text=True)
+        except OSError:
+            return None
+        if result.returncode != 0:
+            return None
+        return time.perf_counter() - start
+
+
+def bench_encoding(name, map_path, trials=3, solve=False, planner=None, timeout=None):
+    """Mede uma codificacao num mapa: tempo de geracao (o menor de
+    ``trials``), tamanho do PDDL e, com ``solve``, o tradutor (uma vez, fora
+    do cache) e o planejador (mediana, com ``timeout`` segundos)."""
+    encoding = ENCODINGS[name]
+    row = {"encoding": name, "map": map_path, "status": "ok"}
+    with open(map_path) as f:
+        lines = f.read().splitlines()
+    times = []
+    try:
+        for _ in range(trials):
+            start = time.perf_counter()
+            game_map = prune_unreachable(EnhancedGameMap(lines, pastilhas=encoding.pastilhas),
+                                         per_kill=encoding.native is not None)
+            domain, problem = encoding.generate(game_map)
+            times.append(time.perf_counter() - start)
+    except UnsolvableMap:
+        row["status"] = "unsolvable"
+        return row
+    objects, facts = problem_size(problem)
+    row.update(gen_s=_best(times), objects=objects, init=facts,
+               bytes=len(domain.encode()) + len(problem.encode()))
+    if solve:
+        planner = planner or encoding.planner
+        if PLANNERS[planner].translate:
+            seconds = translate_time(planner, domain, problem)
+            row["translate_s"] = round(seconds, 4) if seconds is not None else ""
+        times = []
+        for _ in range(trials):
+            start = time.perf_counter()
+            run = run_planner(planner, name, domain, problem, timeout=timeout)
+            times.append(time.perf_counter() - start)
+            if run.timed_out or run.failed or run.reader.best is None:
+                row["status"] = ("timeout" if run.timed_out else
+                                 "failed" if run.failed else "no plan")
+                break
+        row["plan_s"] = _median(times)
+        if run.reader.best is not None:
+            plan = run.reader.best
+            row["length"] = len(plan.split(";")) - 1
+            row["cost"] = plan_cost(plan) if encoding.cost and not run.reader.uncosted else ""
+    return row
+
+
+def bench_native(map_path, trials=3, max_expansions=None):
+    """A busca nativa como mais uma "codificacao"; sem plano dentro de
+    ``max_expansions`` expansoes a linha fica com status "no plan"."""
+    from flia.native import solve
+
+    with open(map_path) as f:
+        game_map = EnhancedGameMap(f.read().splitlines())
+    row = {"encoding": "native", "map": map_path, "status": "ok"}
+    times = []
+    for _ in range(trials):
+        start = time.perf_counter()
+        plan = solve(game_map, max_expansions=max_expansions)
+        times.append(time.perf_counter() - start)
+    row["plan_s"] = _median(times)
+    if plan is None:
+        row["status"] = "no plan"
+    else:
+        row["length"] = len(plan.split(";")) - 1
+        row["cost"] = int(plan.rsplit(";", 1)[1])
+    return row
+
+
+def compare(rows, baseline, thresholds=THRESHOLDS):
+    """Lista de ``(encoding, mapa, metrica, antes, agora)`` que pioraram em
+    relacao a ``baseline`` (linhas salvas por uma execucao anterior)."""
+    before = {(r["encoding"], r["map"]): r for r in baseline}
+    regressions = []
+    for row in rows:
+        old = before.get((row["encoding"], row["map"]))
+        if old is None:
+            continue
+        for metric, (relative, absolute) in thresholds.items():
+            new_value, old_value = row.get(metric, ""), old.get(metric, "")
+            if new_value == "" or old_value == "":
+                continue
+            if new_value > old_value * (1 + relative) and new_value - old_value > absolute:
+                regressions.append((row["encoding"], row["map"], metric, old_value, new_value))
+        if old.get("status") == "ok" and row["status"] != "ok":
+            regressions.append((row["encoding"], row["map"], "status", "ok", row["status"]))
+    return regressions
+
+
+def print_table(rows, out=sys.stdout):
+    widths = {k: max(len(k), *(len(str(r.get(k, ""))) for r in rows)) for k in FIELDS}
+    print("  ".join(k.ljust(widths[k]) for k in FIELDS), file=out)
+    for r in rows:
+        print("  ".join(str(r.get(k, "")).ljust(widths[k]) for k in FIELDS), file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mede todas as codificacoes em todos os mapas e compara com a linha de base.")
+    parser.add_argument("patterns", nargs="*", default=["ent*.txt"],
+                        help="arquivos ou globs (padrao: ent*.txt)")
+    parser.add_argument("--encodings", nargs="+", choices=sorted(ENCODINGS), metavar="NOME",
+                        help="codificacoes medidas (padrao: todas)")
+    parser.add_argument("--trials", type=int, default=5, help="repeticoes por medida")
+    parser.add_argument("--solve", action="store_true",
+                        help="tambem roda o planejador de cada codificacao")
+    parser.add_argument("--planner", choices=sorted(PLANNERS),
+                        help="com --solve, usa este planejador em todas")
+    parser.add_argument("--native", action="store_true", help="inclui a busca nativa")
+    parser.add_argument("--baseline", default=BASELINE,
+                        help=f"linha de base comparada (padrao: {BASELINE})")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="grava os resultados como nova linha de base")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+
+    paths = sorted({p for pattern in args.patterns for p in glob.glob(pattern)})
+    if not paths:
+        parser.error("nenhum mapa encontrado")
+    rows = []
+    for name in args.encodings or sorted(ENCODINGS):
+        for path in paths:
+            rows.append(bench_encoding(name, path, args.trials, args.solve, args.planner))
+    if args.native:
+        rows += [bench_native(path, args.trials) for path in paths]
+    print_table(rows)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=1)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(rows, f, indent=1)
+        return
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"sem linha de base em {args.baseline}; use --save-baseline", file=sys.stderr)
+        return
+    regressions = compare(rows, baseline)
+    for encoding, path, metric, old, new in regressions:
+        print(f"REGRESSAO {encoding} {path} {metric}: {old} -> {new}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""Nucleo comum das variantes do FLIA.
+
+Um unico leitor de mapas (``EnhancedGameMap``), um unico executor de
+planejadores (``chamar_planejador``) e um unico leitor de planos
+(``extract_moves``); as codificacoes PDDL ficam em ``flia.encodings`` e sao
+escolhidas pelo nome, ex.: ``python -m flia --encoding movG < ent.txt``.
+"""
+
+from .game_map import EnhancedGameMap
+from .plan import extract_moves
+from .planner import PLANNERS, chamar_planejador
+from .encodings import ENCODINGS, get_encoding, register
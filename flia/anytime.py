@@ -0,0 +1,34 @@
+import time
+
+from .plan import plan_cost
+from .planner import PLANNERS, run_planner
+
+# Primeiro um plano rapido, depois buscas que o melhoram. A ultima e otima:
+# se ela terminar dentro do prazo, o plano devolvido e otimo.
+ANYTIME_PHASES = ("lama-first-180", "lama-60", "fdss-2023-60")
+
+
+def solve_anytime(variante, domain, problem, budget, phases=ANYTIME_PHASES, on_plan=None):
+    """Roda ``phases`` em sequencia ate esgotar ``budget`` segundos.
+
+    Devolve ``(plano, custo, otimo)`` com o melhor plano achado ate o prazo
+    (``(None, None, False)`` se nenhum), mesmo que a ultima fase tenha sido
+    interrompida. ``on_plan(plano, custo)`` e chamado a cada melhora.
+    """
+    deadline = time.monotonic() + budget
+    best, best_cost, optimal = None, None, False
+    for name in phases:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        run = run_planner(name, variante, domain, problem, timeout=remaining)
+        for plan in run.reader.plans:
+            cost = plan_cost(plan)
+            if best is None or cost < best_cost:
+                best, best_cost = plan, cost
+                if on_plan is not None:
+                    on_plan(best, best_cost)
+        if PLANNERS[name].optimal and run.complete and run.reader.plans:
+            optimal = True
+            break
+    return best, best_cost, optimal
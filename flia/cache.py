@@ -0,0 +1,196 @@
+import os
+import re
+import signal
+import json
+import time
+import hashlib
+import functools
+import threading
+import contextlib
+import subprocess
+
+CACHE_DIR = os.environ.get(
+    "FLIA_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "flia")
+)
+
+
+def content_hash(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:20]
+
+
+def write_once(path, text):
+    """Grava ``text`` em ``path`` se ele ainda nao existe. O arquivo e
+    renomeado para o lugar, entao execucoes concorrentes nunca veem um
+    arquivo pela metade."""
+    if os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+    return path
+
+
+def cached_domain(variant, domain):
+    """Caminho de ``domain`` no cache, pela variante e pelo conteudo."""
+    key = content_hash(variant, domain)
+    return write_once(os.path.join(CACHE_DIR, "domains", f"{variant}-{key}.pddl"), domain)
+
+
+def cached_problem(variant, domain, problem):
+    key = content_hash(variant, domain, problem)
+    return write_once(os.path.join(CACHE_DIR, "problems", f"{variant}-{key}.pddl"), problem)
+
+
+def cached_translation(planner, variant, domain, problem, timeout=None, track=None):
+    """Roda o tradutor do Fast Downward uma vez por (planejador, variante,
+    domain, problem) e devolve o caminho do ``output.sas`` guardado; as
+    execucoes seguintes vao direto para a busca. Devolve None se o tradutor
+    falhar. Passados ``timeout`` segundos o tradutor e encerrado (com o
+    grupo de processos) e sobe ``subprocess.TimeoutExpired``; ``track(proc)``
+    e um gerenciador de contexto em volta da espera, para quem precisa
+    encerrar o processo de fora."""
+    key = content_hash(planner, variant, domain, problem)
+    sas_file = os.path.join(CACHE_DIR, "sas", f"{variant}-{key}.sas")
+    if os.path.exists(sas_file):
+        return sas_file
+
+    domain_path = cached_domain(variant, domain)
+    problem_path = cached_problem(variant, domain, problem)
+    os.makedirs(os.path.dirname(sas_file), exist_ok=True)
+    tmp = f"{sas_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    comando = [planner, "--sas-file", tmp, "--translate", domain_path, problem_path]
+    try:
+        # Sessao propria: o driver roda o tradutor num processo filho, e o
+        # grupo inteiro e encerrado no estouro.
+        proc = subprocess.Popen(comando, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                start_new_session=True)
+    except OSError:
+        return None
+    with track(proc) if track is not None else contextlib.nullcontext():
+        try:
+            returncode = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(proc.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+            proc.wait()
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+    if returncode != 0 or not os.path.exists(tmp):
+        return None
+    os.replace(tmp, sas_file)
+    return sas_file
+
+
+PLAN_CACHE_ENTRIES = int(os.environ.get("FLIA_PLAN_CACHE_ENTRIES", "10000"))
+
+
+PDDL_COMMENT = re.compile(r";[^\n]*")
+
+
+def normalize_pddl(text):
+    """PDDL sem comentarios, em minusculas e com espacos colapsados, para
+    que mudancas so de formatacao nao troquem a chave."""
+    return " ".join(PDDL_COMMENT.sub("", text).lower().split())
+
+
+@functools.lru_cache(maxsize=16)
+def _domain_digest(domain):
+    # o dominio e grande e quase sempre o mesmo entre chamadas no processo
+    return content_hash(normalize_pddl(domain))
+
+
+def plan_key(encoding, domain, problem):
+    return content_hash(encoding, _domain_digest(domain), normalize_pddl(problem))
+
+
+def _plan_path(key):
+    return os.path.join(CACHE_DIR, "plans", f"{key}.json")
+
+
+def cached_plan(key):
+    """Entrada guardada para ``key`` ou None. A leitura renova a entrada na
+    ordem LRU (mtime do arquivo)."""
+    path = _plan_path(key)
+    try:
+        with open(path) as f:
+            entry = json.load(f)
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+    return entry
+
+
+def _better(new, old):
+    if old is None or (new["optimal"] and not old["optimal"]):
+        return True
+    if old["optimal"] or new["cost"] is None:
+        return False
+    return old["cost"] is None or new["cost"] < old["cost"]
+
+
+def _grid_path(grid):
+    return os.path.join(CACHE_DIR, "grids", f"{grid}.key")
+
+
+def grid_plan_key(grid):
+    """Chave de plano registrada para a chave de mapa ``grid`` (ver
+    ``store_plan``), ou None. Serve para achar um plano sem gerar o PDDL."""
+    try:
+        with open(_grid_path(grid)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def store_plan(key, moves, cost=None, optimal=False, planner=None, stats=None,
+               max_entries=PLAN_CACHE_ENTRIES, grid=None):
+    """Guarda o plano de ``key`` se ele for melhor que o ja guardado e
+    remove as entradas menos usadas alem de ``max_entries``. Com ``grid``
+    tambem registra ``key`` para essa chave de mapa."""
+    entry = {"moves": moves, "cost": cost, "optimal": optimal, "planner": planner,
+             "stats": stats or {}, "stored": time.time()}
+    if grid is not None and grid_plan_key(grid) != key:
+        path = _grid_path(grid)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(key)
+        os.replace(tmp, path)
+    if not _better(entry, cached_plan(key)):
+        return
+    path = _plan_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)
+    evict_plans(max_entries)
+
+
+def evict_plans(max_entries=PLAN_CACHE_ENTRIES):
+    directory = os.path.dirname(_plan_path(""))
+    entries = []
+    with os.scandir(directory) as it:
+        for item in it:
+            if item.name.endswith(".json"):
+                try:
+                    entries.append((item.stat().st_mtime, item.path))
+                except OSError:
+                    pass
+    if len(entries) <= max_entries:
+        return
+    entries.sort()
+    for _, path in entries[:len(entries) - max_entries]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,240 @@
+import sys
+import signal
+import argparse
+import subprocess
+
+from .game_map import EnhancedGameMap
+from .encodings import ENCODINGS, get_encoding
+from .planner import PLANNERS, chamar_planejador, run_planner, stop_all
+from .plan import PlanReader, plan_cost
+from .cache import plan_key, cached_plan, store_plan, content_hash, cached_domain, cached_problem
+from .symmetry import cached_symmetric_plan, grid_key
+from .reachability import UnsolvableMap, prune_unreachable
+from .anytime import solve_anytime
+from .portfolio import race
+from .profiling import Profile
+from .validate import validate_plan
+from .mcts import solve_mcts
+
+
+def main(encoding="SAT", argv=None):
+    parser = argparse.ArgumentParser(description="Resolve um mapa lido da entrada padrao.")
+    parser.add_argument("--encoding", default=encoding, choices=sorted(ENCODINGS),
+                        help=f"codificacao PDDL (padrao: {encoding})")
+    parser.add_argument("--grounded", action="store_true",
+                        help="usa a versao pre-instanciada da codificacao")
+    parser.add_argument("--compact-ghosts", action="store_true",
+                        help="move cada fantasma azul/verde numa acao propria, sem os forall "
+                             "cubicos do ghost-turn")
+    parser.add_argument("--planner", choices=sorted(PLANNERS),
+                        help="troca o planejador da codificacao, ex.: lama-60 (anytime)")
+    parser.add_argument("--first-plan", action="store_true",
+                        help="encerra o planejador no primeiro plano encontrado")
+    parser.add_argument("--budget", type=float, metavar="SEGUNDOS",
+                        help="modo anytime: melhora o plano ate o prazo e devolve o melhor")
+    parser.add_argument("--race", action="store_true",
+                        help="roda varios planejadores em paralelo; com --budget fica com o "
+                             "mais barato ate o prazo, senao com o primeiro plano")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="com --race, quantos planejadores ao mesmo tempo (padrao: nucleos)")
+    parser.add_argument("--mcts", type=float, metavar="SEGUNDOS",
+                        help="se o planejador nao achar plano (ex.: estourou o tempo), procura "
+                             "um com MCTS nas regras de flia.native por ate SEGUNDOS")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="sempre chama o planejador (o plano ainda e guardado no cache)")
+    parser.add_argument("--profile", nargs="?", const="-", metavar="ARQUIVO",
+                        help="mede cada fase e grava um registro JSON por execucao no "
+                             "ARQUIVO (padrao: saida de erro)")
+    args = parser.parse_args(argv)
+
+    name = args.encoding + "-grounded" if args.grounded else args.encoding
+    if name not in ENCODINGS:
+        parser.error(f"a codificacao {args.encoding} nao tem versao pre-instanciada")
+    if args.compact_ghosts:
+        name += "-compact"
+        if name not in ENCODINGS:
+            parser.error(f"a codificacao {args.encoding} nao tem versao compacta do ghost-turn")
+    encoding = get_encoding(name)
+    if args.mcts is not None and encoding.native is None:
+        parser.error(f"--mcts so vale para codificacoes com as regras de flia.native, "
+                     f"nao {name}")
+    signal.signal(signal.SIGTERM, _encerrar)
+    profile = Profile()
+    profile.fields.update(encoding=encoding.name, cache="miss")
+
+    with profile.phase("parse"):
+        lines = [line.rstrip('\n') for line in sys.stdin]
+        game_map = EnhancedGameMap(lines, pastilhas=encoding.pastilhas)
+        try:
+            game_map = prune_unreachable(game_map, per_kill=encoding.native is not None)
+        except UnsolvableMap as exc:
+            print(f"Mapa sem solucao: {exc}", file=sys.stderr)
+            sys.exit(1)
+    profile.fields.update(map=content_hash(*lines), cells=len(game_map.cells),
+                          ghosts=len(game_map.ghosts))
+    with profile.phase("generate"):
+        domain, problem = encoding.generate(game_map)
+
+    if "pddl" in encoding.echo:
+        print("----- Conteúdo do domain.pddl -----")
+        print(domain)
+        print("----- Conteúdo do problem.pddl -----")
+        print(problem)
+
+    with profile.phase("cache"):
+        key = plan_key(encoding.name, domain, problem)
+        grade = grid_key(encoding.name, game_map.grid, game_map.pastilhas)
+        cached = None if args.no_cache else cached_plan(key)
+        if cached is not None and _descartar(encoding, game_map, cached, "do cache"):
+            cached = None
+        if cached is not None:
+            profile.fields["cache"] = "hit"
+        elif not args.no_cache:
+            cached = cached_symmetric_plan(encoding, game_map)
+            if cached is not None and _descartar(encoding, game_map, cached, "simetrico"):
+                cached = None
+            if cached is not None:
+                profile.fields["cache"] = "symmetric"
+                store_plan(key, cached["moves"], cached["cost"], cached["optimal"],
+                           cached["planner"], cached["stats"], grid=grade)
+    if cached is not None and (args.budget is None or args.race or cached["optimal"]):
+        _terminar(args, profile, cached["moves"], cached["cost"], encoding)
+        return
+
+    stats = None
+    if args.race:
+        with profile.phase("search"):
+            movimentos, custo, planner = race(encoding.name, domain, problem,
+                                              budget=args.budget, jobs=args.jobs)
+        otimo = False
+        if movimentos is None and args.mcts is None:
+            print("Nenhum planejador encontrou plano.", file=sys.stderr)
+            sys.exit(1)
+        if movimentos is not None:
+            print(f"vencedor {planner}, custo {custo if custo is not None else '?'}",
+                  file=sys.stderr)
+    elif args.budget is not None:
+        with profile.phase("search"):
+            movimentos, custo, otimo = solve_anytime(encoding.name, domain, problem, args.budget)
+        planner = "anytime"
+        if movimentos is None and cached is None and args.mcts is None:
+            print("Nenhum plano encontrado dentro do prazo.", file=sys.stderr)
+            sys.exit(1)
+        if movimentos is not None:
+            print(f"custo {custo}, {'otimo' if otimo else 'nao provado otimo'}", file=sys.stderr)
+    else:
+        on_line = None
+        if "output" in encoding.echo:
+            print("Saída completa do planejador:", flush=True)
+            on_line = sys.stdout.write
+        planner = args.planner or encoding.planner
+        estourou = False
+        if args.profile:
+            # Feitos aqui so para serem medidos; o planejador acha tudo no cache.
+            with profile.phase("write"):
+                cached_domain(encoding.name, domain)
+                cached_problem(encoding.name, domain, problem)
+            if PLANNERS[planner].translate:
+                with profile.phase("translate"):
+                    try:
+                        PLANNERS[planner].translate_sas(encoding.name, domain, problem)
+                    except subprocess.TimeoutExpired as exc:
+                        print(f"o tradutor passou do limite de {exc.timeout:g}s", file=sys.stderr)
+                        estourou = True
+        with profile.phase("search"):
+            if estourou:
+                # sem traducao nao ha busca; segue como um planejador sem plano
+                reader = PlanReader()
+            elif args.mcts is None:
+                reader = chamar_planejador(planner, encoding.name, domain, problem,
+                                           on_line=on_line, first_plan=args.first_plan)
+            else:
+                # com --mcts, falha ou estouro de tempo do planejador nao encerram
+                run = run_planner(planner, encoding.name, domain, problem,
+                                  on_line=on_line, first_plan=args.first_plan)
+                reader = run.reader
+                if run.failed:
+                    print(f"{planner} falhou (codigo {run.returncode})", file=sys.stderr)
+        movimentos, stats = reader.best, reader.stats
+        profile.fields["fd"] = stats
+        if movimentos is None and args.mcts is None:
+            _terminar(args, profile, "", None, encoding)
+            return
+        custo = None if movimentos is None or reader.uncosted else plan_cost(movimentos)
+        otimo = PLANNERS[planner].optimal and not args.first_plan
+
+    if movimentos is None and args.mcts is not None:
+        with profile.phase("mcts"):
+            movimentos = solve_mcts(game_map, args.mcts)
+        planner, otimo = "mcts", False
+        if movimentos is None:
+            if cached is None:
+                print("Nenhum plano encontrado, nem com MCTS.", file=sys.stderr)
+                sys.exit(1)
+        else:
+            custo = plan_cost(movimentos) if encoding.native == "costs" else None
+            print(f"plano do MCTS, custo {plan_cost(movimentos)}", file=sys.stderr)
+
+    profile.fields["planner"] = planner
+    guardar = movimentos is not None
+    if movimentos is not None:
+        with profile.phase("validate"):
+            erro = _invalido(encoding, game_map, movimentos.rsplit(";", 1)[0], custo)
+        if erro is not None and planner != "mcts":
+            # No PDDL matar e uma acao opcional e em flia.native e forcado ao
+            # encostar: o plano do planejador ainda e impresso, so nao vai
+            # para o cache.
+            print(f"Aviso: plano de {planner} nao confere com flia.native: {erro}",
+                  file=sys.stderr)
+            guardar = False
+        elif erro is not None:
+            print(f"Plano invalido de {planner}: {erro}", file=sys.stderr)
+            if cached is None:
+                sys.exit(1)
+            movimentos = custo = None
+    with profile.phase("extract"):
+        if movimentos is not None:
+            movimentos = movimentos.rsplit(";", 1)[0]
+            if guardar:
+                store_plan(key, movimentos, custo, otimo, planner, stats, grid=grade)
+        if cached is not None and (movimentos is None or cached["cost"] is not None
+                                   and (custo is None or cached["cost"] < custo)):
+            movimentos, custo = cached["moves"], cached["cost"]
+    _terminar(args, profile, movimentos, custo, encoding)
+
+
+def _encerrar(signum, frame):
+    # Morto por SIGTERM (ex.: timeout do batch.py), leva junto os planejadores,
+    # que rodam em sessoes proprias.
+    stop_all()
+    sys.exit(128 + signum)
+
+
+def _invalido(encoding, game_map, movimentos, custo):
+    """Por que o plano nao vale no mapa segundo flia.validate, ou None; so
+    confere codificacoes com as regras de flia.native."""
+    if encoding.native is None:
+        return None
+    plano = f"{movimentos};{custo if custo is not None else ''}"
+    return validate_plan(game_map, plano, check_cost=encoding.native == "costs")[1]
+
+
+def _descartar(encoding, game_map, cached, origem):
+    erro = _invalido(encoding, game_map, cached["moves"], cached["cost"])
+    if erro is not None:
+        print(f"Plano {origem} descartado: {erro}", file=sys.stderr)
+    return erro is not None
+
+
+def _terminar(args, profile, movimentos, custo, encoding):
+    print(_saida(movimentos, custo, encoding))
+    if args.profile:
+        profile.fields.update(cost=custo, plan_length=len(movimentos.split(";")) if movimentos else 0)
+        profile.write(args.profile)
+
+
+def _saida(movimentos, custo, encoding):
+    """Linha final ``N;S;...;custo``; codificacoes sem custo relatam 0."""
+    if not encoding.cost or custo is None:
+        custo = 0
+    return f"{movimentos};{custo}"
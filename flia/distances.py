@@ -0,0 +1,150 @@
+import os
+import threading
+from array import array
+from collections import OrderedDict, deque
+
+try:
+    import numpy as np
+except ImportError:     # sem NumPy as linhas sao array('H'), calculadas sob demanda
+    np = None
+
+from .cache import CACHE_DIR, content_hash
+from .ice import slide_table, MOVE, DUMMY, BOUNCE
+
+UNREACHABLE = 0xFFFF
+# Ate quantas celulas a matriz inteira (uint16, n*n) e calculada de uma vez.
+DENSE_LIMIT = 1024
+MEMORY_TABLES = 8
+
+
+def map_key(game_map):
+    """Hash do grid; paredes, portais e gelo definem as distancias."""
+    return content_hash(*("".join(row) for row in game_map.grid))
+
+
+def move_graph(game_map):
+    """Celulas alcancadas com uma acao do Pac-Man a partir de cada celula:
+    passo (saindo do outro lado do portal), deslize e deslize duplo, como
+    em ice.slide_table. Ficar parado nao conta."""
+    partner = [-1] * len(game_map.cells)
+    if len(game_map.portals) == 2:
+        p1, p2 = (game_map.cell_id[pos] for pos in game_map.portals)
+        partner[p1], partner[p2] = p2, p1
+    slides = slide_table(game_map)
+    graph = []
+    for c in range(len(game_map.cells)):
+        targets = []
+        for slide in slides[4 * c:4 * c + 4]:
+            if slide is None or slide[0] in (DUMMY, BOUNCE):
+                continue
+            to = slide[2]
+            if slide[0] == MOVE and partner[to] >= 0:
+                to = partner[to]
+            if to not in targets:
+                targets.append(to)
+        graph.append(tuple(targets))
+    return graph
+
+
+class DistanceTable:
+    """Menor numero de acoes do Pac-Man entre duas celulas (ids de
+    ``game_map.cells``), ignorando fantasmas; UNREACHABLE se nao ha
+    caminho. O grafo e dirigido: o gelo e os portais nao valem nos dois
+    sentidos.
+
+    Com NumPy e ate DENSE_LIMIT celulas a matriz ``uint16`` inteira e
+    calculada na criacao (``matrix``); senao cada linha e uma BFS feita na
+    primeira consulta e guardada.
+    """
+
+    def __init__(self, game_map, dense=None, matrix=None):
+        self.graph = move_graph(game_map)
+        self.size = len(self.graph)
+        if dense is None:
+            dense = np is not None and self.size <= DENSE_LIMIT
+        self.matrix = matrix
+        self._rows = {}
+        if dense and matrix is None:
+            self.matrix = np.empty((self.size, self.size), np.uint16)
+            for source in range(self.size):
+                self.matrix[source] = np.frombuffer(self._bfs(source), np.uint16)
+
+    def _bfs(self, source):
+        dist = array('H', [UNREACHABLE]) * self.size
+        dist[source] = 0
+        queue = deque([source])
+        graph = self.graph
+        while queue:
+            cell = queue.popleft()
+            step = dist[cell] + 1
+            for nxt in graph[cell]:
+                if dist[nxt] == UNREACHABLE:
+                    dist[nxt] = step
+                    queue.append(nxt)
+        return dist
+
+    def row(self, source):
+        """Distancias de ``source`` a todas as celulas."""
+        if self.matrix is not None:
+            return self.matrix[source]
+        dist = self._rows.get(source)
+        if dist is None:
+            dist = self._rows[source] = self._bfs(source)
+        return dist
+
+    def distance(self, a, b):
+        return int(self.row(a)[b])
+
+    def via(self, start, stop, goal):
+        """Acoes de ``start`` ate ``goal`` passando por ``stop`` (ex.: pegar
+        uma fruta antes de um fantasma)."""
+        first, second = self.distance(start, stop), self.distance(stop, goal)
+        if first == UNREACHABLE or second == UNREACHABLE:
+            return UNREACHABLE
+        return first + second
+
+    def nearest_via(self, start, stops, goal):
+        """O menor ``via`` entre as paradas ``stops``; UNREACHABLE se nenhuma
+        serve."""
+        return min((self.via(start, stop, goal) for stop in stops), default=UNREACHABLE)
+
+
+_tables = OrderedDict()
+_lock = threading.Lock()
+
+
+def _matrix_path(key):
+    return os.path.join(CACHE_DIR, "distances", f"{key}.npy")
+
+
+def distance_table(game_map):
+    """DistanceTable de ``game_map``, reaproveitada por hash do grid: em
+    memoria (as MEMORY_TABLES mais recentes) e, quando densa, tambem no
+    cache em disco, ao lado dos planos."""
+    key = map_key(game_map)
+    with _lock:
+        table = _tables.get(key)
+        if table is not None:
+            _tables.move_to_end(key)
+            return table
+    table = None
+    path = _matrix_path(key)
+    if np is not None and len(game_map.cells) <= DENSE_LIMIT:
+        try:
+            matrix = np.load(path)
+        except (OSError, ValueError):
+            matrix = None
+        if matrix is not None and matrix.shape == (len(game_map.cells),) * 2:
+            table = DistanceTable(game_map, matrix=matrix)
+    if table is None:
+        table = DistanceTable(game_map)
+        if table.matrix is not None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npy"
+            np.save(tmp, table.matrix)
+            os.replace(tmp, path)
+    with _lock:
+        _tables[key] = table
+        while len(_tables) > MEMORY_TABLES:
+            _tables.popitem(last=False)
+    return table
@@ -0,0 +1,42 @@
+"""Codificacoes PDDL do jogo, escolhidas pelo nome.
+
+Cada modulo registra a sua funcao ``generate_pddl(game_map)`` com
+``@register``, junto com o planejador usado e o que o script imprime.
+"""
+
+ENCODINGS = {}
+
+
+class Encoding:
+    def __init__(self, name, generate, planner, cost=False, pastilhas=True, echo=("output",),
+                 red_schedule=False, native=None):
+        self.name = name
+        self.generate = generate
+        self.planner = planner      # nome em flia.planner.PLANNERS
+        self.cost = cost            # relata o "Plan cost" do planejador (senao 0)
+        self.pastilhas = pastilhas  # o modelo tem pastilhas ('*')
+        self.echo = frozenset(echo) # "pddl" e/ou "output" sao impressos
+        # o vermelho segue detect_cycle_in_red_ghost_movement (SAT/movRN)
+        self.red_schedule = red_schedule
+        # o que flia.native reproduz (flia.validate confere os planos):
+        # "moves" so a legalidade, "costs" tambem o custo; None, nada
+        self.native = native
+
+
+def register(name, planner, **options):
+    def decorator(generate):
+        ENCODINGS[name] = Encoding(name, generate, planner, **options)
+        return generate
+    return decorator
+
+
+def get_encoding(name):
+    try:
+        return ENCODINGS[name]
+    except KeyError:
+        raise ValueError(
+            f"codificacao desconhecida: {name!r} (disponiveis: {', '.join(sorted(ENCODINGS))})"
+        ) from None
+
+
+from . import sat, movrn, movg, movg2, movg21, movr, movr2, movrtime, pacman_v3, pacman_v32, grounded, compact  # noqa: E402
@@ -0,0 +1,186 @@
+"""Variantes "-compact" das codificacoes que movem os fantasmas azul e verde
+numa unica acao ``ghost-turn``.
+
+Os efeitos ``forall (?g - ghost ?from - cell ?to - cell)`` do ``ghost-turn``
+sao instanciados pelo tradutor para todas as combinacoes fantasma x celula x
+celula, oito vezes. Aqui cada fantasma anda na sua propria acao
+``ghost-turn-<dir> ?g ?from ?to``, guiada por fatos estaticos
+``(ghost-step-<dir> ?g ?from ?to)`` calculados em Python (parado, se a
+celula nao tem vizinho na direcao), e o ``ghost-turn`` original so fecha o
+turno quando todo fantasma vivo ja andou. A instanciacao fica linear no numero
+de pares de celulas que cada fantasma alcanca.
+"""
+import re
+from functools import partial
+
+from . import ENCODINGS, register
+
+# Efeito de ghost-turn que move um fantasma de cor fixa, com os espacos ja
+# normalizados: (cor, direcao do Pac-Man, conexao seguida pelo fantasma).
+GHOST_RULE = re.compile(
+    r"\(forall \(\?g - ghost \?from - cell \?to - cell\) \(when \(and \(ghost-alive \?g\) "
+    r"\(ghost-type \?g ([\w-]+)\) \(ghost-at \?g \?from\) \(last-move-(\w+)\) "
+    r"\(connected-(\w+) \?from \?to\)\) \(and \(not \(ghost-at \?g \?from\)\) "
+    r"\(ghost-at \?g \?to\)\)\)\)$"
+)
+CONNECTED = re.compile(r"\(connected-(\w+) (\S+) (\S+)\)")
+GHOST_AT = re.compile(r"\(ghost-at (\S+) (\S+)\)")
+GHOST_TYPE = re.compile(r"\(ghost-type (\S+) (\S+)\)")
+
+
+def _skip_comment(text, i):
+    return text.index("\n", i) if "\n" in text[i:] else len(text)
+
+
+def _close(text, start):
+    """Indice logo depois do parentese que fecha o aberto em ``start``."""
+    depth = 0
+    i = start
+    while i < len(text):
+        c = text[i]
+        if c == ";":
+            i = _skip_comment(text, i)
+            continue
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise ValueError("parenteses desbalanceados")
+
+
+def _children(expr):
+    """Subexpressoes de primeiro nivel de ``(and ...)``, sem comentarios."""
+    out = []
+    i = 1
+    while i < len(expr) - 1:
+        c = expr[i]
+        if c == ";":
+            i = _skip_comment(expr, i)
+        elif c == "(":
+            end = _close(expr, i)
+            out.append(expr[i:end])
+            i = end
+        else:
+            i += 1
+    return out
+
+
+def _flat(expr):
+    expr = re.sub(r";[^\n]*", "", expr)
+    return re.sub(r"\(\s+", "(", re.sub(r"\s+\)", ")", re.sub(r"\s+", " ", expr))).strip()
+
+
+def split_ghost_turn(domain):
+    """Separa o ``ghost-turn`` de ``domain`` em ``(inicio, fim, precondicao,
+    regras, resto)``: ``regras`` mapeia ``(cor, direcao)`` na conexao que o
+    fantasma segue e ``resto`` sao os demais efeitos, mantidos no fechamento
+    do turno. Levanta ValueError se o dominio nao tem essa acao."""
+    start = domain.find("(:action ghost-turn\n")
+    if start < 0:
+        raise ValueError("o dominio nao tem a acao ghost-turn")
+    end = _close(domain, start)
+    action = domain[start:end]
+    pre = action.index("(", action.index(":precondition"))
+    precondition = action[pre:_close(action, pre)]
+    eff = action.index("(", action.index(":effect"))
+    rules, rest = {}, []
+    for child in _children(action[eff:_close(action, eff)]):
+        match = GHOST_RULE.match(_flat(child))
+        if match:
+            colour, move, connection = match.groups()
+            rules[colour, move] = connection
+        else:
+            rest.append(_flat(child))
+    if not rules:
+        raise ValueError("o ghost-turn nao move fantasmas azuis nem verdes")
+    return start, end, _flat(precondition), rules, rest
+
+
+def ghost_steps(problem, rules):
+    """Fatos ``(ghost-step-<dir> g from to)`` de cada fantasma com regra em
+    ``rules``, so para as celulas que ele alcanca a partir da inicial, e
+    ``(ghost-turns g)`` para esses fantasmas."""
+    links = {}
+    for connection, a, b in CONNECTED.findall(problem):
+        links.setdefault(connection, {})[a] = b
+    colour_of = dict(GHOST_TYPE.findall(problem))
+    facts = []
+    for ghost, start in GHOST_AT.findall(problem):
+        moves = [(move, links.get(connection, {})) for (colour, move), connection in rules.items()
+                 if colour == colour_of.get(ghost)]
+        if not moves:
+            continue
+        facts.append(f"(ghost-turns {ghost})")
+        seen = {start}
+        frontier = [start]
+        while frontier:
+            cell = frontier.pop()
+            for move, link in moves:
+                to = link.get(cell, cell)
+                facts.append(f"(ghost-step-{move} {ghost} {cell} {to})")
+                if to not in seen:
+                    seen.add(to)
+                    frontier.append(to)
+    return facts
+
+
+def compact_ghost_turn(domain, problem):
+    """Reescreve ``(domain, problem)`` trocando os ``forall`` do ghost-turn
+    por acoes parametrizadas por fantasma."""
+    start, end, precondition, rules, rest = split_ghost_turn(domain)
+    gate = precondition[5:-1] if precondition.startswith("(and ") else precondition
+    moves = sorted(set(move for _, move in rules), key=["north", "south", "east", "west"].index)
+
+    actions = []
+    for move in moves:
+        actions.append(f"""(:action ghost-turn-{move}
+    :parameters (?g - ghost ?from - cell ?to - cell)
+    :precondition (and {gate}
+         (last-move-{move})
+         (ghost-alive ?g)
+         (ghost-at ?g ?from)
+         (not (ghost-moved ?g))
+         (ghost-step-{move} ?g ?from ?to))
+    :effect (and
+         (not (ghost-at ?g ?from))
+         (ghost-at ?g ?to)
+         (ghost-moved ?g))
+  )
+  """)
+    effects = "\n         ".join(["(forall (?g - ghost) (not (ghost-moved ?g)))"] + rest)
+    actions.append(f"""(:action ghost-turn
+    :parameters ()
+    :precondition (and {gate}
+         (forall (?g - ghost)
+             (or (not (ghost-turns ?g)) (not (ghost-alive ?g)) (ghost-moved ?g))))
+    :effect (and
+         {effects})
+  )""")
+    domain = domain[:start] + "".join(actions) + domain[end:]
+
+    predicates = domain.index("(:predicates")
+    close = _close(domain, predicates) - 1
+    new = [f"(ghost-step-{move} ?g - ghost ?from ?to - cell)" for move in moves]
+    new += ["(ghost-turns ?g - ghost)", "(ghost-moved ?g - ghost)"]
+    domain = domain[:close] + "  " + "\n    ".join(new) + "\n  " + domain[close:]
+
+    init = problem.index("(:init")
+    close = _close(problem, init) - 1
+    problem = (problem[:close] + "  " + " ".join(ghost_steps(problem, rules)) + "\n  "
+               + problem[close:])
+    return domain, problem
+
+
+def _compact(generate, game_map):
+    return compact_ghost_turn(*generate(game_map))
+
+
+for _name in ("SAT", "movRN", "movG2", "movG21", "movR2", "movRtime"):
+    _base = ENCODINGS[_name]
+    register(_name + "-compact", planner=_base.planner, cost=_base.cost,
+             pastilhas=_base.pastilhas, echo=_base.echo, red_schedule=_base.red_schedule,
+             native=_base.native)(
+        partial(_compact, _base.generate))
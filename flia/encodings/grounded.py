@@ -0,0 +1,388 @@
+from functools import partial
+
+from ..native import GameRules, OPPOSITE, RED, GREEN, BLUE
+from ..ice import SLIDE_COSTS, MOVE, DUMMY, BOUNCE
+from . import register
+
+DIRECTION_WORDS = ("north", "south", "east", "west")
+COLOUR_NAMES = ("red-fruit", "green-fruit", "blue-fruit")
+
+
+class _Action:
+    def __init__(self, name, cost):
+        self.name = name
+        self.cost = cost
+        self.pre = []
+        self.eff = []
+
+    def require(self, *literals):
+        for literal in literals:
+            if literal not in self.pre:
+                self.pre.append(literal)
+
+    def render(self, action_costs):
+        effects = list(self.eff)
+        if action_costs and self.cost:
+            effects.append(f"(increase (total-cost) {self.cost})")
+        return (f"  (:action {self.name}\n"
+                f"    :parameters ()\n"
+                f"    :precondition (and {' '.join(self.pre)})\n"
+                f"    :effect (and {' '.join(effects)})\n"
+                f"  )")
+
+
+class GroundedEncoder:
+    """Escreve as regras de ``generate_pddl`` como um dominio plano, ja
+    instanciado.
+
+    A analise de ameaca dos fantasmas e feita aqui, a partir da conectividade
+    do mapa, entao nenhuma acao tem parametros e cada precondicao e uma
+    conjuncao simples de literais. A posicao de um fantasma carrega o estado
+    dele: ``danger-at`` enquanto pode matar o Pac-Man, ``safe-at`` enquanto a
+    fruta dele esta ativa, nada depois de morto. O fantasma vermelho da
+    sequencia e seguido pelo passo em vez da celula (``red-danger``/
+    ``red-safe``), ja que o passo define a celula.
+    """
+
+    def __init__(self, game_map, action_costs=True):
+        self.rules = GameRules(game_map)
+        self.action_costs = action_costs
+        rules = self.rules
+        self.n_cells = len(game_map.cells)
+        self.has_turn = any(c in (GREEN, BLUE) for c in rules.ghost_colours)
+        self.has_red = rules.red_index is not None
+        self.initial_points = set(i for i in range(self.n_cells) if rules.point_bit[i])
+        self.steps_from = {}
+        for s, (x, _) in enumerate(rules.red_moves):
+            self.steps_from.setdefault(x, []).append(s)
+        # Fantasmas vermelhos fora da sequencia nunca saem da celula inicial.
+        self.static_cell = {
+            i: cell for i, (cell, colour) in enumerate(rules.ghosts)
+            if colour == RED and i != rules.red_index
+        }
+        self.actions = []
+
+    # ----- nomes -----
+    def cell(self, i):
+        return f"c{i + 1}"
+
+    def ghost(self, i):
+        return f"ghost{i + 1}"
+
+    def step(self, s):
+        return f"step{s + 1}"
+
+    # ----- literais de ameaca -----
+    def no_danger(self, g, cell):
+        """Literais dizendo que o fantasma ``g`` nao ameaca ``cell``."""
+        if cell < 0:
+            return []
+        if g == self.rules.red_index:
+            return [f"(not (red-danger {self.step(s)}))" for s in self.steps_from.get(cell, [])]
+        if g in self.static_cell and self.static_cell[g] != cell:
+            return []
+        return [f"(not (danger-at {self.ghost(g)} {self.cell(cell)}))"]
+
+    def free_cell(self, cell):
+        literals = []
+        for g in range(len(self.rules.ghosts)):
+            literals += self.no_danger(g, cell)
+        return literals
+
+    def safe_landing(self, cell, d):
+        # Mesma checagem de dummy-move e slide da codificacao SAT.
+        table = self.rules.table
+        literals = []
+        for g, colour in enumerate(self.rules.ghost_colours):
+            if colour == BLUE:
+                literals += self.no_danger(g, table[4 * cell + d])
+            elif colour == GREEN:
+                literals += self.no_danger(g, table[4 * cell + OPPOSITE[d]])
+            else:
+                for x in self.rules.adjacent[cell]:
+                    literals += self.no_danger(g, x)
+        return literals
+
+    def safe_move(self, to, d):
+        rules = self.rules
+        table = rules.table
+        partner = rules.partner[to]
+        literals = self.free_cell(to)
+        if partner >= 0:
+            literals += self.free_cell(partner)
+        for g, colour in enumerate(rules.ghost_colours):
+            if colour == BLUE:
+                literals += self.no_danger(g, table[4 * to + d])
+            elif colour == GREEN:
+                literals += self.no_danger(g, table[4 * to + OPPOSITE[d]])
+            elif g == rules.red_index:
+                for s, (x, y) in enumerate(rules.red_moves):
+                    if y == to and (x in rules.adjacent[to] or x == partner):
+                        literals.append(f"(not (red-danger {self.step(s)}))")
+            if partner >= 0:
+                if colour == BLUE:
+                    literals += self.no_danger(g, table[4 * partner + OPPOSITE[d]])
+                elif colour == GREEN:
+                    literals += self.no_danger(g, table[4 * partner + d])
+                else:
+                    for x in rules.adjacent[partner]:
+                        literals += self.no_danger(g, x)
+        return literals
+
+    # ----- efeitos -----
+    def convert(self, g, source, target):
+        """Efeitos condicionais que passam cada posicao do fantasma ``g`` da
+        forma ``source`` (danger/safe) para ``target``."""
+        if g == self.rules.red_index:
+            return [f"(when (red-{source} {self.step(s)}) (and (not (red-{source} {self.step(s)})) "
+                    f"(red-{target} {self.step(s)})))" for s in range(len(self.rules.red_moves))]
+        cells = [self.static_cell[g]] if g in self.static_cell else range(self.n_cells)
+        gname = self.ghost(g)
+        return [f"(when ({source}-at {gname} {self.cell(c)}) (and (not ({source}-at {gname} {self.cell(c)})) "
+                f"({target}-at {gname} {self.cell(c)})))" for c in cells]
+
+    def after_pacman(self, action, d):
+        if self.has_red:
+            action.require("(not (red-pending))")
+        if self.has_turn:
+            action.require(*[f"(not (turn-{w}))" for w in DIRECTION_WORDS])
+            action.eff.append(f"(turn-{DIRECTION_WORDS[d]})")
+        if self.has_red:
+            action.eff.append("(red-pending)")
+
+    def fruit_variants(self, costs, to, points=True, fruit_eats=True):
+        """Gera ``(sufixo, custo, pre, eff)`` para as versoes padrao,
+        pastilha e fruta de uma acao que termina em ``to``."""
+        default_cost, point_cost, fruit_cost = costs
+        no_active = ["(not (fruit-mode))"]
+        has_point = points and to in self.initial_points
+        if has_point:
+            yield ("pastilha", point_cost, no_active + [f"(pastilha {self.cell(to)})"],
+                   [f"(not (pastilha {self.cell(to)}))"])
+            yield ("default", default_cost, no_active + [f"(not (pastilha {self.cell(to)}))"], [])
+        else:
+            yield ("default", default_cost, no_active, [])
+        eff = [f"(not (pastilha {self.cell(to)}))"] if has_point and fruit_eats else []
+        yield ("fruit", fruit_cost, ["(fruit-mode)"], eff)
+
+    def pickup(self, j):
+        rules = self.rules
+        colour = rules.fruits[j][1]
+        eff = [f"(not (fruit-left fruit{j + 1}))", f"(active {COLOUR_NAMES[colour]})", "(fruit-mode)"]
+        for g, c in enumerate(rules.ghost_colours):
+            if c == colour:
+                eff += self.convert(g, "danger", "safe")
+                eff.append(f"(when (not (dead {self.ghost(g)})) (hunted {self.ghost(g)}))")
+        return eff
+
+    # ----- acoes -----
+    def add_moves(self, c, d):
+        rules = self.rules
+        to = rules.table[4 * c + d]
+        word = DIRECTION_WORDS[d]
+        pacman_to = rules.partner[to] if rules.partner[to] >= 0 else to
+        fruit_here = [j for j, (cell, _) in enumerate(rules.fruits) if cell == to]
+        threat = self.safe_move(to, d)
+        for suffix, cost, pre, eff in self.fruit_variants((2, 1, 4), to):
+            cases = [("", [], [])]
+            if fruit_here:
+                j = fruit_here[0]
+                fruit_colour = rules.fruits[j][1]
+                other = [f"(not (hunted {self.ghost(g)}))"
+                         for g, col in enumerate(rules.ghost_colours) if col != fruit_colour]
+                cases = [("-take", [f"(fruit-left fruit{j + 1})"] + other, self.pickup(j)),
+                         ("", [f"(not (fruit-left fruit{j + 1}))"], [])]
+            for tag, extra_pre, extra_eff in cases:
+                action = _Action(f"move-{word}-{suffix}-{self.cell(c)}-{self.cell(to)}{tag}", cost)
+                action.require(f"(at-pacman {self.cell(c)})", *pre, *extra_pre, *threat)
+                action.eff += [f"(not (at-pacman {self.cell(c)}))", f"(at-pacman {self.cell(pacman_to)})"]
+                action.eff += eff + extra_eff
+                self.after_pacman(action, d)
+                self.actions.append(action)
+
+    def add_stay(self, kind, c, d, costs):
+        word = DIRECTION_WORDS[d]
+        landing = self.safe_landing(c, d)
+        for suffix, cost, pre, eff in self.fruit_variants(costs, c, points=False):
+            action = _Action(f"{kind}-{word}-{suffix}-{self.cell(c)}", cost)
+            action.require(f"(at-pacman {self.cell(c)})", *pre, *landing)
+            self.after_pacman(action, d)
+            self.actions.append(action)
+
+    def add_slide(self, kind, c, d, ice_cells, final, costs):
+        word = DIRECTION_WORDS[d]
+        checks = []
+        for cell in ice_cells + [final]:
+            checks += self.free_cell(cell)
+        checks += self.safe_landing(final, d)
+        for suffix, cost, pre, eff in self.fruit_variants(costs, final, fruit_eats=False):
+            action = _Action(f"{kind}-{word}-{suffix}-{self.cell(c)}-{self.cell(final)}", cost)
+            action.require(f"(at-pacman {self.cell(c)})", *pre, *checks)
+            action.eff += [f"(not (at-pacman {self.cell(c)}))", f"(at-pacman {self.cell(final)})"] + eff
+            self.after_pacman(action, d)
+            self.actions.append(action)
+
+    def add_pacman_actions(self):
+        for c in range(self.n_cells):
+            for d in range(4):
+                slide = self.rules.slides[4 * c + d]
+                if slide is None:
+                    continue
+                kind, passed, to = slide
+                if kind == MOVE:
+                    self.add_moves(c, d)
+                elif kind == DUMMY or kind == BOUNCE:
+                    self.add_stay(kind, c, d, SLIDE_COSTS[kind])
+                else:
+                    self.add_slide(kind, c, d, list(passed), to, SLIDE_COSTS[kind])
+
+    def add_ghost_actions(self):
+        rules = self.rules
+        table = rules.table
+        if self.has_turn:
+            for d, word in enumerate(DIRECTION_WORDS):
+                action = _Action(f"ghost-turn-{word}", 0)
+                action.require(f"(turn-{word})")
+                action.eff.append(f"(not (turn-{word}))")
+                for g, colour in enumerate(rules.ghost_colours):
+                    if colour not in (GREEN, BLUE):
+                        continue
+                    way = d if colour == GREEN else OPPOSITE[d]
+                    gname = self.ghost(g)
+                    for x in range(self.n_cells):
+                        y = table[4 * x + way]
+                        if y < 0:
+                            continue
+                        for flavour in ("danger", "safe"):
+                            action.eff.append(
+                                f"(when ({flavour}-at {gname} {self.cell(x)}) "
+                                f"(and (not ({flavour}-at {gname} {self.cell(x)})) "
+                                f"({flavour}-at {gname} {self.cell(y)})))")
+                self.actions.append(action)
+        if self.has_red:
+            action = _Action("move-red", 0)
+            action.require("(red-pending)")
+            action.eff.append("(not (red-pending))")
+            for s, nxt in enumerate(rules.red_next):
+                if nxt == s:
+                    continue
+                for flavour in ("danger", "safe"):
+                    action.eff.append(
+                        f"(when (red-{flavour} {self.step(s)}) "
+                        f"(and (not (red-{flavour} {self.step(s)})) (red-{flavour} {self.step(nxt)})))")
+            self.actions.append(action)
+
+    def add_kill_actions(self):
+        rules = self.rules
+        for g, colour in enumerate(rules.ghost_colours):
+            others = " ".join(f"(not (active {COLOUR_NAMES[c]}))" for c in (RED, GREEN, BLUE) if c != colour)
+            eff = [f"(dead {self.ghost(g)})", f"(not (active {COLOUR_NAMES[colour]}))",
+                   f"(when (and {others}) (not (fruit-mode)))"]
+            for other, c in enumerate(rules.ghost_colours):
+                if c != colour:
+                    continue
+                eff.append(f"(not (hunted {self.ghost(other)}))")
+                if other != g:
+                    eff += self.convert(other, "safe", "danger")
+            if g == rules.red_index:
+                places = [(self.step(s), x, f"(red-safe {self.step(s)})")
+                          for s, (x, _) in enumerate(rules.red_moves)]
+            else:
+                cells = [self.static_cell[g]] if g in self.static_cell else range(self.n_cells)
+                places = [(self.cell(x), x, f"(safe-at {self.ghost(g)} {self.cell(x)})") for x in cells]
+            # Como no generate_pddl, o vermelho nao morre devendo o move-red
+            # enquanto houver outro fantasma vivo; sendo o ultimo, o objetivo
+            # ja vale sem o passo dele.
+            guards = [("", [])]
+            if g == rules.red_index and len(rules.ghosts) > 1:
+                guards = [("", ["(not (red-pending))"]),
+                          ("-last", [f"(dead {self.ghost(other)})"
+                                     for other in range(len(rules.ghosts)) if other != g])]
+            for tag, x, fact in places:
+                for suffix, guard in guards:
+                    action = _Action(f"kill-ghost-{self.ghost(g)}-{tag}{suffix}", 0)
+                    action.require(f"(at-pacman {self.cell(x)})", fact, *guard)
+                    action.eff += [f"(not {fact})"] + eff
+                    self.actions.append(action)
+
+    def encode(self):
+        self.add_pacman_actions()
+        self.add_ghost_actions()
+        self.add_kill_actions()
+        rules = self.rules
+        game_map = rules.game_map
+
+        constants = [" ".join(self.cell(i) for i in range(self.n_cells)) + " - cell"]
+        if rules.ghosts:
+            constants.append(" ".join(self.ghost(g) for g in range(len(rules.ghosts))) + " - ghost")
+        if rules.fruits:
+            constants.append(" ".join(f"fruit{j + 1}" for j in range(len(rules.fruits))) + " - fruit")
+        constants.append(" ".join(COLOUR_NAMES) + " - colour")
+        if rules.red_moves:
+            constants.append(" ".join(self.step(s) for s in range(len(rules.red_moves))) + " - step")
+
+        requirements = ":strips :typing :negative-preconditions :conditional-effects"
+        if self.action_costs:
+            requirements += " :action-costs"
+        domain = "\n".join([
+            "(define (domain pacman-grounded)",
+            f"  (:requirements {requirements})",
+            "  (:types cell ghost fruit colour step)",
+            "  (:constants\n    " + "\n    ".join(constants) + "\n  )",
+            "  (:predicates",
+            "    (at-pacman ?c - cell)",
+            "    (danger-at ?g - ghost ?c - cell)",
+            "    (safe-at ?g - ghost ?c - cell)",
+            "    (red-danger ?s - step)",
+            "    (red-safe ?s - step)",
+            "    (hunted ?g - ghost)",
+            "    (dead ?g - ghost)",
+            "    (active ?f - colour)",
+            "    (fruit-mode)",
+            "    (fruit-left ?j - fruit)",
+            "    (pastilha ?c - cell)",
+            "    (turn-north) (turn-south) (turn-east) (turn-west)",
+            "    (red-pending)",
+            "  )",
+            "  (:functions (total-cost) - number)" if self.action_costs else "",
+            *[action.render(self.action_costs) for action in self.actions],
+            ")",
+        ])
+
+        init = [f"(at-pacman {self.cell(game_map.cell_id[game_map.pacman_pos])})"]
+        for g, (cell, _) in enumerate(rules.ghosts):
+            if g == rules.red_index:
+                init.append(f"(red-danger {self.step(0)})")
+            else:
+                init.append(f"(danger-at {self.ghost(g)} {self.cell(cell)})")
+        init += [f"(fruit-left fruit{j + 1})" for j in range(len(rules.fruits))]
+        init += [f"(pastilha {self.cell(c)})" for c in sorted(self.initial_points)]
+        if self.action_costs:
+            init.append("(= (total-cost) 0)")
+        goal = " ".join(f"(dead {self.ghost(g)})" for g in range(len(rules.ghosts)))
+
+        problem = "\n".join([
+            "(define (problem mapa-grounded)",
+            "  (:domain pacman-grounded)",
+            "  (:init",
+            "    " + "\n    ".join(init),
+            "  )",
+            f"  (:goal (and {goal}))",
+            "  (:metric minimize (total-cost))" if self.action_costs else "",
+            ")",
+            "",
+        ])
+        return domain, problem
+
+
+def generate_grounded_pddl(game_map, action_costs=True):
+    """Versao pre-instanciada de ``generate_pddl``: devolve ``(domain,
+    problem)`` com todas as acoes ja instanciadas para este mapa."""
+    return GroundedEncoder(game_map, action_costs).encode()
+
+
+register("SAT-grounded", planner="lama-first-180", cost=True, red_schedule=True,
+         native="costs")(
+    generate_grounded_pddl)
+register("movRN-grounded", planner="lama-first-30", cost=True, pastilhas=False, echo=(),
+         red_schedule=True, native="moves")(partial(generate_grounded_pddl, action_costs=False))
@@ -0,0 +1,377 @@
+from . import register
+
+
+@register("movG", planner="fdss-2023-60", echo=("pddl", "output"))
+def generate_pddl(game_map):
+    # Domínio com predicados direcionais e uso de custos de ação
+    domain_str = """(define (domain pacman-agile)
+  (:requirements :typing :negative-preconditions :conditional-effects :adl :action-costs)
+  (:types cell ghost fruit)
+  (:predicates
+    (at-pacman ?c - cell)
+    (ghost-at ?g - ghost ?c - cell)
+    (ghost-type ?g - ghost ?f - fruit)
+    (ghost-alive ?g - ghost)
+    (fruit-at ?f - fruit ?c - cell)
+    (active-fruit ?f - fruit)
+    (connected-north ?from ?to - cell)
+    (connected-south ?from ?to - cell)
+    (connected-east ?from ?to - cell)
+    (connected-west ?from ?to - cell)
+  )
+  (:functions (total-cost) - number)
+  
+  ;; Ação move-north
+  (:action move-north
+    :parameters (?from - cell ?to - cell)
+    :precondition (and 
+         (at-pacman ?from)
+         (connected-north ?from ?to)
+         (not (exists (?g - ghost)
+                    (and (ghost-at ?g ?to)
+                         (ghost-alive ?g)
+                         (not (exists (?f - fruit)
+                                     (and (active-fruit ?f) (ghost-type ?g ?f))))))
+         )
+    )
+    :effect (and 
+         ;; Movimento do Pac-Man
+         (not (at-pacman ?from))
+         (at-pacman ?to)
+         
+         ;; Eliminação de fantasmas caso o Pac-Man se mova para uma célula com fantasma e possua a fruta ativa correspondente.
+         (forall (?g - ghost)
+             (when (and (ghost-alive ?g) (ghost-at ?g ?to)
+                        (exists (?f - fruit)
+                                (and (active-fruit ?f) (ghost-type ?g ?f))))
+                   (not (ghost-alive ?g))
+             )
+         )
+         
+         ;; Movimento do fantasma azul: como o azul se move de forma contrária ao Pac-Man,
+         ;; para move-north ele se desloca para o sul.
+         (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+             (when (and (ghost-alive ?g)
+                        (ghost-type ?g blue-fruit)
+                        (ghost-at ?g ?gb_from)
+                        (connected-south ?gb_from ?gb_to))
+                   (and 
+                     (not (ghost-at ?g ?gb_from))
+                     (ghost-at ?g ?gb_to)
+                   )
+             )
+         )
+         
+         ;; Movimento do fantasma verde: o verde imita o movimento do Pac-Man.
+         ;; Assim, para move-north ele se desloca para o norte.
+         (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+             (when (and (ghost-alive ?g)
+                        (ghost-type ?g green-fruit)
+                        (ghost-at ?g ?gb_from)
+                        (connected-north ?gb_from ?gb_to))
+                   (and 
+                     (not (ghost-at ?g ?gb_from))
+                     (ghost-at ?g ?gb_to)
+                   )
+             )
+         )
+         
+         (increase (total-cost) 1)
+    )
+  )
+  
+  ;; Ação move-south
+  (:action move-south
+    :parameters (?from - cell ?to - cell)
+    :precondition (and 
+         (at-pacman ?from)
+         (connected-south ?from ?to)
+         (not (exists (?g - ghost)
+                    (and (ghost-at ?g ?to)
+                         (ghost-alive ?g)
+                         (not (exists (?f - fruit)
+                                     (and (active-fruit ?f) (ghost-type ?g ?f))))))
+         )
+    )
+    :effect (and 
+         ;; Movimento do Pac-Man
+         (not (at-pacman ?from))
+         (at-pacman ?to)
+         
+         ;; Eliminação de fantasmas se aplicável
+         (forall (?g - ghost)
+             (when (and (ghost-alive ?g) (ghost-at ?g ?to)
+                        (exists (?f - fruit)
+                                (and (active-fruit ?f) (ghost-type ?g ?f))))
+                   (not (ghost-alive ?g))
+             )
+         )
+         
+         ;; Movimento do fantasma azul: para move-south o azul se move para o norte.
+         (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+             (when (and (ghost-alive ?g)
+                        (ghost-type ?g blue-fruit)
+                        (ghost-at ?g ?gb_from)
+                        (connected-north ?gb_from ?gb_to))
+                   (and 
+                     (not (ghost-at ?g ?gb_from))
+                     (ghost-at ?g ?gb_to)
+                   )
+             )
+         )
+         
+         ;; Movimento do fantasma verde: imita o movimento do Pac-Man,
+         ;; para move-south ele se desloca para o sul.
+         (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+             (when (and (ghost-alive ?g)
+                        (ghost-type ?g green-fruit)
+                        (ghost-at ?g ?gb_from)
+                        (connected-south ?gb_from ?gb_to))
+                   (and 
+                     (not (ghost-at ?g ?gb_from))
+                     (ghost-at ?g ?gb_to)
+                   )
+             )
+         )
+         
+         (increase (total-cost) 1)
+    )
+  )
+  
+  ;; Ação move-east
+  (:action move-east
+    :parameters (?from - cell ?to - cell)
+    :precondition (and 
+         (at-pacman ?from)
+         (connected-east ?from ?to)
+         (not (exists (?g - ghost)
+                    (and (ghost-at ?g ?to)
+                         (ghost-alive ?g)
+                         (not (exists (?f - fruit)
+                                     (and (active-fruit ?f) (ghost-type ?g ?f))))))
+         )
+    )
+    :effect (and 
+         ;; Movimento do Pac-Man
+         (not (at-pacman ?from))
+         (at-pacman ?to)
+         
+         ;; Eliminação de fantasmas se aplicável
+         (forall (?g - ghost)
+             (when (and (ghost-alive ?g) (ghost-at ?g ?to)
+                        (exists (?f - fruit)
+                                (and (active-fruit ?f) (ghost-type ?g ?f))))
+                   (not (ghost-alive ?g))
+             )
+         )
+         
+         ;; Movimento do fantasma azul: para move-east, o azul se move para o oeste.
+         (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+             (when (and (ghost-alive ?g)
+                        (ghost-type ?g blue-fruit)
+                        (ghost-at ?g ?gb_from)
+                        (connected-west ?gb_from ?gb_to))
+                   (and 
+                     (not (ghost-at ?g ?gb_from))
+                     (ghost-at ?g ?gb_to)
+                   )
+             )
+         )
+         
+         ;; Movimento do fantasma verde: imita o movimento do Pac-Man,
+         ;; para move-east ele se desloca para o leste.
+         (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+             (when (and (ghost-alive ?g)
+                        (ghost-type ?g green-fruit)
+                        (ghost-at ?g ?gb_from)
+                        (connected-east ?gb_from ?gb_to))
+                   (and 
+                     (not (ghost-at ?g ?gb_from))
+                     (ghost-at ?g ?gb_to)
+                   )
+             )
+         )
+         
+         (increase (total-cost) 1)
+    )
+  )
+  
+  ;; Ação move-west
+  (:action move-west
+    :parameters (?from - cell ?to - cell)
+    :precondition (and 
+         (at-pacman ?from)
+         (connected-west ?from ?to)
+         (not (exists (?g - ghost)
+                    (and (ghost-at ?g ?to)
+                         (ghost-alive ?g)
+                         (not (exists (?f - fruit)
+                                     (and (active-fruit ?f) (ghost-type ?g ?f))))))
+         )
+    )
+    :effect (and 
+         ;; Movimento do Pac-Man
+         (not (at-pacman ?from))
+         (at-pacman ?to)
+         
+         ;; Eliminação de fantasmas se aplicável
+         (forall (?g - ghost)
+             (when (and (ghost-alive ?g) (ghost-at ?g ?to)
+                        (exists (?f - fruit)
+                                (and (active-fruit ?f) (ghost-type ?g ?f))))
+                   (not (ghost-alive ?g))
+             )
+         )
+         
+         ;; Movimento do fantasma azul: para move-west, o azul se move para o leste.
+         (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+             (when (and (ghost-alive ?g)
+                        (ghost-type ?g blue-fruit)
+                        (ghost-at ?g ?gb_from)
+                        (connected-east ?gb_from ?gb_to))
+                   (and 
+                     (not (ghost-at ?g ?gb_from))
+                     (ghost-at ?g ?gb_to)
+                   )
+             )
+         )
+         
+         ;; Movimento do fantasma verde: imita o movimento do Pac-Man,
+         ;; para move-west ele se desloca para o oeste.
+         (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+             (when (and (ghost-alive ?g)
+                        (ghost-type ?g green-fruit)
+                        (ghost-at ?g ?gb_from)
+                        (connected-west ?gb_from ?gb_to))
+                   (and 
+                     (not (ghost-at ?g ?gb_from))
+                     (ghost-at ?g ?gb_to)
+                   )
+             )
+         )
+         
+         (increase (total-cost) 1)
+    )
+  )
+  
+  ;; Ação eat-fruit-red
+  (:action eat-fruit-red
+    :parameters (?c - cell)
+    :precondition (and (at-pacman ?c) (fruit-at red-fruit ?c))
+    :effect (and 
+         (active-fruit red-fruit)
+         (not (fruit-at red-fruit ?c))
+         (forall (?f - fruit)
+             (when (not (= ?f red-fruit))
+                   (not (active-fruit ?f))
+             )
+         )
+         (increase (total-cost) 2)
+    )
+  )
+  
+  ;; Ação eat-fruit-green
+  (:action eat-fruit-green
+    :parameters (?c - cell)
+    :precondition (and (at-pacman ?c) (fruit-at green-fruit ?c))
+    :effect (and 
+         (active-fruit green-fruit)
+         (not (fruit-at green-fruit ?c))
+         (forall (?f - fruit)
+             (when (not (= ?f green-fruit))
+                   (not (active-fruit ?f))
+             )
+         )
+         (increase (total-cost) 2)
+    )
+  )
+  
+  ;; Ação eat-fruit-blue
+  (:action eat-fruit-blue
+    :parameters (?c - cell)
+    :precondition (and (at-pacman ?c) (fruit-at blue-fruit ?c))
+    :effect (and 
+         (active-fruit blue-fruit)
+         (not (fruit-at blue-fruit ?c))
+         (forall (?f - fruit)
+             (when (not (= ?f blue-fruit))
+                   (not (active-fruit ?f))
+             )
+         )
+         (increase (total-cost) 2)
+    )
+  )
+)"""
+
+    # Geração dos objetos e fatos para o problema:
+    cell_names = {}
+    cell_list = []
+    counter = 1
+    for coord in game_map.cells:
+        name = f"c{counter}"
+        cell_names[coord] = name
+        cell_list.append(name)
+        counter += 1
+
+    # Gerar fatos de conectividade para cada direção
+    connections = []
+    directions = {
+        'north': (0, -1, 'connected-north'),
+        'south': (0, 1, 'connected-south'),
+        'east': (1, 0, 'connected-east'),
+        'west': (-1, 0, 'connected-west')
+    }
+    for (x, y) in game_map.cells:
+        for d, (dx, dy, pred) in directions.items():
+            nx, ny = x + dx, y + dy
+            if (nx, ny) in cell_names:
+                connections.append(f"({pred} {cell_names[(x,y)]} {cell_names[(nx,ny)]})")
+
+    ghost_names = []
+    ghost_inits = []
+    for i, (x, y, symbol) in enumerate(game_map.ghosts):
+        gname = f"ghost{i+1}"
+        ghost_names.append(gname)
+        if symbol == 'R':
+            ghost_fruit = "red-fruit"
+        elif symbol == 'G':
+            ghost_fruit = "green-fruit"
+        elif symbol == 'B':
+            ghost_fruit = "blue-fruit"
+        else:
+            ghost_fruit = "red-fruit"
+        ghost_inits.append(f"(ghost-at {gname} {cell_names[(x,y)]})")
+        ghost_inits.append(f"(ghost-type {gname} {ghost_fruit})")
+        ghost_inits.append(f"(ghost-alive {gname})")
+
+    fruit_inits = []
+    for (x, y, symbol) in game_map.fruits:
+        if symbol == '!':
+            fruit_inits.append(f"(fruit-at red-fruit {cell_names[(x,y)]})")
+        elif symbol == '@':
+            fruit_inits.append(f"(fruit-at green-fruit {cell_names[(x,y)]})")
+        elif symbol == '$':
+            fruit_inits.append(f"(fruit-at blue-fruit {cell_names[(x,y)]})")
+
+    pacman_init = f"(at-pacman {cell_names[game_map.pacman_pos]})"
+    ghost_goals = [f"(not (ghost-alive {g}))" for g in ghost_names]
+
+    problem_str = f"""(define (problem mapa-agile)
+  (:domain pacman-agile)
+  (:objects
+    {" ".join(cell_list)} - cell
+    {" ".join(ghost_names)} - ghost
+    red-fruit green-fruit blue-fruit - fruit
+  )
+  (:init
+    {pacman_init}
+    {" ".join(connections)}
+    {" ".join(fruit_inits)}
+    {" ".join(ghost_inits)}
+    (= (total-cost) 0)
+  )
+  (:goal (and {" ".join(ghost_goals)}))
+  (:metric minimize (total-cost))
+)
+"""
+    return domain_str, problem_str
@@ -0,0 +1,633 @@
+from . import register
+
+
+@register("movR", planner="fdss-2023-60")
+def generate_pddl(game_map):
+    # Domínio com predicados direcionais e uso de custos de ação
+    domain_str = """(define (domain pacman-agile)
+  (:requirements :typing :negative-preconditions :conditional-effects :adl :action-costs)
+  (:types cell ghost fruit direction)
+  (:predicates
+    (at-pacman ?c - cell)
+    (ghost-at ?g - ghost ?c - cell)
+    (ghost-type ?g - ghost ?f - fruit)
+    (ghost-alive ?g - ghost)
+    (fruit-at ?f - fruit ?c - cell)
+    (active-fruit ?f - fruit)
+    (connected-north ?from ?to - cell)
+    (connected-south ?from ?to - cell)
+    (connected-east ?from ?to - cell)
+    (connected-west ?from ?to - cell)
+    (red-ghost-direction ?g - ghost ?d - direction)
+  )
+  (:functions (total-cost) - number)
+
+  ;; Ação move-north
+  (:action move-north
+    :parameters (?from - cell ?to - cell)
+    :precondition (and 
+      (at-pacman ?from)
+      (connected-north ?from ?to)
+      (not (exists (?g - ghost)
+             (and (ghost-at ?g ?to)
+                  (ghost-alive ?g)
+                  (not (exists (?f - fruit)
+                         (and (active-fruit ?f) (ghost-type ?g ?f))))))
+      )
+    )
+    :effect (and 
+      (not (at-pacman ?from))
+      (at-pacman ?to)
+      
+      ;; Eliminação de fantasmas (se Pac-Man possuir a fruta ativa correspondente)
+      (forall (?g - ghost)
+        (when (and (ghost-alive ?g) (ghost-at ?g ?to)
+                   (exists (?f - fruit)
+                     (and (active-fruit ?f) (ghost-type ?g ?f))))
+          (not (ghost-alive ?g))
+        )
+      )
+      
+      ;; Movimento do fantasma azul: para move-north, o azul se move para o sul.
+      (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g blue-fruit)
+                   (ghost-at ?g ?gb_from)
+                   (connected-south ?gb_from ?gb_to))
+          (and (not (ghost-at ?g ?gb_from)) (ghost-at ?g ?gb_to))
+        )
+      )
+      
+      ;; Movimento do fantasma verde: para move-north, o verde se move para o norte.
+      (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g green-fruit)
+                   (ghost-at ?g ?gb_from)
+                   (connected-north ?gb_from ?gb_to))
+          (and (not (ghost-at ?g ?gb_from)) (ghost-at ?g ?gb_to))
+        )
+      )
+      
+      ;; Movimento do fantasma vermelho (movimentação em sentido horário: east -> south -> west -> north)
+      ;; Se a direção atual for east:
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g east)
+                   (connected-east ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g east)
+                   (not (connected-east ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g east)) (red-ghost-direction ?g south))
+        )
+      )
+      ;; Se a direção atual for south:
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g south)
+                   (connected-south ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g south)
+                   (not (connected-south ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g south)) (red-ghost-direction ?g west))
+        )
+      )
+      ;; Se a direção atual for west:
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g west)
+                   (connected-west ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g west)
+                   (not (connected-west ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g west)) (red-ghost-direction ?g north))
+        )
+      )
+      ;; Se a direção atual for north:
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g north)
+                   (connected-north ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g north)
+                   (not (connected-north ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g north)) (red-ghost-direction ?g east))
+        )
+      )
+      
+      (increase (total-cost) 1)
+    )
+  )
+  
+  ;; Ação move-south
+  (:action move-south
+    :parameters (?from - cell ?to - cell)
+    :precondition (and 
+      (at-pacman ?from)
+      (connected-south ?from ?to)
+      (not (exists (?g - ghost)
+             (and (ghost-at ?g ?to)
+                  (ghost-alive ?g)
+                  (not (exists (?f - fruit)
+                         (and (active-fruit ?f) (ghost-type ?g ?f))))))
+      )
+    )
+    :effect (and 
+      (not (at-pacman ?from))
+      (at-pacman ?to)
+      
+      (forall (?g - ghost)
+        (when (and (ghost-alive ?g) (ghost-at ?g ?to)
+                   (exists (?f - fruit)
+                     (and (active-fruit ?f) (ghost-type ?g ?f))))
+          (not (ghost-alive ?g))
+        )
+      )
+      
+      (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g blue-fruit)
+                   (ghost-at ?g ?gb_from)
+                   (connected-north ?gb_from ?gb_to))
+          (and (not (ghost-at ?g ?gb_from)) (ghost-at ?g ?gb_to))
+        )
+      )
+      (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g green-fruit)
+                   (ghost-at ?g ?gb_from)
+                   (connected-south ?gb_from ?gb_to))
+          (and (not (ghost-at ?g ?gb_from)) (ghost-at ?g ?gb_to))
+        )
+      )
+      
+      ;; Movimento do fantasma vermelho (segue o mesmo padrão de move-north):
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g east)
+                   (connected-east ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g east)
+                   (not (connected-east ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g east)) (red-ghost-direction ?g south))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g south)
+                   (connected-south ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g south)
+                   (not (connected-south ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g south)) (red-ghost-direction ?g west))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g west)
+                   (connected-west ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g west)
+                   (not (connected-west ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g west)) (red-ghost-direction ?g north))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g north)
+                   (connected-north ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g north)
+                   (not (connected-north ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g north)) (red-ghost-direction ?g east))
+        )
+      )
+      
+      (increase (total-cost) 1)
+    )
+  )
+  
+  ;; Ação move-east
+  (:action move-east
+    :parameters (?from - cell ?to - cell)
+    :precondition (and 
+      (at-pacman ?from)
+      (connected-east ?from ?to)
+      (not (exists (?g - ghost)
+             (and (ghost-at ?g ?to)
+                  (ghost-alive ?g)
+                  (not (exists (?f - fruit)
+                         (and (active-fruit ?f) (ghost-type ?g ?f))))))
+      )
+    )
+    :effect (and 
+      (not (at-pacman ?from))
+      (at-pacman ?to)
+      
+      (forall (?g - ghost)
+        (when (and (ghost-alive ?g) (ghost-at ?g ?to)
+                   (exists (?f - fruit)
+                     (and (active-fruit ?f) (ghost-type ?g ?f))))
+          (not (ghost-alive ?g))
+        )
+      )
+      
+      (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g blue-fruit)
+                   (ghost-at ?g ?gb_from)
+                   (connected-west ?gb_from ?gb_to))
+          (and (not (ghost-at ?g ?gb_from)) (ghost-at ?g ?gb_to))
+        )
+      )
+      (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g green-fruit)
+                   (ghost-at ?g ?gb_from)
+                   (connected-east ?gb_from ?gb_to))
+          (and (not (ghost-at ?g ?gb_from)) (ghost-at ?g ?gb_to))
+        )
+      )
+      
+      ;; Movimento do fantasma vermelho (in-line):
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g east)
+                   (connected-east ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g east)
+                   (not (connected-east ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g east)) (red-ghost-direction ?g south))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g south)
+                   (connected-south ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g south)
+                   (not (connected-south ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g south)) (red-ghost-direction ?g west))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g west)
+                   (connected-west ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g west)
+                   (not (connected-west ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g west)) (red-ghost-direction ?g north))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g north)
+                   (connected-north ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g north)
+                   (not (connected-north ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g north)) (red-ghost-direction ?g east))
+        )
+      )
+      
+      (increase (total-cost) 1)
+    )
+  )
+  
+  ;; Ação move-west
+  (:action move-west
+    :parameters (?from - cell ?to - cell)
+    :precondition (and 
+      (at-pacman ?from)
+      (connected-west ?from ?to)
+      (not (exists (?g - ghost)
+             (and (ghost-at ?g ?to)
+                  (ghost-alive ?g)
+                  (not (exists (?f - fruit)
+                         (and (active-fruit ?f) (ghost-type ?g ?f))))))
+      )
+    )
+    :effect (and 
+      (not (at-pacman ?from))
+      (at-pacman ?to)
+      
+      (forall (?g - ghost)
+        (when (and (ghost-alive ?g) (ghost-at ?g ?to)
+                   (exists (?f - fruit)
+                     (and (active-fruit ?f) (ghost-type ?g ?f))))
+          (not (ghost-alive ?g))
+        )
+      )
+      
+      (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g blue-fruit)
+                   (ghost-at ?g ?gb_from)
+                   (connected-east ?gb_from ?gb_to))
+          (and (not (ghost-at ?g ?gb_from)) (ghost-at ?g ?gb_to))
+        )
+      )
+      (forall (?g - ghost ?gb_from - cell ?gb_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g green-fruit)
+                   (ghost-at ?g ?gb_from)
+                   (connected-west ?gb_from ?gb_to))
+          (and (not (ghost-at ?g ?gb_from)) (ghost-at ?g ?gb_to))
+        )
+      )
+      
+      ;; Movimento do fantasma vermelho (in-line):
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g east)
+                   (connected-east ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g east)
+                   (not (connected-east ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g east)) (red-ghost-direction ?g south))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g south)
+                   (connected-south ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g south)
+                   (not (connected-south ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g south)) (red-ghost-direction ?g west))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g west)
+                   (connected-west ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g west)
+                   (not (connected-west ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g west)) (red-ghost-direction ?g north))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g north)
+                   (connected-north ?r_from ?r_to))
+          (and (not (ghost-at ?g ?r_from)) (ghost-at ?g ?r_to))
+        )
+      )
+      (forall (?g - ghost ?r_from - cell ?r_to - cell)
+        (when (and (ghost-alive ?g)
+                   (ghost-type ?g red-fruit)
+                   (ghost-at ?g ?r_from)
+                   (red-ghost-direction ?g north)
+                   (not (connected-north ?r_from ?r_to)))
+          (and (not (red-ghost-direction ?g north)) (red-ghost-direction ?g east))
+        )
+      )
+      
+      (increase (total-cost) 1)
+    )
+  )
+  
+  ;; Ação eat-fruit-red
+  (:action eat-fruit-red
+    :parameters (?c - cell)
+    :precondition (and (at-pacman ?c) (fruit-at red-fruit ?c))
+    :effect (and 
+      (active-fruit red-fruit)
+      (not (fruit-at red-fruit ?c))
+      (forall (?f - fruit)
+         (when (not (= ?f red-fruit))
+           (not (active-fruit ?f))
+         )
+      )
+      (increase (total-cost) 2)
+    )
+  )
+  
+  ;; Ação eat-fruit-green
+  (:action eat-fruit-green
+    :parameters (?c - cell)
+    :precondition (and (at-pacman ?c) (fruit-at green-fruit ?c))
+    :effect (and 
+      (active-fruit green-fruit)
+      (not (fruit-at green-fruit ?c))
+      (forall (?f - fruit)
+         (when (not (= ?f green-fruit))
+           (not (active-fruit ?f))
+         )
+      )
+      (increase (total-cost) 2)
+    )
+  )
+  
+  ;; Ação eat-fruit-blue
+  (:action eat-fruit-blue
+    :parameters (?c - cell)
+    :precondition (and (at-pacman ?c) (fruit-at blue-fruit ?c))
+    :effect (and 
+      (active-fruit blue-fruit)
+      (not (fruit-at blue-fruit ?c))
+      (forall (?f - fruit)
+         (when (not (= ?f blue-fruit))
+           (not (active-fruit ?f))
+         )
+      )
+      (increase (total-cost) 2)
+    )
+  )
+)
+"""
+    # Geração dos objetos e fatos para o problema:
+    cell_names = {}
+    cell_list = []
+    counter = 1
+    for coord in game_map.cells:
+        name = f"c{counter}"
+        cell_names[coord] = name
+        cell_list.append(name)
+        counter += 1
+
+    # Gerar fatos de conectividade para cada direção
+    connections = []
+    directions = {
+        'north': (0, -1, 'connected-north'),
+        'south': (0, 1, 'connected-south'),
+        'east': (1, 0, 'connected-east'),
+        'west': (-1, 0, 'connected-west')
+    }
+    for (x, y) in game_map.cells:
+        for d, (dx, dy, pred) in directions.items():
+            nx, ny = x + dx, y + dy
+            if (nx, ny) in cell_names:
+                connections.append(f"({pred} {cell_names[(x,y)]} {cell_names[(nx,ny)]})")
+
+    ghost_names = []
+    ghost_inits = []
+    for i, (x, y, symbol) in enumerate(game_map.ghosts):
+        gname = f"ghost{i+1}"
+        ghost_names.append(gname)
+        if symbol == 'R':
+            ghost_fruit = "red-fruit"
+        elif symbol == 'G':
+            ghost_fruit = "green-fruit"
+        elif symbol == 'B':
+            ghost_fruit = "blue-fruit"
+        else:
+            ghost_fruit = "red-fruit"
+        ghost_inits.append(f"(ghost-at {gname} {cell_names[(x,y)]})")
+        ghost_inits.append(f"(ghost-type {gname} {ghost_fruit})")
+        ghost_inits.append(f"(ghost-alive {gname})")
+
+    fruit_inits = []
+    for (x, y, symbol) in game_map.fruits:
+        if symbol == '!':
+            fruit_inits.append(f"(fruit-at red-fruit {cell_names[(x,y)]})")
+        elif symbol == '@':
+            fruit_inits.append(f"(fruit-at green-fruit {cell_names[(x,y)]})")
+        elif symbol == '$':
+            fruit_inits.append(f"(fruit-at blue-fruit {cell_names[(x,y)]})")
+
+    pacman_init = f"(at-pacman {cell_names[game_map.pacman_pos]})"
+    ghost_goals = [f"(not (ghost-alive {g}))" for g in ghost_names]
+
+    problem_str = f"""(define (problem mapa-agile)
+  (:domain pacman-agile)
+  (:objects
+    {" ".join(cell_list)} - cell
+    {" ".join(ghost_names)} - ghost
+    red-fruit green-fruit blue-fruit - fruit
+  )
+  (:init
+    {pacman_init}
+    {" ".join(connections)}
+    {" ".join(fruit_inits)}
+    {" ".join(ghost_inits)}
+    (= (total-cost) 0)
+  )
+  (:goal (and {" ".join(ghost_goals)}))
+  (:metric minimize (total-cost))
+)
+"""
+    return domain_str, problem_str
@@ -0,0 +1,71 @@
+from array import array
+
+DIRECTION_NAMES = ("north", "south", "east", "west")
+DIRECTION_INDEX = {name: i for i, name in enumerate(DIRECTION_NAMES)}
+DIRECTION_DELTAS = ((0, -1), (0, 1), (1, 0), (-1, 0))
+NORTH, SOUTH, EAST, WEST = range(4)
+
+class EnhancedGameMap:
+    """Mapa lido de um ent*.txt, comum a todas as codificacoes.
+
+    Linhas podem ter tamanhos diferentes. Com ``pastilhas=False`` os '*'
+    viram celulas livres, para os modelos que nao tem pastilhas.
+    """
+
+    def __init__(self, lines, pastilhas=True):
+        self.grid = [list(line.rstrip("\n")) for line in lines if line.strip() != ""]
+        self.height = len(self.grid)
+        self.pastilhas = pastilhas
+
+        self.pacman_pos = None
+        self.ghosts = []
+        self.fruits = []
+        self.cells = []
+        self.portals = []
+        self.ice = []
+        self.points = []
+
+        for y, row in enumerate(self.grid):
+            for x in range(len(row)):
+                char = row[x]
+                if char != '#':
+                    self.cells.append((x, y))
+                if char == 'P':
+                    self.pacman_pos = (x, y)
+                elif char in ('R', 'G', 'B'):
+                    self.ghosts.append((x, y, char))
+                elif char in ('!', '@', '$'):
+                    self.fruits.append((x, y, char))
+                elif char == "O":
+                    self.portals.append((x, y))
+                elif char == "I":
+                    self.ice.append((x, y))
+                elif char == "*" and pastilhas:
+                    self.points.append((x, y))
+
+        self.cell_id = {pos: i for i, pos in enumerate(self.cells)}
+        self.neighbor_table = array('i', [-1]) * (4 * len(self.cells))
+        for i, (x, y) in enumerate(self.cells):
+            for d, (dx, dy) in enumerate(DIRECTION_DELTAS):
+                j = self.cell_id.get((x + dx, y + dy))
+                if j is not None:
+                    self.neighbor_table[4 * i + d] = j
+
+    def neighbor_id(self, cell, direction):
+        return self.neighbor_table[4 * cell + direction]
+
+    def get_neighbor(self, x, y, direction):
+        cell = self.cell_id.get((x, y))
+        d = DIRECTION_INDEX.get(direction)
+        if d is None:
+            return None
+        if cell is not None:
+            n = self.neighbor_table[4 * cell + d]
+            return self.cells[n] if n >= 0 else None
+
+        dx, dy = DIRECTION_DELTAS[d]
+        nx, ny = x + dx, y + dy
+        if 0 <= ny < self.height and 0 <= nx < len(self.grid[ny]) and self.grid[ny][nx] != '#':
+            return (nx, ny)
+        else:
+            return None
@@ -0,0 +1,139 @@
+import itertools
+
+from .distances import np, UNREACHABLE as NO_PATH
+from .ice import SLIDE_COSTS
+from .reachability import needed_colours
+
+# Valor para estados sem saida; o mesmo UNREACHABLE de flia.native.
+DEAD_END = 10 ** 6
+
+# Menor custo de uma acao: com fruta ativa, sem pastilha e com pastilha.
+ACTIVE_COST = min(fruit for _, _, fruit in SLIDE_COSTS.values())
+STEP_COST = min(default for default, _, _ in SLIDE_COSTS.values())
+POINT_COST = min(point for _, point, _ in SLIDE_COSTS.values())
+
+
+def _popcount(bits):
+    return bin(bits).count("1")
+
+
+class HuntHeuristic:
+    """Limites inferiores admissiveis para o objetivo de matar todos os
+    fantasmas, sobre uma DistanceTable de ``rules.game_map``.
+
+    Cada morte gasta a cor ativa, entao cada fantasma vivo da cor ``c``
+    alem do primeiro (se ``c`` ja esta ativa) exige pegar mais uma fruta
+    ``c``; faltando frutas o estado e um beco (DEAD_END). O Pac-Man precisa
+    ao menos visitar uma fruta de cada cor necessaria: ``tour`` e o menor
+    percurso, em acoes, por uma fruta de cada cor em qualquer ordem, e
+    ``nearest`` so o maximo por cor (mais fraco e mais barato). As acoes
+    viram custo como os incrementos de ``total-cost``: pelo menos
+    STEP_COST cada, POINT_COST nas que podem cair numa pastilha restante e
+    ACTIVE_COST na primeira se ha fruta ativa.
+
+    Instancias sao chamaveis como ``heuristic(rules, state)``, a assinatura
+    de flia.native.solve. Os percursos ficam memorizados por
+    ``(celula, cores necessarias, frutas restantes)``; ``pattern_table``
+    calcula todos de uma vez, como um pattern database.
+    """
+
+    def __init__(self, rules, table=None, tour=True, patterns=None):
+        self.rules = rules
+        self.table = table or rules.distances
+        self.tour_bound = tour
+        self.patterns = patterns
+        self.colour_ghosts = [0, 0, 0]
+        for i, colour in enumerate(rules.ghost_colours):
+            self.colour_ghosts[colour] |= 1 << i
+        self.colour_fruits = [0, 0, 0]
+        for j, (_, colour) in enumerate(rules.fruits):
+            self.colour_fruits[colour] |= 1 << j
+        self._memo = {}
+
+    def needed(self, alive, active, fruits_left):
+        """Bitset das cores que ainda precisam de fruta, ou None se alguma
+        cor tem mais fantasmas vivos que frutas para mata-los; ver
+        reachability.needed_colours."""
+        ghosts = [_popcount(alive & bits) for bits in self.colour_ghosts]
+        fruits = [_popcount(fruits_left & bits) for bits in self.colour_fruits]
+        return needed_colours(ghosts, fruits, active)
+
+    def _fruits(self, colour, fruits_left):
+        return [cell for j, (cell, c) in enumerate(self.rules.fruits)
+                if c == colour and (fruits_left >> j) & 1]
+
+    def nearest(self, cell, needed, fruits_left):
+        """Maior, entre as cores em ``needed``, distancia ate a fruta mais
+        proxima dessa cor."""
+        row = self.table.row(cell)
+        best = 0
+        for colour in range(3):
+            if (needed >> colour) & 1:
+                best = max(best, min((int(row[f]) for f in self._fruits(colour, fruits_left)),
+                                     default=NO_PATH))
+        return best
+
+    def tour(self, cell, needed, fruits_left):
+        """Menor numero de acoes de ``cell`` passando por uma fruta de cada
+        cor em ``needed``; NO_PATH se nao ha percurso."""
+        key = (cell, needed, fruits_left)
+        value = self._memo.get(key)
+        if value is not None:
+            return value
+        distance = self.table.distance
+        colours = [c for c in range(3) if (needed >> c) & 1]
+        best = NO_PATH
+        for order in itertools.permutations(colours):
+            layer = {cell: 0}
+            for colour in order:
+                if not layer:
+                    break
+                layer = {f: min(d + distance(src, f) for src, d in layer.items())
+                         for f in self._fruits(colour, fruits_left)}
+            best = min(best, min(layer.values(), default=NO_PATH))
+        self._memo[key] = best
+        return best
+
+    def cost_bound(self, actions, points_left, active):
+        """Menor custo de ``actions`` acoes (ao menos uma) pelos custos de
+        SLIDE_COSTS, com ``points_left`` pastilhas ainda no mapa."""
+        actions = max(actions, 1)
+        first = ACTIVE_COST if active else STEP_COST
+        rest = actions - 1
+        cheap = min(actions if not active else rest, _popcount(points_left))
+        return first + STEP_COST * rest - (STEP_COST - POINT_COST) * cheap
+
+    def __call__(self, rules, state):
+        pacman, _, alive, active, fruits_left, points_left, _ = state
+        if not alive:
+            return 0
+        needed = self.needed(alive, active, fruits_left)
+        if needed is None:
+            return DEAD_END
+        if self.patterns is not None:
+            actions = int(self.patterns[pacman, needed, fruits_left])
+        elif self.tour_bound:
+            actions = self.tour(pacman, needed, fruits_left)
+        else:
+            actions = self.nearest(pacman, needed, fruits_left)
+        if actions >= NO_PATH:
+            return DEAD_END
+        return self.cost_bound(actions, points_left, active)
+
+    def pattern_table(self):
+        """``tour`` (ou ``nearest``) para toda celula, todo bitset de cores e
+        todo subconjunto de frutas restantes, num array ``uint16`` de forma
+        ``(celulas, 8, 2 ** frutas)``; precisa do NumPy."""
+        if np is None:
+            raise ImportError("a tabela de padroes precisa do NumPy")
+        bound = self.tour if self.tour_bound else self.nearest
+        shape = (len(self.rules.game_map.cells), 8, 1 << len(self.rules.fruits))
+        patterns = np.empty(shape, np.uint16)
+        for cell, needed, fruits_left in itertools.product(*map(range, shape)):
+            patterns[cell, needed, fruits_left] = bound(cell, needed, fruits_left)
+        return patterns
+
+    def export(self, path):
+        """Grava ``pattern_table`` em ``path`` (.npy); carregue com
+        ``HuntHeuristic(rules, patterns=numpy.load(path))``."""
+        np.save(path, self.pattern_table())
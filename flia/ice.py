@@ -0,0 +1,49 @@
+from .game_map import NORTH, SOUTH, EAST, WEST
+
+# Tipos de movimento do Pac-Man, com os nomes das acoes de encodings/sat.py.
+MOVE, DUMMY, BOUNCE, SLIDE, DOUBLE = "move", "dummy-move", "slide-bounce", "slide", "slide-double"
+
+# Custo (normal, com pastilha no destino, com fruta ativa) de cada tipo.
+SLIDE_COSTS = {
+    MOVE: (2, 1, 4),
+    DUMMY: (4, 4, 8),
+    BOUNCE: (4, 4, 8),
+    SLIDE: (4, 3, 8),
+    DOUBLE: (6, 5, 12),
+}
+
+
+def slide_table(game_map):
+    """Para cada ``4 * celula + direcao``, ``(tipo, gelo atravessado, destino)``
+    do movimento do Pac-Man, ou None se ele nao pode ir nessa direcao.
+
+    Sem gelo e um passo comum (``MOVE``) ou, contra a parede, ``DUMMY``. Um
+    gelo seguido de celula livre desliza ate ela (``SLIDE``), seguido de
+    parede devolve o Pac-Man a origem (``BOUNCE``); dois gelos seguidos levam
+    a celula depois deles (``DOUBLE``), se houver. Em cima do gelo nao ha
+    movimento contra a parede. Celulas sao ids de ``game_map.cells``.
+    """
+    table = game_map.neighbor_table
+    n = len(game_map.cells)
+    ice = bytearray(n)
+    for pos in game_map.ice:
+        ice[game_map.cell_id[pos]] = 1
+
+    slides = [None] * (4 * n)
+    for c in range(n):
+        for d in (NORTH, SOUTH, EAST, WEST):
+            nxt = table[4 * c + d]
+            if nxt < 0:
+                if not ice[c]:
+                    slides[4 * c + d] = (DUMMY, (), c)
+            elif not ice[nxt]:
+                slides[4 * c + d] = (MOVE, (), nxt)
+            else:
+                after = table[4 * nxt + d]
+                if after < 0:
+                    slides[4 * c + d] = (BOUNCE, (), c)
+                elif not ice[after]:
+                    slides[4 * c + d] = (SLIDE, (nxt,), after)
+                elif table[4 * after + d] >= 0:
+                    slides[4 * c + d] = (DOUBLE, (nxt, after), table[4 * after + d])
+    return slides
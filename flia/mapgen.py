@@ -0,0 +1,134 @@
+import sys
+import random
+import argparse
+from collections import deque
+
+from .game_map import EnhancedGameMap, DIRECTION_DELTAS
+from .reachability import UnsolvableMap, check_killable
+
+FRUIT_FOR = {'R': '!', 'G': '@', 'B': '$'}
+
+
+def _free_neighbours(grid, x, y):
+    return sum(1 for dx, dy in DIRECTION_DELTAS if grid[y + dy][x + dx] != '#')
+
+
+def _carve(width, height, walls, rng):
+    """Regiao livre conexa com ``1 - walls`` das celulas internas, crescida a
+    partir de uma celula; prefere paredes com um so vizinho livre, o que da
+    corredores em vez de salas."""
+    grid = [['#'] * width for _ in range(height)]
+    inner = [(x, y) for y in range(1, height - 1) for x in range(1, width - 1)]
+    target = max(1, round(len(inner) * (1 - walls)))
+    x, y = rng.choice(inner)
+    grid[y][x] = ' '
+    frontier = []       # lista para sortear em O(1); ``queued`` evita repetidos
+    queued = set()
+    free = 1
+
+    def grow(x, y):
+        for dx, dy in DIRECTION_DELTAS:
+            nx, ny = x + dx, y + dy
+            if (0 < nx < width - 1 and 0 < ny < height - 1 and grid[ny][nx] == '#'
+                    and (nx, ny) not in queued):
+                queued.add((nx, ny))
+                frontier.append((nx, ny))
+
+    grow(x, y)
+    while free < target and frontier:
+        for _ in range(8):
+            i = rng.randrange(len(frontier))
+            if _free_neighbours(grid, *frontier[i]) == 1:
+                break
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        pos = frontier.pop()
+        grid[pos[1]][pos[0]] = ' '
+        free += 1
+        grow(*pos)
+    return grid
+
+
+def _distances(grid, start):
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in DIRECTION_DELTAS:
+            nxt = (x + dx, y + dy)
+            if grid[nxt[1]][nxt[0]] != '#' and nxt not in dist:
+                dist[nxt] = dist[(x, y)] + 1
+                queue.append(nxt)
+    return dist
+
+
+def generate_map(width, height, walls=0.35, ghosts="RGB", fruits=1, portals=False, ice=0,
+                 pastilhas=0.0, seed=None, max_tries=100):
+    """Linhas de um mapa aleatorio ``width`` x ``height`` no formato dos
+    ent*.txt, com borda de parede e regiao livre conexa.
+
+    ``ghosts`` lista as cores dos fantasmas (ex.: "RGGB") e ``fruits`` e o
+    numero de frutas da cor de cada fantasma: cada morte gasta a fruta
+    ativa, entao "RGGB" pede ao menos duas '@'. Mapas que falham em
+    reachability.check_killable sao gerados de novo; o movimento dos
+    fantasmas ainda pode deixar o mapa sem solucao. ``portals`` poe um par
+    de 'O'; ``ice`` e o numero de 'I' e ``pastilhas`` a fracao das celulas
+    livres restantes com '*'. Fantasmas comecam a pelo menos 3 passos do
+    Pac-Man. O mesmo ``seed`` gera o mesmo mapa.
+    """
+    if width < 3 or height < 3:
+        raise ValueError("o mapa precisa de pelo menos 3x3")
+    rng = random.Random(seed)
+    for _ in range(max_tries):
+        grid = _carve(width, height, walls, rng)
+        free = [(x, y) for y in range(height) for x in range(width) if grid[y][x] != '#']
+        rng.shuffle(free)
+        pacman = free.pop()
+        dist = _distances(grid, pacman)
+        far = [pos for pos in free if dist.get(pos, 0) >= 3]
+        if len(far) < len(ghosts):
+            continue
+        grid[pacman[1]][pacman[0]] = 'P'
+        for colour in ghosts:
+            x, y = far.pop()
+            free.remove((x, y))
+            grid[y][x] = colour
+        items = [FRUIT_FOR[c] for c in ghosts for _ in range(fruits)]
+        items += ['O', 'O'] if portals else []
+        items += ['I'] * ice
+        if len(items) > len(free):
+            continue
+        for char in items:
+            x, y = free.pop()
+            grid[y][x] = char
+        for x, y in free[:round(len(free) * pastilhas)]:
+            grid[y][x] = '*'
+
+        lines = ["".join(row) for row in grid]
+        try:
+            check_killable(EnhancedGameMap(lines))
+        except UnsolvableMap:
+            continue
+        return lines
+    raise ValueError(f"nenhum mapa valido em {max_tries} tentativas; reduza walls ou os itens")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um mapa aleatorio na saida padrao.")
+    parser.add_argument("width", type=int)
+    parser.add_argument("height", type=int)
+    parser.add_argument("--walls", type=float, default=0.35, help="fracao de paredes internas")
+    parser.add_argument("--ghosts", default="RGB", help="cores dos fantasmas, ex.: RGGB")
+    parser.add_argument("--fruits", type=int, default=1, help="frutas por fantasma, da cor dele")
+    parser.add_argument("--portals", action="store_true", help="poe um par de portais")
+    parser.add_argument("--ice", type=int, default=0, help="numero de celulas de gelo")
+    parser.add_argument("--pastilhas", type=float, default=0.0,
+                        help="fracao das celulas livres com pastilha")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    lines = generate_map(args.width, args.height, args.walls, args.ghosts, args.fruits,
+                         args.portals, args.ice, args.pastilhas, args.seed)
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import sys
+import math
+import time
+import random
+import argparse
+
+from .game_map import EnhancedGameMap
+from .native import GameRules, LETTERS, chase_heuristic
+from .reachability import UnsolvableMap, prune_unreachable
+
+# Custo de um passo comum: converte a distancia de chase_heuristic em custo.
+STEP_COST = 2
+
+
+class Node:
+    """No da arvore: o estado, o custo desde o inicio do jogo e as direcoes
+    da aresta que chega nele (mais de uma num corredor)."""
+
+    __slots__ = ("state", "cost", "moves", "parent", "children", "untried", "visits", "total")
+
+    def __init__(self, state, cost, moves=(), parent=None):
+        self.state = state
+        self.cost = cost
+        self.moves = moves
+        self.parent = parent
+        self.children = []
+        self.untried = None     # sucessores ainda nao expandidos, calculados na 1a visita
+        self.visits = 0
+        self.total = 0.0        # soma das estimativas de custo final
+
+    def path(self):
+        """Direcoes da raiz ate este no."""
+        moves = []
+        node = self
+        while node.parent is not None:
+            moves.extend(reversed(node.moves))
+            node = node.parent
+        moves.reverse()
+        return moves
+
+
+class MCTS:
+    """Busca em arvore Monte Carlo sobre GameRules.
+
+    Cada iteracao desce pela arvore por UCT (custo medio normalizado entre o
+    menor e o maior custo estimado ate agora), expande um sucessor de
+    ``macro_successors`` e joga a partir dele uma partida de ate ``depth``
+    passos, gulosa em ``chase_heuristic`` com ``epsilon`` de movimentos
+    aleatorios. A estimativa e o custo da partida mais ``STEP_COST`` por
+    celula que a heuristica ainda pede; partidas que matam todos os
+    fantasmas viram planos completos, dos quais fica o mais barato.
+    """
+
+    def __init__(self, rules, depth=150, exploration=1.0, epsilon=0.2, seed=None):
+        self.rules = rules
+        self.depth = depth
+        self.exploration = exploration
+        self.epsilon = epsilon
+        self.rng = random.Random(seed)
+        self.low, self.high = math.inf, -math.inf
+        self.best = None        # (custo, direcoes) do melhor plano completo
+
+    def _found(self, cost, moves):
+        if self.best is None or cost < self.best[0]:
+            self.best = (cost, list(moves))
+
+    def _score(self, node, child):
+        mean = child.total / child.visits
+        spread = self.high - self.low
+        exploit = (self.high - mean) / spread if spread > 0 else 0.5
+        return exploit + self.exploration * math.sqrt(math.log(node.visits) / child.visits)
+
+    def _rollout(self, state):
+        rules, rng = self.rules, self.rng
+        moves, cost = [], 0
+        for _ in range(self.depth):
+            if rules.is_goal(state):
+                break
+            options = list(rules.successors(state))
+            if not options:
+                break
+            if rng.random() < self.epsilon:
+                d, c, state = rng.choice(options)
+            else:
+                d, c, state = min(options, key=lambda o: (chase_heuristic(rules, o[2]),
+                                                          rng.random()))
+            moves.append(d)
+            cost += c
+        return moves, cost, state
+
+    def iterate(self, root, prefix):
+        """Uma iteracao a partir de ``root``; ``prefix`` sao as direcoes ja
+        fixadas antes dele, para montar os planos completos."""
+        rules = self.rules
+        node = root
+        while True:
+            if node.untried is None:
+                node.untried = list(rules.macro_successors(node.state))
+                self.rng.shuffle(node.untried)
+            if node.untried or not node.children or rules.is_goal(node.state):
+                break
+            node = max(node.children, key=lambda child: self._score(node, child))
+        if node.untried and not rules.is_goal(node.state):
+            ds, cost, state = node.untried.pop()
+            child = Node(state, node.cost + cost, ds, node)
+            node.children.append(child)
+            node = child
+
+        moves, cost, state = self._rollout(node.state)
+        estimate = node.cost + cost
+        if rules.is_goal(state):
+            self._found(estimate, prefix + node.path() + moves)
+        else:
+            estimate += STEP_COST * chase_heuristic(rules, state)
+        self.low, self.high = min(self.low, estimate), max(self.high, estimate)
+        while node is not None:
+            node.visits += 1
+            node.total += estimate
+            node = node.parent
+
+
+def solve_mcts(game_map, budget, iterations=100, depth=150, exploration=1.0, epsilon=0.2,
+               seed=None):
+    """Plano no formato de ``extract_moves`` (``"N;E;...;custo"``) achado em
+    ate ``budget`` segundos, ou None.
+
+    A cada ``iterations`` iteracoes do MCTS o filho mais visitado da raiz e
+    fixado e vira a nova raiz (com a subarvore ja construida), ate o
+    Pac-Man matar todos os fantasmas ou o prazo acabar. Devolve o mais
+    barato entre esse caminho e os planos completos achados nas partidas;
+    nao e otimo, mas nunca passa do prazo por mais de uma partida.
+    """
+    deadline = time.monotonic() + budget
+    try:
+        game_map = prune_unreachable(game_map)
+    except UnsolvableMap:
+        return None
+    rules = GameRules(game_map)
+    search = MCTS(rules, depth, exploration, epsilon, seed)
+    root = Node(rules.initial_state(), 0)
+    prefix = []
+    while time.monotonic() < deadline:
+        if rules.is_goal(root.state):
+            search._found(root.cost, prefix)
+            break
+        for _ in range(iterations):
+            search.iterate(root, prefix)
+            if time.monotonic() >= deadline:
+                break
+        if not root.children:
+            break
+        root = max(root.children, key=lambda child: (child.visits, -child.total / child.visits))
+        root.parent = None
+        prefix.extend(root.moves)
+    if search.best is None:
+        return None
+    cost, moves = search.best
+    return ";".join(LETTERS[d] for d in moves) + ";" + str(cost)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Resolve o mapa lido da entrada padrao com MCTS dentro de um prazo.")
+    parser.add_argument("budget", type=float, help="prazo em segundos")
+    parser.add_argument("--iterations", type=int, default=100,
+                        help="iteracoes antes de fixar cada movimento")
+    parser.add_argument("--depth", type=int, default=150, help="passos por partida")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    game_map = EnhancedGameMap([line.rstrip('\n') for line in sys.stdin])
+    movimentos = solve_mcts(game_map, args.budget, args.iterations, args.depth, seed=args.seed)
+    if movimentos is None:
+        sys.exit(1)
+    print(movimentos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+import sys
+import heapq
+import itertools
+
+from .game_map import EnhancedGameMap, NORTH, SOUTH, EAST, WEST
+from .red_ghost import red_ghost_table
+from .reachability import UnsolvableMap, prune_unreachable
+from .ice import slide_table, SLIDE_COSTS, MOVE, DUMMY, BOUNCE
+from .state import StateCodec
+from .distances import distance_table
+
+DIRECTIONS = (NORTH, SOUTH, EAST, WEST)
+LETTERS = "NSEW"
+OPPOSITE = (SOUTH, NORTH, WEST, EAST)
+
+# Cor de cada fruta/fantasma: indice no bitset de frutas ativas.
+FRUIT_COLOUR = {'!': 0, '@': 1, '$': 2}
+GHOST_COLOUR = {'R': 0, 'G': 1, 'B': 2}
+RED, GREEN, BLUE = 0, 1, 2
+
+UNREACHABLE = 10 ** 6
+
+
+class GameRules:
+    """Visao estatica de um mapa com as regras que ``generate_pddl``
+    (encodings/sat.py) codifica.
+
+    Um estado de busca e a tupla
+    ``(pacman, ghost_cells, alive, active, fruits_left, points_left, red_step)``,
+    com celulas como ids de ``game_map.cells``; ``alive``, ``active``,
+    ``fruits_left`` e ``points_left`` sao bitsets sobre ``ghosts``, as cores
+    de fruta, ``fruits`` e ``game_map.points``, respectivamente.
+    """
+
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.table = game_map.neighbor_table
+        cell_id = game_map.cell_id
+        n = len(game_map.cells)
+
+        self.ice = bytearray(n)
+        for pos in game_map.ice:
+            self.ice[cell_id[pos]] = 1
+        self.point_bit = [0] * n
+        for i, pos in enumerate(game_map.points):
+            self.point_bit[cell_id[pos]] = 1 << i
+        self.fruits = [(cell_id[(x, y)], FRUIT_COLOUR[s]) for (x, y, s) in game_map.fruits]
+        self.fruits_at = [0] * n
+        for j, (cell, _) in enumerate(self.fruits):
+            self.fruits_at[cell] |= 1 << j
+        self.ghosts = [(cell_id[(x, y)], GHOST_COLOUR[s]) for (x, y, s) in game_map.ghosts]
+        self.ghost_colours = tuple(c for (_, c) in self.ghosts)
+
+        self.partner = [-1] * n
+        if len(game_map.portals) == 2:
+            p1, p2 = (cell_id[pos] for pos in game_map.portals)
+            self.partner[p1] = p2
+            self.partner[p2] = p1
+
+        self.slides = slide_table(game_map)
+        self.adjacent = [
+            frozenset(j for j in self.table[4 * i:4 * i + 4] if j >= 0)
+            for i in range(n)
+        ]
+        self._distance_table = None
+
+        # Corredores: celulas sem gelo, portal ou fruta com exatamente duas
+        # saidas; macro_successors atravessa cada um de uma vez.
+        self.corridor = bytearray(n)
+        for i in range(n):
+            if (len(self.adjacent[i]) == 2 and not self.ice[i] and self.partner[i] < 0
+                    and not self.fruits_at[i]):
+                self.corridor[i] = 1
+        self._corridor_paths = {}
+
+        # Como em generate_pddl, so o primeiro fantasma vermelho segue a
+        # sequencia de passos; os demais ficam parados.
+        self.red_index = None
+        self.red_moves = []
+        self.red_next = []
+        for i, (cell, colour) in enumerate(self.ghosts):
+            if colour == RED:
+                self.red_index = i
+                self.red_moves, self.red_next = red_schedule(game_map.cells[cell], game_map)
+                break
+        self.codec = StateCodec(game_map, max(1, len(self.red_moves)))
+
+    def initial_state(self):
+        return (
+            self.game_map.cell_id[self.game_map.pacman_pos],
+            tuple(cell for (cell, _) in self.ghosts),
+            (1 << len(self.ghosts)) - 1,
+            0,
+            (1 << len(self.fruits)) - 1,
+            (1 << len(self.game_map.points)) - 1,
+            0,
+        )
+
+    def is_goal(self, state):
+        return state[2] == 0
+
+    @property
+    def distances(self):
+        """DistanceTable do mapa (acoes do Pac-Man entre celulas, ver
+        flia.distances), criada na primeira consulta."""
+        if self._distance_table is None:
+            self._distance_table = distance_table(self.game_map)
+        return self._distance_table
+
+    def dangerous(self, state, i):
+        return (state[2] >> i) & 1 and not (state[3] >> self.ghost_colours[i]) & 1
+
+    def successors(self, state):
+        for d in DIRECTIONS:
+            result = self.apply(state, d)
+            if result is not None:
+                yield d, result[0], result[1]
+
+    def corridor_path(self, cell, d):
+        """Direcoes que levam o Pac-Man, que acabou de entrar em ``cell``
+        indo para ``d``, ate o fim do corredor e um passo para fora dele;
+        vazia se ``cell`` nao e celula de corredor."""
+        key = 4 * cell + d
+        path = self._corridor_paths.get(key)
+        if path is None:
+            path = []
+            seen = {cell}
+            while self.corridor[cell]:
+                back = OPPOSITE[d]
+                d = next(e for e in DIRECTIONS if e != back and self.table[4 * cell + e] >= 0)
+                path.append(d)
+                cell = self.table[4 * cell + d]
+                if cell in seen:
+                    break
+                seen.add(cell)
+            path = self._corridor_paths[key] = tuple(path)
+        return path
+
+    def _quiet(self, state):
+        # Nenhum fantasma vivo a duas acoes ou menos: no proximo turno ele
+        # nao encontra o Pac-Man nem fica ao alcance dele.
+        dist = self.distances.row(state[0])
+        alive = state[2]
+        for i, cell in enumerate(state[1]):
+            if (alive >> i) & 1 and dist[cell] <= 2:
+                return False
+        return True
+
+    def macro_successors(self, state):
+        """Como ``successors``, mas gera ``(direcoes, custo, estado)`` e um
+        movimento para dentro de um corredor segue ate o outro lado numa so
+        aresta, somando os custos. A travessia e simulada passo a passo e so
+        vale se nenhum fantasma chega a duas acoes do Pac-Man dentro do
+        corredor, onde voltar ou esperar poderia importar; senao sai so o
+        primeiro movimento. Ela tambem para quando o ultimo fantasma morre.
+        Planos que voltam num corredor tranquilo (para guiar os fantasmas
+        azul/verde, por exemplo) ainda podem ficar de fora.
+        """
+        for d in DIRECTIONS:
+            result = self.apply(state, d)
+            if result is None:
+                continue
+            cost, child = result
+            moves = [d]
+            if child[0] != state[0]:
+                for e in self.corridor_path(child[0], d):
+                    if self.is_goal(child):
+                        break
+                    result = self.apply(child, e) if self._quiet(child) else None
+                    if result is None:
+                        cost, child = self.apply(state, d)
+                        moves = [d]
+                        break
+                    cost += result[0]
+                    child = result[1]
+                    moves.append(e)
+            yield tuple(moves), cost, child
+
+    def apply(self, state, d):
+        """Aplica a acao do Pac-Man na direcao ``d`` e depois o turno dos
+        fantasmas, o passo do vermelho e as mortes; devolve ``(custo,
+        estado)`` ou None."""
+        pacman, ghost_cells, alive, active, fruits_left, points_left, red_step = state
+        table = self.table
+        slide = self.slides[4 * pacman + d]
+        if slide is None:
+            return None
+        kind, passed, to = slide
+        default, point, fruit = SLIDE_COSTS[kind]
+
+        if kind == MOVE:
+            if not self._safe_move(state, to, d):
+                return None
+            bit = self.point_bit[to]
+            if active:
+                cost = fruit
+                points_left &= ~bit
+            elif points_left & bit:
+                cost = point
+                points_left &= ~bit
+            else:
+                cost = default
+            picked = fruits_left & self.fruits_at[to]
+            if picked:
+                for j, (_, colour) in enumerate(self.fruits):
+                    if (picked >> j) & 1:
+                        active |= 1 << colour
+                fruits_left &= ~picked
+            partner = self.partner[to]
+            pacman = partner if partner >= 0 else to
+        elif kind == DUMMY or kind == BOUNCE:
+            if not self._safe_landing(state, pacman, d):
+                return None
+            cost = fruit if active else default
+        else:
+            for cell in passed:
+                if self._occupied(state, cell):
+                    return None
+            if self._occupied(state, to) or not self._safe_landing(state, to, d):
+                return None
+            bit = self.point_bit[to]
+            if active:
+                cost = fruit
+            elif points_left & bit:
+                cost = point
+                points_left &= ~bit
+            else:
+                cost = default
+            pacman = to
+
+        # O vermelho ainda vai andar neste turno (red-pending no SAT, e
+        # move-red exige o fantasma vivo): so morre antes se for o ultimo.
+        alive, active = self._kills(pacman, ghost_cells, alive, active, self.red_index)
+
+        cells = list(ghost_cells)
+        back = OPPOSITE[d]
+        for i, colour in enumerate(self.ghost_colours):
+            if not (alive >> i) & 1:
+                continue
+            if colour == BLUE:
+                step = table[4 * cells[i] + back]
+            elif colour == GREEN:
+                step = table[4 * cells[i] + d]
+            else:
+                continue
+            if step >= 0:
+                cells[i] = step
+        if self.red_index is not None and (alive >> self.red_index) & 1:
+            cells[self.red_index] = self.red_moves[red_step][1]
+            red_step = self.red_next[red_step]
+        ghost_cells = tuple(cells)
+
+        alive, active = self._kills(pacman, ghost_cells, alive, active)
+        return cost, (pacman, ghost_cells, alive, active, fruits_left, points_left, red_step)
+
+    def _kills(self, pacman, ghost_cells, alive, active, spare=None):
+        # ``spare`` nao morre enquanto restar outro fantasma vivo.
+        for i, colour in enumerate(self.ghost_colours):
+            if i == spare:
+                continue
+            if (alive >> i) & 1 and ghost_cells[i] == pacman and (active >> colour) & 1:
+                alive &= ~(1 << i)
+                active &= ~(1 << colour)
+        if (spare is not None and alive == 1 << spare and ghost_cells[spare] == pacman
+                and (active >> self.ghost_colours[spare]) & 1):
+            alive = 0
+            active &= ~(1 << self.ghost_colours[spare])
+        return alive, active
+
+    def _occupied(self, state, cell):
+        ghost_cells = state[1]
+        for i in range(len(ghost_cells)):
+            if ghost_cells[i] == cell and self.dangerous(state, i):
+                return True
+        return False
+
+    def _safe_landing(self, state, cell, d):
+        # Checagem usada por dummy-move e slide: nenhum fantasma perigoso
+        # pode entrar em ``cell`` no turno dos fantasmas.
+        table = self.table
+        back = OPPOSITE[d]
+        ghost_cells = state[1]
+        for i, colour in enumerate(self.ghost_colours):
+            if not self.dangerous(state, i):
+                continue
+            x = ghost_cells[i]
+            if colour == BLUE and table[4 * x + back] == cell:
+                return False
+            if colour == GREEN and table[4 * x + d] == cell:
+                return False
+            if colour == RED and cell in self.adjacent[x]:
+                return False
+        return True
+
+    def _safe_move(self, state, to, d):
+        table = self.table
+        back = OPPOSITE[d]
+        ghost_cells = state[1]
+        active = state[3]
+        partner = self.partner[to]
+        if self._occupied(state, to):
+            return False
+        if partner >= 0 and self._occupied(state, partner):
+            return False
+        for i, colour in enumerate(self.ghost_colours):
+            if not self.dangerous(state, i):
+                continue
+            x = ghost_cells[i]
+            if colour == BLUE:
+                if table[4 * x + back] == to or x == partner:
+                    return False
+            elif colour == GREEN:
+                if table[4 * x + d] == to or x == partner:
+                    return False
+            elif i == self.red_index:
+                if (self.red_moves[state[6]] == (x, to)
+                        and (to in self.adjacent[x] or x == partner)):
+                    return False
+            if partner >= 0:
+                if colour == BLUE and table[4 * partner + back] == x:
+                    return False
+                if colour == GREEN and table[4 * partner + d] == x:
+                    return False
+                if colour == RED and x in self.adjacent[partner]:
+                    return False
+        other = state[4] & self.fruits_at[to]
+        if active and other:
+            for colour in (RED, GREEN, BLUE):
+                if not (active >> colour) & 1:
+                    continue
+                hunting = any((state[2] >> i) & 1 and c == colour
+                              for i, c in enumerate(self.ghost_colours))
+                if hunting and any((other >> j) & 1 and c != colour
+                                   for j, (_, c) in enumerate(self.fruits)):
+                    return False
+        return True
+
+
+def red_schedule(start, game_map):
+    """Movimentos ``(de, para)`` do fantasma vermelho, em ids de celula, e o
+    indice do passo seguinte a cada um, montados como os fatos
+    ``expected-move``/``next-step`` de generate_pddl."""
+    prefix, cycle = red_ghost_table(game_map).trajectory(game_map.cell_id[start], EAST)
+    moves = prefix + cycle
+    next_step = list(range(1, len(moves))) + [len(prefix)]
+    return moves, next_step
+
+
+def chase_heuristic(rules, state):
+    """Nao admissivel: soma, para cada fantasma vivo, das acoes do Pac-Man
+    ate uma fruta da cor dele (se preciso) e dai ate a celula atual do
+    fantasma. Celula onde nenhuma acao termina conta ``distances.size``
+    acoes; fantasma sem fruta restante e um beco (UNREACHABLE)."""
+    pacman, ghost_cells, alive, active, fruits_left = state[:5]
+    row, cap = rules.distances.row, rules.distances.size
+    dist = row(pacman)
+    h = 0
+    for i, colour in enumerate(rules.ghost_colours):
+        if not (alive >> i) & 1:
+            continue
+        ghost = ghost_cells[i]
+        if (active >> colour) & 1:
+            h += min(int(dist[ghost]), cap)
+            continue
+        nearest = None
+        for j, (cell, c) in enumerate(rules.fruits):
+            if c == colour and (fruits_left >> j) & 1:
+                via = int(dist[cell]) + int(row(cell)[ghost])
+                nearest = via if nearest is None else min(nearest, via)
+        if nearest is None:
+            return UNREACHABLE
+        h += min(nearest, cap)
+    return h
+
+
+def solve(game_map, optimal=False, max_expansions=None, corridors=None, heuristic=None):
+    """Busca direto nas regras do jogo e devolve o plano no formato de
+    ``extract_moves`` (``"N;E;...;custo"``), ou None.
+
+    Por padrao roda busca gulosa em ``chase_heuristic``, o equivalente em
+    processo do ``--alias lama-first``; ``optimal=True`` roda A* com a
+    admissivel ``heuristics.HuntHeuristic`` e devolve um plano de custo
+    minimo. ``heuristic(rules, state)`` troca qualquer uma das duas; estados
+    que ela avalia em UNREACHABLE ou mais sao becos e sao descartados. Mapas
+    em que algum fantasma nunca pode ser morto devolvem None sem busca.
+
+    ``corridors=True`` busca sobre ``macro_successors``, atravessando
+    corredores num passo; o plano ainda sai movimento a movimento, mas deixa
+    de ser garantidamente otimo. O padrao (None) liga os corredores na busca
+    gulosa e os desliga com ``optimal``: com 300k expansoes a gulosa sem
+    corredores nao resolve o ent7.txt, e com eles resolve todos os ent*.txt
+    em menos de um segundo.
+
+    O A* exato so e pratico em mapas pequenos: dos ent*.txt, so ent e entG
+    terminam em 300k expansoes (~20 s); entG2, entG3, entGc, entR, entRPI e
+    ent7 nao. Com ``corridors=True`` entG2, entG3 e entGc terminam, sem
+    garantia de otimo.
+    """
+    if corridors is None:
+        corridors = not optimal
+    try:
+        game_map = prune_unreachable(game_map)
+    except UnsolvableMap:
+        return None
+    rules = GameRules(game_map)
+    if heuristic is None and optimal:
+        from .heuristics import HuntHeuristic
+        heuristic = HuntHeuristic(rules)
+    elif heuristic is None:
+        heuristic = chase_heuristic
+    pack, unpack = rules.codec.pack, rules.codec.unpack
+    start = rules.initial_state()
+    start_key = pack(start)
+    counter = itertools.count()
+    best = {start_key: 0}
+    parent = {start_key: None}
+    frontier = [(heuristic(rules, start), next(counter), 0, start_key)]
+    expansions = 0
+
+    while frontier:
+        _, _, g, key = heapq.heappop(frontier)
+        if g > best[key]:
+            continue
+        state = unpack(key)
+        if rules.is_goal(state):
+            moves = []
+            while parent[key] is not None:
+                key, ds = parent[key]
+                moves.extend(LETTERS[d] for d in reversed(ds))
+            moves.reverse()
+            return ";".join(moves) + ";" + str(g)
+        expansions += 1
+        if max_expansions is not None and expansions > max_expansions:
+            return None
+        if corridors:
+            successors = rules.macro_successors(state)
+        else:
+            successors = (((d,), cost, child) for d, cost, child in rules.successors(state))
+        for ds, cost, child in successors:
+            new_g = g + cost
+            child_key = pack(child)
+            if optimal:
+                if new_g >= best.get(child_key, new_g + 1):
+                    continue
+            elif child_key in best:
+                continue
+            h = heuristic(rules, child)
+            if h >= UNREACHABLE:
+                continue
+            priority = new_g + h if optimal else h
+            best[child_key] = new_g
+            parent[child_key] = (key, ds)
+            heapq.heappush(frontier, (priority, next(counter), new_g, child_key))
+    return None
+
+
+def main():
+    lines = [line.rstrip('\n') for line in sys.stdin]
+    game_map = EnhancedGameMap(lines)
+    args = sys.argv[1:]
+    corridors = True if "--corridors" in args else False if "--no-corridors" in args else None
+    movimentos = solve(game_map, optimal="--optimal" in args, corridors=corridors)
+    if movimentos is None:
+        sys.exit(1)
+    print(movimentos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import re
+
+DIRECTIONS = {"north": "N", "south": "S", "east": "E", "west": "W"}
+PACMAN_ACTIONS = ("move-", "dummy-move-", "slide-")
+OTHER_ACTIONS = ("move-red", "move-portal", "kill-ghost", "ghost-turn")
+
+COST_PATTERN = re.compile(r"Plan cost:\s*(\d+)")
+STAT_PATTERNS = (
+    ("expanded", re.compile(r"Expanded (\d+) state"), int),
+    ("evaluated", re.compile(r"Evaluated (\d+) state"), int),
+    ("generated", re.compile(r"Generated (\d+) state"), int),
+    ("plan_length", re.compile(r"Plan length: (\d+) step"), int),
+    ("search_time", re.compile(r"Search time: ([\d.]+)s"), float),
+    ("total_time", re.compile(r"Total time: ([\d.]+)s"), float),
+    ("peak_memory_kb", re.compile(r"Peak memory: (\d+) KB"), int),
+)
+# O tradutor roda a parte, em cache.cached_translation, e o planejador so
+# recebe o output.sas: o tempo dele fica na fase "translate" do --profile.
+STEP_PREFIX = re.compile(r"^STEP\s+\d+(\.\d+)?:\s*", re.IGNORECASE)
+
+
+def action_direction(line):
+    """Letra (N/S/E/W) do movimento do Pac-Man numa linha de plano, ou None.
+
+    Aceita a saida do Fast Downward (``move-north c1 c2 (1)``), o sas_plan
+    (``(move-north c1 c2)``) e o Madagascar (``STEP 0: move-north(c1,c2)``).
+    """
+    text = STEP_PREFIX.sub("", line.strip()).lstrip("(").lower()
+    action = re.split(r"[\s(]", text, maxsplit=1)[0]
+    if action.startswith(OTHER_ACTIONS) or not action.startswith(PACMAN_ACTIONS):
+        return None
+    for part in action.split("-"):
+        if part in DIRECTIONS:
+            return DIRECTIONS[part]
+    return None
+
+
+class PlanReader:
+    """Le a saida do planejador uma linha por vez, sem guarda-la.
+
+    Cada "Plan cost" fecha um plano; configuracoes anytime imprimem varios,
+    cada um melhor que o anterior, e ``best`` e sempre o ultimo. Planejadores
+    que nao imprimem custo (Madagascar) tem o plano fechado em ``close``.
+    Sem ``with_cost`` o custo relatado e 0; ``uncosted`` indica que o
+    planejador nao informou custo nenhum. ``stats`` guarda o ultimo valor
+    das estatisticas do Fast Downward (STAT_PATTERNS).
+    """
+
+    def __init__(self, with_cost=True):
+        self.with_cost = with_cost
+        self.moves = []
+        self.plans = []
+        self.uncosted = False
+        self.stats = {}
+
+    def _finish(self, cost):
+        plan = ";".join(self.moves) + ";" + (cost if self.with_cost else "0")
+        self.plans.append(plan)
+        self.moves = []
+        return plan
+
+    def feed(self, line):
+        """Processa uma linha; devolve o plano se ela o completou."""
+        move = action_direction(line)
+        if move is not None:
+            self.moves.append(move)
+            return None
+        m = COST_PATTERN.search(line)
+        if m:
+            return self._finish(m.group(1))
+        for name, pattern, kind in STAT_PATTERNS:
+            m = pattern.search(line)
+            if m:
+                self.stats[name] = kind(m.group(1))
+                break
+        return None
+
+    def close(self):
+        if self.moves and not self.plans:
+            self.uncosted = True
+            self._finish("0")
+        return self.best
+
+    @property
+    def best(self):
+        return self.plans[-1] if self.plans else None
+
+
+def plan_cost(plan):
+    return int(plan.rsplit(";", 1)[1])
+
+
+def extract_moves(planner_output, with_cost=True):
+    """Converte a saida do planejador em ``N;S;...;custo``.
+
+    Sem ``with_cost`` (ou sem "Plan cost" na saida) o custo e 0.
+    """
+    reader = PlanReader(with_cost)
+    for line in planner_output.splitlines():
+        reader.feed(line)
+    return reader.close() or ";0"
@@ -0,0 +1,225 @@
+import os
+import sys
+import math
+import signal
+import threading
+import contextlib
+import tempfile
+import time
+import subprocess
+
+from .cache import cached_domain, cached_problem, cached_translation
+from .plan import PlanReader
+
+PLANNER_MADAGASCAR = "/home/software/planners/madagascar/M"
+PLANNER_FDSS23 = "/home/software/planners/downward-fdss23/fast-downward.py"
+PLANNER_SCORPION = "/home/software/planners/scorpion-maidu/fast-downward.py"
+PLANNER_JULIA = "/home/software/planners/julia/planner.jl"
+
+
+class Planner:
+    """Um planejador externo e as opcoes com que ele e chamado.
+
+    Planejadores baseados no Fast Downward (``translate=True``) recebem o
+    output.sas do cache em vez de domain/problem, pulando o tradutor. O
+    limite de tempo vai em ``limit_flag`` (None se o planejador nao tem um)
+    e pode ser trocado por chamada; ``optimal`` marca configuracoes cujo
+    plano, ao terminarem, e otimo. ``env`` e somado ao ambiente do processo.
+    """
+
+    def __init__(self, name, path, options, translate=False, time_limit=None,
+                 limit_flag="--overall-time-limit", optimal=False, env=None):
+        self.name = name
+        self.path = path
+        self.options = tuple(options)
+        self.translate = translate
+        self.time_limit = time_limit
+        self.limit_flag = limit_flag
+        self.optimal = optimal
+        self.env = env
+
+    def translate_sas(self, variante, domain, problem, time_limit=None):
+        """O output.sas do cache, traduzindo se preciso; None se o tradutor
+        falhar. O tradutor tem o mesmo limite de tempo do planejador e sobe
+        ``subprocess.TimeoutExpired`` se passar dele."""
+        limit = time_limit if time_limit is not None else self.time_limit
+        return cached_translation(self.path, variante, domain, problem, timeout=limit,
+                                  track=_tracked)
+
+    def command(self, variante, domain, problem, time_limit=None):
+        options = self.options
+        limit = time_limit if time_limit is not None else self.time_limit
+        if limit is not None and self.limit_flag is not None:
+            options = (self.limit_flag, str(max(1, math.ceil(limit)))) + options
+        if self.translate:
+            sas_file = self.translate_sas(variante, domain, problem, time_limit)
+            if sas_file is not None:
+                return [self.path, *options, sas_file]
+        return [self.path, *options,
+                cached_domain(variante, domain), cached_problem(variante, domain, problem)]
+
+
+PLANNERS = {p.name: p for p in (
+    Planner("lama-first-180", PLANNER_FDSS23, ("--alias", "lama-first"), translate=True,
+            time_limit=180),
+    Planner("lama-first-30", PLANNER_FDSS23, ("--alias", "lama-first"), translate=True,
+            time_limit=30),
+    Planner("lama-first-60", PLANNER_FDSS23, ("--alias", "lama-first"), translate=True,
+            time_limit=60, limit_flag="--search-time-limit"),
+    Planner("lama-60", PLANNER_FDSS23, ("--alias", "lama"), translate=True,
+            time_limit=60, limit_flag="--search-time-limit"),
+    Planner("fdss-2023-60", PLANNER_FDSS23, ("--alias", "seq-opt-fdss-2023"), translate=True,
+            time_limit=60, limit_flag="--search-time-limit", optimal=True),
+    Planner("scorpion-lama-first", PLANNER_SCORPION, ("--alias", "lama-first"), translate=True,
+            time_limit=180),
+    Planner("madagascar", PLANNER_MADAGASCAR, ("-s1",), limit_flag=None),
+    Planner("julia-astar", PLANNER_JULIA, (), limit_flag=None,
+            env={"HEURISTIC": "HADD", "GOAL": "MIN_STEPS", "PLANNER": "ASTAR", "TIMEOUT": "300"}),
+)}
+
+
+class PlannerRun:
+    """Resultado de uma chamada ao planejador: o reader com os planos lidos,
+    o codigo de retorno e se a chamada foi interrompida por ``first_plan``
+    (``stopped``) ou pelo ``timeout`` (``timed_out``)."""
+
+    def __init__(self, planner, reader):
+        self.planner = planner
+        self.reader = reader
+        self.returncode = None
+        self.stopped = False
+        self.timed_out = False
+        self.errors = ""
+
+    @property
+    def failed(self):
+        return self.returncode != 0 and not self.stopped and not self.reader.plans
+
+    @property
+    def complete(self):
+        """O planejador terminou sozinho e com sucesso."""
+        return self.returncode == 0 and not self.stopped and not self.timed_out
+
+
+# Planejadores (e tradutores) rodando agora, para ``stop_all``.
+_running = set()
+_running_lock = threading.Lock()
+
+
+# Codigo de saida do driver do Fast Downward quando o tradutor estoura o tempo.
+TRANSLATE_OUT_OF_TIME = 21
+
+
+@contextlib.contextmanager
+def _tracked(proc):
+    with _running_lock:
+        _running.add(proc)
+    try:
+        yield proc
+    finally:
+        with _running_lock:
+            _running.discard(proc)
+
+
+def _stop(proc):
+    # O driver do Fast Downward roda a busca num processo filho; o grupo todo
+    # e encerrado.
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+
+
+def stop_all():
+    """Encerra todos os planejadores em execucao. Cada um roda na propria
+    sessao, entao matar o grupo de quem chamou nao os alcanca."""
+    with _running_lock:
+        procs = list(_running)
+    for proc in procs:
+        _stop(proc)
+
+
+def run_planner(planner, variante, domain, problem, reader=None, on_line=None,
+                first_plan=False, timeout=None, on_plan=None, on_start=None):
+    """Roda ``planner`` (nome em PLANNERS) lendo a saida linha a linha.
+
+    Cada linha passa por ``reader`` (um PlanReader) e, se dado, por
+    ``on_line``; a saida nunca e guardada inteira, e ``on_plan(plano)`` e
+    chamado a cada plano completo. Com ``first_plan`` o planejador e
+    encerrado assim que o primeiro plano aparece; com ``timeout`` (segundos)
+    ele tambem recebe esse limite e e encerrado se passar dele.
+    ``on_start(stop)`` recebe uma funcao que encerra o planejador, para quem
+    precisa interrompe-lo de outra thread. Devolve um PlannerRun; nunca sai
+    do programa.
+    """
+    planner = PLANNERS[planner]
+    run = PlannerRun(planner, PlanReader() if reader is None else reader)
+    started = time.monotonic()
+    try:
+        comando = planner.command(variante, domain, problem, time_limit=timeout)
+    except subprocess.TimeoutExpired as exc:
+        run.timed_out = True
+        run.returncode = TRANSLATE_OUT_OF_TIME
+        run.errors = f"o tradutor passou do limite de {exc.timeout:g}s"
+        run.reader.close()
+        return run
+    if timeout is not None:
+        # a traducao (quando nao esta no cache) conta dentro do limite
+        timeout = max(0.0, timeout - (time.monotonic() - started))
+    with tempfile.TemporaryFile(mode="w+") as stderr:
+        env = dict(os.environ, **planner.env) if planner.env else None
+        try:
+            proc = subprocess.Popen(comando, stdout=subprocess.PIPE, stderr=stderr, text=True,
+                                    bufsize=1, start_new_session=True, env=env)
+        except OSError as exc:
+            run.returncode = 1
+            run.errors = str(exc)
+            return run
+        with _running_lock:
+            _running.add(proc)
+        if on_start is not None:
+            on_start(lambda: _stop(proc))
+
+        def expire():
+            run.timed_out = True
+            _stop(proc)
+
+        timer = threading.Timer(timeout, expire) if timeout is not None else None
+        if timer is not None:
+            timer.start()
+        try:
+            with proc:
+                for line in proc.stdout:
+                    if on_line is not None:
+                        on_line(line)
+                    plan = run.reader.feed(line)
+                    if plan is None:
+                        continue
+                    if on_plan is not None:
+                        on_plan(plan)
+                    if first_plan:
+                        _stop(proc)
+                        run.stopped = True
+                        break
+        finally:
+            if timer is not None:
+                timer.cancel()
+            with _running_lock:
+                _running.discard(proc)
+        run.returncode = proc.returncode
+        if run.returncode != 0:
+            stderr.seek(0)
+            run.errors = stderr.read()
+    run.reader.close()
+    return run
+
+
+def chamar_planejador(planner, variante, domain, problem, **options):
+    """Como ``run_planner``, mas devolve o reader e, se o planejador falhar
+    sem ter achado plano, sai com o codigo de retorno dele."""
+    run = run_planner(planner, variante, domain, problem, **options)
+    if run.failed:
+        print(f"Erro ao executar o planejador {run.planner.name}:", file=sys.stderr)
+        print(run.errors, file=sys.stderr)
+        sys.exit(run.returncode)
+    return run.reader
@@ -0,0 +1,73 @@
+import os
+import threading
+
+from .plan import PlanReader, plan_cost
+from .planner import PLANNERS, run_planner
+
+# Em ordem de preferencia: com menos nucleos que configuracoes, as primeiras
+# sao as que correm.
+PORTFOLIO = ("lama-first-180", "scorpion-lama-first", "fdss-2023-60", "lama-60",
+             "madagascar", "julia-astar")
+
+UNKNOWN_COST = float("inf")
+
+
+def race(variante, domain, problem, planners=PORTFOLIO, budget=None, jobs=None):
+    """Roda varias configuracoes de ``planners`` ao mesmo tempo, uma por
+    nucleo (ou ``jobs``).
+
+    Sem ``budget`` devolve o primeiro plano que aparecer; com ``budget``
+    (segundos) espera ate o prazo, ou ate uma configuracao otima terminar, e
+    devolve o plano mais barato. As demais sao encerradas. Devolve
+    ``(plano, custo, vencedora)``, ou ``(None, None, None)`` se nenhuma achou
+    plano. Planos sem custo informado (Madagascar) so vencem se forem os
+    unicos.
+    """
+    planners = planners[:jobs or os.cpu_count() or 1]
+    lock = threading.Lock()
+    done = threading.Event()
+    stops = []
+    cancelled = False
+    found = []          # (custo, ordem, plano, configuracao)
+    running = [len(planners)]
+
+    def record(name, plan, cost):
+        with lock:
+            found.append((cost, len(found), plan, name))
+        if budget is None:
+            done.set()
+
+    def on_start(stop):
+        with lock:
+            if cancelled:
+                stop()
+            else:
+                stops.append(stop)
+
+    def worker(name):
+        run = run_planner(name, variante, domain, problem, reader=PlanReader(), timeout=budget,
+                          on_plan=lambda plan: record(name, plan, plan_cost(plan)),
+                          on_start=on_start)
+        if run.reader.uncosted:
+            record(name, run.reader.best, UNKNOWN_COST)
+        with lock:
+            running[0] -= 1
+            last = running[0] == 0
+        if last or (PLANNERS[name].optimal and run.complete and run.reader.plans):
+            done.set()
+
+    threads = [threading.Thread(target=worker, args=(name,), daemon=True) for name in planners]
+    for thread in threads:
+        thread.start()
+    done.wait(budget)
+    with lock:
+        cancelled = True
+        for stop in stops:
+            stop()
+    for thread in threads:
+        thread.join()
+
+    if not found:
+        return None, None, None
+    cost, _, plan, name = min(found) if budget is not None else found[0]
+    return plan, (None if cost == UNKNOWN_COST else cost), name
@@ -0,0 +1,54 @@
+import sys
+import json
+import time
+import resource
+from contextlib import contextmanager
+
+
+def _child_cpu():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class Profile:
+    """Tempo de parede e de CPU (do processo e dos filhos ja encerrados) por
+    fase de uma execucao, mais campos livres em ``fields``.
+
+    ``record()`` monta o registro JSON, com o pico de memoria (RSS, em KB)
+    do maior processo filho ja encerrado, o tradutor incluido: pode ser o
+    dele e nao o da busca (essa esta em ``fd.peak_memory_kb``); ``write``
+    grava esse registro numa linha.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.fields = {}
+
+    @contextmanager
+    def phase(self, name):
+        wall, cpu, child = time.perf_counter(), time.process_time(), _child_cpu()
+        try:
+            yield
+        finally:
+            entry = self.phases.setdefault(name, {"wall": 0.0, "cpu": 0.0, "child_cpu": 0.0})
+            entry["wall"] += time.perf_counter() - wall
+            entry["cpu"] += time.process_time() - cpu
+            entry["child_cpu"] += _child_cpu() - child
+
+    def record(self):
+        phases = {name: {k: round(v, 6) for k, v in entry.items()}
+                  for name, entry in self.phases.items()}
+        return dict(self.fields, phases=phases,
+                    wall=round(sum(e["wall"] for e in self.phases.values()), 6),
+                    child_peak_rss_kb=resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+                    timestamp=round(time.time(), 3))
+
+    def write(self, target="-"):
+        """Uma linha JSON em ``target`` (arquivo, acrescentado) ou, com "-",
+        na saida de erro, para nao misturar com a linha do plano."""
+        line = json.dumps(self.record(), sort_keys=True)
+        if target == "-":
+            print(line, file=sys.stderr)
+        else:
+            with open(target, "a") as f:
+                f.write(line + "\n")
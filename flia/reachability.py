@@ -0,0 +1,116 @@
+from collections import deque
+
+from .game_map import EnhancedGameMap
+
+# Cor da fruta que mata cada fantasma.
+KILLED_BY = {'R': '!', 'G': '@', 'B': '$'}
+# Ordem das cores nos bitsets, como em flia.native.
+GHOSTS, FRUITS = "RGB", "!@$"
+
+
+class UnsolvableMap(ValueError):
+    """O mapa nao tem solucao: algum fantasma nunca pode ser morto."""
+
+
+def _partners(game_map):
+    if len(game_map.portals) != 2:
+        return {}
+    p1, p2 = game_map.portals
+    return {p1: p2, p2: p1}
+
+
+def reachable_cells(game_map, start):
+    """Celulas alcancaveis a partir de ``start``: vizinhas livres e, ao pisar
+    num portal, o outro portal. O gelo so desliza por celulas vizinhas, entao
+    nao alcanca nada alem disso."""
+    partners = _partners(game_map)
+    table = game_map.neighbor_table
+    cell_id = game_map.cell_id
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        pos = queue.popleft()
+        i = cell_id[pos]
+        for j in table[4 * i:4 * i + 4]:
+            if j < 0:
+                continue
+            for nxt in (game_map.cells[j], partners.get(game_map.cells[j])):
+                if nxt is not None and nxt not in seen:
+                    seen.add(nxt)
+                    queue.append(nxt)
+    return seen
+
+
+def needed_colours(ghosts, fruits, active=0):
+    """Bitset das cores que ainda precisam de fruta, dados os fantasmas
+    vivos e as frutas restantes de cada cor (``ghosts[c]`` e ``fruits[c]``,
+    na ordem de GHOSTS) e o bitset ``active`` das cores ja ativas; None se
+    alguma cor tem menos frutas que fantasmas para matar. Cada morte gasta a
+    cor ativa, entao cada fantasma precisa de uma fruta, menos o primeiro de
+    uma cor que ja esta ativa."""
+    needed = 0
+    for colour in range(3):
+        pickups = ghosts[colour] - ((active >> colour) & 1)
+        if pickups <= 0:
+            continue
+        if pickups > fruits[colour]:
+            return None
+        needed |= 1 << colour
+    return needed
+
+
+def check_killable(game_map, reachable=None, per_kill=True):
+    """Levanta UnsolvableMap se algum fantasma esta fora do alcance do
+    Pac-Man ou se uma cor tem menos frutas alcancaveis que fantasmas.
+    ``per_kill=False`` e para modelos em que a fruta ativa nao se gasta a
+    cada morte (os sem ``Encoding.native``): basta uma fruta por cor."""
+    if game_map.pacman_pos is None:
+        raise UnsolvableMap("o mapa nao tem Pac-Man")
+    if reachable is None:
+        reachable = reachable_cells(game_map, game_map.pacman_pos)
+    ghosts, fruits = [0, 0, 0], [0, 0, 0]
+    for (x, y, s) in game_map.fruits:
+        if (x, y) in reachable:
+            fruits[FRUITS.index(s)] += 1
+    for (x, y, ghost) in game_map.ghosts:
+        if (x, y) not in reachable:
+            raise UnsolvableMap(f"o fantasma {ghost} em ({x}, {y}) nao e alcancavel")
+        ghosts[GHOSTS.index(ghost)] += 1
+    wanted = ghosts if per_kill else [min(n, 1) for n in ghosts]
+    if needed_colours(wanted, fruits) is None:
+        c = next(c for c in range(3) if wanted[c] > fruits[c])
+        ghost = GHOSTS[c]
+        raise UnsolvableMap(f"{ghosts[c]} fantasma(s) {ghost} e so {fruits[c]} fruta(s) "
+                            f"{KILLED_BY[ghost]} alcancavel(is)")
+
+
+def prune_unreachable(game_map, check=True, per_kill=True):
+    """Mapa equivalente a ``game_map`` sem as celulas (e portais, gelo,
+    pastilhas e frutas) que nem o Pac-Man nem os fantasmas alcancam; devolve
+    o proprio ``game_map`` se nao ha nada a cortar. Com ``check`` rejeita
+    antes, com UnsolvableMap, mapas em que algum fantasma nao pode ser morto
+    (``per_kill`` como em ``check_killable``).
+    """
+    reachable = set()
+    if game_map.pacman_pos is not None:
+        reachable = reachable_cells(game_map, game_map.pacman_pos)
+    if check:
+        check_killable(game_map, reachable, per_kill)
+    keep = set(reachable)
+    for (x, y, _) in game_map.ghosts:
+        if (x, y) not in keep:
+            keep |= reachable_cells(game_map, (x, y))
+
+    dropped = [pos for pos in game_map.cells if pos not in keep]
+    if not dropped:
+        return game_map
+    # Com exatamente dois portais eles se ligam: nao pode sobrar um par
+    # que antes estava inerte.
+    portals = [pos for pos in game_map.portals if pos in keep]
+    if len(portals) == 2 and len(game_map.portals) != 2:
+        dropped = [pos for pos in dropped if pos not in game_map.portals]
+
+    lines = [list(row) for row in game_map.grid]
+    for (x, y) in dropped:
+        lines[y][x] = '#'
+    return EnhancedGameMap(["".join(row) for row in lines], game_map.pastilhas)
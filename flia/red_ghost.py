@@ -0,0 +1,135 @@
+from array import array
+
+from .game_map import DIRECTION_INDEX, DIRECTION_NAMES, NORTH, SOUTH, EAST, WEST
+
+RED_TURN_ORDER = (
+    (NORTH, EAST, SOUTH, WEST),
+    (SOUTH, WEST, NORTH, EAST),
+    (EAST, SOUTH, WEST, NORTH),
+    (WEST, NORTH, EAST, SOUTH),
+)
+
+def red_ghost_step(cell, direction, game_map):
+    table = game_map.neighbor_table
+    for d in RED_TURN_ORDER[direction]:
+        n = table[4 * cell + d]
+        if n >= 0:
+            return n, d
+    return cell, direction
+
+def simulate_red_ghost_move(pos, current_direction, game_map):
+    cell, d = red_ghost_step(game_map.cell_id[pos], DIRECTION_INDEX[current_direction], game_map)
+    return game_map.cells[cell], DIRECTION_NAMES[d]
+
+
+class RedGhostTable:
+    """Trajetorias do fantasma vermelho para todos os estados do mapa.
+
+    O estado ``4 * cell + heading`` tem um unico sucessor, entao os estados
+    formam um grafo funcional: cada um percorre ``prefix_length`` passos ate
+    entrar num ciclo de ``cycle_length`` estados. Tudo e calculado de uma vez
+    em O(celulas); depois ``cell_at(cell, heading, t)`` responde a posicao no
+    instante t em O(1), para quantos fantasmas vermelhos houver.
+    """
+
+    def __init__(self, game_map):
+        size = 4 * len(game_map.cells)
+        self.successor = array('i', [0]) * size
+        for s in range(size):
+            cell, d = red_ghost_step(s >> 2, s & 3, game_map)
+            self.successor[s] = 4 * cell + d
+
+        self.tail = array('i', [0]) * size        # passos ate entrar no ciclo
+        self.cycle_of = array('i', [0]) * size    # indice em self.cycles
+        self.entry = array('i', [0]) * size       # posicao de entrada no ciclo
+        self.cycles = []
+        self._prefixes = {}
+
+        mark = bytearray(size)   # 0 = nao visto, 1 = no caminho atual, 2 = pronto
+        for start in range(size):
+            path = []
+            s = start
+            while not mark[s]:
+                mark[s] = 1
+                path.append(s)
+                s = self.successor[s]
+            if mark[s] == 1:
+                k = path.index(s)
+                cycle = path[k:]
+                for i, c in enumerate(cycle):
+                    self.cycle_of[c] = len(self.cycles)
+                    self.entry[c] = i
+                    mark[c] = 2
+                self.cycles.append(cycle)
+                del path[k:]
+            for c in reversed(path):
+                n = self.successor[c]
+                self.tail[c] = self.tail[n] + 1
+                self.cycle_of[c] = self.cycle_of[n]
+                self.entry[c] = self.entry[n]
+                mark[c] = 2
+
+    def prefix_length(self, cell, heading=EAST):
+        return self.tail[4 * cell + heading]
+
+    def cycle_length(self, cell, heading=EAST):
+        return len(self.cycles[self.cycle_of[4 * cell + heading]])
+
+    def _prefix(self, state):
+        prefix = self._prefixes.get(state)
+        if prefix is None:
+            prefix = []
+            s = state
+            for _ in range(self.tail[state]):
+                prefix.append(s)
+                s = self.successor[s]
+            self._prefixes[state] = prefix
+        return prefix
+
+    def state_at(self, state, t):
+        tail = self.tail[state]
+        if t < tail:
+            return self._prefix(state)[t]
+        cycle = self.cycles[self.cycle_of[state]]
+        return cycle[(self.entry[state] + t - tail) % len(cycle)]
+
+    def cell_at(self, cell, heading, t):
+        """Celula (id) do fantasma que partiu de ``cell`` com ``heading``,
+        depois de ``t`` passos."""
+        return self.state_at(4 * cell + heading, t) >> 2
+
+    def trajectory(self, cell, heading=EAST):
+        """Movimentos ``(de, para)`` em ids de celula, separados em prefixo e
+        ciclo, como ``detect_cycle_in_red_ghost_movement``."""
+        state = 4 * cell + heading
+        states = self._prefix(state)
+        cycle = self.cycles[self.cycle_of[state]]
+        entry = self.entry[state]
+        states = states + cycle[entry:] + cycle[:entry] + [cycle[entry]]
+        moves = [(a >> 2, b >> 2) for a, b in zip(states, states[1:])]
+        tail = self.tail[state]
+        return moves[:tail], moves[tail:]
+
+
+_TABLES = {}
+_MAX_TABLES = 32
+
+def red_ghost_table(game_map):
+    """Tabela do mapa, calculada uma vez por conjunto de celulas."""
+    key = tuple(game_map.cells)
+    table = _TABLES.get(key)
+    if table is None:
+        if len(_TABLES) >= _MAX_TABLES:
+            del _TABLES[next(iter(_TABLES))]
+        table = _TABLES[key] = RedGhostTable(game_map)
+    return table
+
+def detect_cycle_in_red_ghost_movement(start_pos, start_direction, game_map, max_steps=1000):
+    table = red_ghost_table(game_map)
+    prefix, cycle = table.trajectory(game_map.cell_id[start_pos], DIRECTION_INDEX[start_direction])
+    cells = game_map.cells
+    prefix = [(cells[a], cells[b]) for a, b in prefix]
+    cycle = [(cells[a], cells[b]) for a, b in cycle]
+    if len(prefix) + len(cycle) >= max_steps:
+        return (prefix + cycle)[:max_steps], []
+    return prefix, cycle
@@ -0,0 +1,65 @@
+class StateCodec:
+    """Empacota os estados de busca de um mapa num unico int.
+
+    Celulas vao como o id em ``game_map.cells``; fantasmas vivos, cores de
+    fruta ativas, frutas restantes e pastilhas restantes sao bitsets. A
+    ordem, a partir do bit menos significativo, e::
+
+        pacman | fantasma 1 .. fantasma n | alive | active | fruits | points | passo do vermelho
+
+    assim uma lista fechada indexada por estados empacotados custa um int
+    pequeno por entrada em vez de uma tupla de tuplas.
+    """
+
+    __slots__ = (
+        "n_ghosts", "cell_bits",
+        "alive_shift", "active_shift", "fruits_shift", "points_shift", "step_shift",
+        "cell_mask", "alive_mask", "fruits_mask", "points_mask", "bits",
+    )
+
+    def __init__(self, game_map, red_steps=1):
+        self.n_ghosts = len(game_map.ghosts)
+        self.cell_bits = max(1, (len(game_map.cells) - 1).bit_length())
+        self.cell_mask = (1 << self.cell_bits) - 1
+
+        self.alive_shift = self.cell_bits * (1 + self.n_ghosts)
+        self.alive_mask = (1 << self.n_ghosts) - 1
+        self.active_shift = self.alive_shift + self.n_ghosts
+        self.fruits_shift = self.active_shift + 3
+        self.fruits_mask = (1 << len(game_map.fruits)) - 1
+        self.points_shift = self.fruits_shift + len(game_map.fruits)
+        self.points_mask = (1 << len(game_map.points)) - 1
+        self.step_shift = self.points_shift + len(game_map.points)
+        self.bits = self.step_shift + max(1, (red_steps - 1).bit_length())
+
+    def pack(self, state):
+        pacman, ghost_cells, alive, active, fruits_left, points_left, red_step = state
+        key = pacman
+        shift = self.cell_bits
+        for cell in ghost_cells:
+            key |= cell << shift
+            shift += self.cell_bits
+        return (key
+                | alive << self.alive_shift
+                | active << self.active_shift
+                | fruits_left << self.fruits_shift
+                | points_left << self.points_shift
+                | red_step << self.step_shift)
+
+    def unpack(self, key):
+        mask = self.cell_mask
+        pacman = key & mask
+        ghost_cells = []
+        shift = self.cell_bits
+        for _ in range(self.n_ghosts):
+            ghost_cells.append((key >> shift) & mask)
+            shift += self.cell_bits
+        return (
+            pacman,
+            tuple(ghost_cells),
+            (key >> self.alive_shift) & self.alive_mask,
+            (key >> self.active_shift) & 7,
+            (key >> self.fruits_shift) & self.fruits_mask,
+            (key >> self.points_shift) & self.points_mask,
+            key >> self.step_shift,
+        )
@@ -0,0 +1,135 @@
+from math import gcd
+
+from .game_map import EnhancedGameMap, DIRECTION_DELTAS, EAST
+from .red_ghost import red_ghost_table
+from .cache import cached_plan, content_hash, grid_plan_key, plan_key
+
+LETTERS = "NSEW"
+
+# Simetrias do retangulo W x H: (nome, ponto, parte linear em (dx, dy)).
+# As regras dos fantasmas azul e verde sao relativas a direcao do Pac-Man e
+# valem em todas; a do vermelho (ordem horaria, partindo para leste) so vale
+# quando a trajetoria transformada coincide, o que valid_symmetries checa.
+SYMMETRIES = (
+    ("identity",       lambda x, y, w, h: (x, y),                 lambda dx, dy: (dx, dy)),
+    ("mirror-x",       lambda x, y, w, h: (w - 1 - x, y),         lambda dx, dy: (-dx, dy)),
+    ("mirror-y",       lambda x, y, w, h: (x, h - 1 - y),         lambda dx, dy: (dx, -dy)),
+    ("rotate-180",     lambda x, y, w, h: (w - 1 - x, h - 1 - y), lambda dx, dy: (-dx, -dy)),
+    ("transpose",      lambda x, y, w, h: (y, x),                 lambda dx, dy: (dy, dx)),
+    ("rotate-90",      lambda x, y, w, h: (h - 1 - y, x),         lambda dx, dy: (-dy, dx)),
+    ("rotate-270",     lambda x, y, w, h: (y, w - 1 - x),         lambda dx, dy: (dy, -dx)),
+    ("anti-transpose", lambda x, y, w, h: (h - 1 - y, w - 1 - x), lambda dx, dy: (-dy, -dx)),
+)
+_BY_NAME = {name: (point, linear) for name, point, linear in SYMMETRIES}
+
+
+def _size(grid):
+    return max((len(row) for row in grid), default=0), len(grid)
+
+
+def transform_lines(grid, name):
+    """Linhas do mapa ``grid`` (lista de linhas ou de listas de caracteres)
+    depois da simetria ``name``; linhas curtas sao completadas com parede."""
+    point, linear = _BY_NAME[name]
+    w, h = _size(grid)
+    nw, nh = (w, h) if linear(1, 0)[1] == 0 else (h, w)
+    out = [["#"] * nw for _ in range(nh)]
+    for y, row in enumerate(grid):
+        for x in range(w):
+            nx, ny = point(x, y, w, h)
+            out[ny][nx] = row[x] if x < len(row) else "#"
+    return ["".join(row) for row in out]
+
+
+def direction_map(name):
+    """Letra de cada direcao do mapa original no mapa transformado."""
+    _, linear = _BY_NAME[name]
+    by_delta = {delta: letter for letter, delta in zip(LETTERS, DIRECTION_DELTAS)}
+    return {letter: by_delta[linear(*delta)] for letter, delta in zip(LETTERS, DIRECTION_DELTAS)}
+
+
+def transform_moves(moves, name, inverse=False):
+    """Aplica a simetria (ou a inversa) a uma sequencia ``N;E;...``."""
+    mapping = direction_map(name)
+    if inverse:
+        mapping = {v: k for k, v in mapping.items()}
+    return ";".join(mapping.get(m, m) for m in moves.split(";")) if moves else moves
+
+
+def _first_red(game_map):
+    for (x, y, colour) in game_map.ghosts:
+        if colour == 'R':
+            return (x, y)
+    return None
+
+
+def _red_positions(game_map, start, steps):
+    table = red_ghost_table(game_map)
+    cell = game_map.cell_id[start]
+    return [game_map.cells[table.cell_at(cell, EAST, t)] for t in range(steps)]
+
+
+def _red_horizon(game_map, start):
+    table = red_ghost_table(game_map)
+    cell = game_map.cell_id[start]
+    return table.prefix_length(cell), table.cycle_length(cell)
+
+
+def _same_red(game_map, name, image, red_schedule):
+    # A trajetoria do vermelho em ``image`` e a imagem da de ``game_map``?
+    red = _first_red(game_map)
+    if red is None or name == "identity":
+        return True
+    point, _ = _BY_NAME[name]
+    w, h = _size(game_map.grid)
+    if not red_schedule or _first_red(image) != point(*red, w, h):
+        return False
+    t1, l1 = _red_horizon(game_map, red)
+    t2, l2 = _red_horizon(image, _first_red(image))
+    steps = max(t1, t2) + l1 * l2 // gcd(l1, l2)
+    expected = [point(x, y, w, h) for (x, y) in _red_positions(game_map, red, steps)]
+    return expected == _red_positions(image, _first_red(image), steps)
+
+
+def valid_symmetries(game_map, red_schedule=True):
+    """Nomes das simetrias que levam ``game_map`` a um problema equivalente,
+    com ``(nome, mapa transformado)``. Com fantasma vermelho so entram as que
+    preservam a trajetoria dele; se a codificacao nao usa a trajetoria
+    calculada (``red_schedule=False``), so a identidade."""
+    result = []
+    for name, _, _ in SYMMETRIES:
+        image = EnhancedGameMap(transform_lines(game_map.grid, name), game_map.pastilhas)
+        if _same_red(game_map, name, image, red_schedule):
+            result.append((name, image))
+    return result
+
+
+def grid_key(encoding_name, lines, pastilhas=True):
+    """Chave do mapa ``lines`` para ``encoding_name``, sem gerar o PDDL:
+    ``store_plan(..., grid=...)`` liga a chave ao plano."""
+    return content_hash(encoding_name, str(bool(pastilhas)), *("".join(row) for row in lines))
+
+
+def cached_symmetric_plan(encoding, game_map):
+    """Procura no cache de planos alguma imagem simetrica de ``game_map``
+    ja resolvida com ``encoding``; devolve a entrada com os movimentos ja
+    trazidos de volta para ``game_map``, ou None.
+
+    As imagens sao procuradas pela chave de mapa, entao uma falta custa so
+    as transformacoes do grid; o PDDL so e gerado para a imagem achada, e a
+    chave do plano conferida contra ele (a codificacao pode ter mudado)."""
+    for name, _, _ in SYMMETRIES[1:]:
+        lines = transform_lines(game_map.grid, name)
+        key = grid_plan_key(grid_key(encoding.name, lines, game_map.pastilhas))
+        if key is None:
+            continue
+        image = EnhancedGameMap(lines, game_map.pastilhas)
+        if not _same_red(game_map, name, image, encoding.red_schedule):
+            continue
+        if plan_key(encoding.name, *encoding.generate(image)) != key:
+            continue
+        entry = cached_plan(key)
+        if entry is not None:
+            return dict(entry, moves=transform_moves(entry["moves"], name, inverse=True),
+                        symmetry=name)
+    return None
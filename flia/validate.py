@@ -0,0 +1,117 @@
+import sys
+
+from .game_map import EnhancedGameMap, DIRECTION_NAMES
+from .native import GameRules, LETTERS
+from .reachability import prune_unreachable
+
+COLOUR_LETTERS = "RGB"
+
+
+class Replay:
+    """Resultado de ``replay``: ``ok`` se todos os movimentos sao legais e o
+    ultimo mata o ultimo fantasma vivo; senao ``error`` explica o primeiro
+    problema, no movimento ``step`` (contado de 0). ``kills`` lista
+    ``(passo, fantasma, cor)`` e ``cost`` e o custo recalculado dos
+    movimentos aplicados."""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.ok = False
+        self.error = None
+        self.step = None
+        self.cost = 0
+        self.kills = []
+        self.state = None
+        self.goal_step = None
+
+    def describe(self):
+        """O estado final em coordenadas do mapa."""
+        rules = self.rules
+        pacman, ghost_cells, alive, active, fruits_left, points_left, _ = self.state
+        cells = rules.game_map.cells
+        return {
+            "pacman": cells[pacman],
+            "ghosts": [(cells[c], COLOUR_LETTERS[rules.ghost_colours[i]], bool((alive >> i) & 1))
+                       for i, c in enumerate(ghost_cells)],
+            "active": [COLOUR_LETTERS[c] for c in range(3) if (active >> c) & 1],
+            "fruits_left": bin(fruits_left).count("1"),
+            "pastilhas_left": bin(points_left).count("1"),
+        }
+
+
+def replay(game_map, moves, rules=None):
+    """Repete ``moves`` (``"N;E;..."``, sem o custo) com as regras de
+    flia.native e devolve um Replay."""
+    rules = rules or GameRules(game_map)
+    result = Replay(rules)
+    state = rules.initial_state()
+    letters = [m for m in moves.split(";") if m] if moves else []
+    for step, letter in enumerate(letters):
+        if rules.is_goal(state) and result.goal_step is None:
+            result.goal_step = step
+        if letter not in LETTERS:
+            result.error, result.step = f"movimento desconhecido {letter!r}", step
+            break
+        d = LETTERS.index(letter)
+        where = game_map.cells[state[0]]
+        if rules.slides[4 * state[0] + d] is None:
+            result.error = f"nao ha movimento para {DIRECTION_NAMES[d]} a partir de {where}"
+            result.step = step
+            break
+        applied = rules.apply(state, d)
+        if applied is None:
+            result.error = (f"o Pac-Man seria pego por um fantasma indo para "
+                            f"{DIRECTION_NAMES[d]} a partir de {where}")
+            result.step = step
+            break
+        cost, new = applied
+        dead = state[2] & ~new[2]
+        for i, colour in enumerate(rules.ghost_colours):
+            if (dead >> i) & 1:
+                result.kills.append((step, i, COLOUR_LETTERS[colour]))
+        result.cost += cost
+        state = new
+    result.state = state
+    if result.error is None:
+        if not rules.is_goal(state):
+            result.error = "os movimentos terminam com fantasmas vivos"
+        elif result.goal_step is not None:
+            result.error = f"todos os fantasmas ja estao mortos antes do movimento {result.goal_step}"
+            result.step = result.goal_step
+        else:
+            result.ok = True
+    return result
+
+
+def validate_plan(game_map, plan, check_cost=True):
+    """Valida uma linha ``N;E;...;custo``; devolve ``(Replay, erro)``, com
+    ``erro`` None se o plano e legal e, com ``check_cost``, se o custo
+    informado confere com o recalculado."""
+    moves, _, cost = plan.rpartition(";")
+    result = replay(game_map, moves)
+    if not result.ok:
+        return result, result.error
+    if check_cost and cost.isdigit() and int(cost) != result.cost:
+        return result, f"custo informado {cost}, recalculado {result.cost}"
+    return result, None
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("uso: python -m flia.validate MAPA 'N;E;...;custo'", file=sys.stderr)
+        sys.exit(2)
+    with open(sys.argv[1]) as f:
+        game_map = prune_unreachable(EnhancedGameMap(f.read().splitlines()), check=False)
+    result, error = validate_plan(game_map, sys.argv[2])
+    for step, ghost, colour in result.kills:
+        print(f"movimento {step}: mata o fantasma {colour} #{ghost + 1}")
+    print(f"custo recalculado: {result.cost}")
+    print(f"estado final: {result.describe()}")
+    if error is not None:
+        print(f"INVALIDO: {error}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
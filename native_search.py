@@ -0,0 +1,4 @@
+from flia.native import GameRules, solve, main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import os
+import json
+import math
+import argparse
+import tempfile
+
+from flia.encodings import ENCODINGS
+from flia.planner import PLANNERS
+from flia.mapgen import generate_map
+from bench import bench_encoding, bench_native
+
+FIELDS = ("encoding", "size", "cells", "status", "gen_s", "init", "bytes",
+          "translate_s", "plan_s", "length", "cost")
+TIMES = ("gen_s", "translate_s", "plan_s")
+
+
+def sweep(sizes, encodings=("SAT",), trials=1, solve=False, planner=None, timeout=None,
+          native=False, seed=0, max_expansions=200000, **map_options):
+    """Gera um mapa por lado em ``sizes`` (``generate_map(n, n, ...)``, com
+    ``seed + n``) e mede cada codificacao nele; devolve uma linha por
+    (codificacao, tamanho), com ``cells`` e ``size``. A busca nativa para
+    em ``max_expansions``."""
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="flia-sweep-") as tmp:
+        for n in sizes:
+            lines = generate_map(n, n, seed=seed + n, **map_options)
+            path = os.path.join(tmp, f"sweep-{n}.txt")
+            with open(path, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            cells = sum(1 for line in lines for c in line if c != '#')
+            found = [bench_encoding(name, path, trials, solve, planner, timeout)
+                     for name in encodings]
+            if native:
+                found.append(bench_native(path, trials, max_expansions))
+            for row in found:
+                row.update(size=f"{n}x{n}", cells=cells)
+            rows += found
+    return rows
+
+
+def growth(rows, metric):
+    """Expoente ``k`` de ``metric ~ cells**k`` entre o menor e o maior mapa
+    medido de cada codificacao (None com menos de dois pontos)."""
+    by_encoding = {}
+    for row in rows:
+        if row.get(metric) not in ("", None) and row[metric] > 0:
+            by_encoding.setdefault(row["encoding"], []).append((row["cells"], row[metric]))
+    result = {}
+    for encoding, points in by_encoding.items():
+        (c1, t1), (c2, t2) = min(points), max(points)
+        result[encoding] = round(math.log(t2 / t1) / math.log(c2 / c1), 2) if c2 > c1 else None
+    return result
+
+
+def breaking_points(rows):
+    """Primeiro tamanho em que cada codificacao deixou de resolver."""
+    broken = {}
+    for row in rows:
+        if row["status"] != "ok" and row["encoding"] not in broken:
+            broken[row["encoding"]] = f"{row['size']} ({row['status']})"
+    return broken
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mede como cada codificacao escala em mapas gerados de tamanho crescente.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 40, 80],
+                        help="lados dos mapas quadrados (padrao: 10 20 40 80)")
+    parser.add_argument("--encodings", nargs="+", default=["SAT"], choices=sorted(ENCODINGS),
+                        metavar="NOME", help="codificacoes medidas (padrao: SAT)")
+    parser.add_argument("--native", action="store_true", help="inclui a busca nativa")
+    parser.add_argument("--solve", action="store_true", help="tambem roda tradutor e planejador")
+    parser.add_argument("--planner", choices=sorted(PLANNERS),
+                        help="com --solve, usa este planejador em todas")
+    parser.add_argument("--timeout", type=float, default=300,
+                        help="limite do planejador por mapa, em segundos")
+    parser.add_argument("--trials", type=int, default=1, help="repeticoes por medida")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--walls", type=float, default=0.35)
+    parser.add_argument("--ghosts", default="RGB")
+    parser.add_argument("--portals", action="store_true")
+    parser.add_argument("--ice", type=int, default=0)
+    parser.add_argument("--pastilhas", type=float, default=0.2)
+    parser.add_argument("--json", help="grava as linhas medidas neste arquivo")
+    args = parser.parse_args()
+
+    rows = sweep(sorted(args.sizes), args.encodings, args.trials, args.solve, args.planner,
+                 args.timeout, args.native, args.seed, walls=args.walls, ghosts=args.ghosts,
+                 portals=args.portals, ice=args.ice, pastilhas=args.pastilhas)
+    widths = {k: max(len(k), *(len(str(r.get(k, ""))) for r in rows)) for k in FIELDS}
+    print("  ".join(k.ljust(widths[k]) for k in FIELDS))
+    for r in rows:
+        print("  ".join(str(r.get(k, "")).ljust(widths[k]) for k in FIELDS))
+
+    print()
+    for metric in TIMES:
+        for encoding, k in sorted(growth(rows, metric).items()):
+            if k is not None:
+                print(f"{encoding}: {metric} ~ cells^{k}")
+    for encoding, size in sorted(breaking_points(rows).items()):
+        print(f"{encoding}: para de resolver em {size}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from flia.game_map import EnhancedGameMap
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def load_map():
+    """Le um dos ent*.txt da raiz do repositorio."""
+    def load(name):
+        with open(os.path.join(REPO_DIR, name)) as f:
+            return EnhancedGameMap(f.read().splitlines())
+    return load
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    # Planos e tabelas de distancia vao para um cache temporario, nunca o do usuario.
+    monkeypatch.setattr("flia.cache.CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr("flia.distances.CACHE_DIR", str(tmp_path))
+    return tmp_path
@@ -0,0 +1,279 @@
+"""Interpretador minimo de PDDL para os testes: o subconjunto ADL que as
+codificacoes geram (and/or/not, exists/forall, when, =, increase de
+total-cost), instanciado sobre os objetos do problema.
+
+Serve de referencia para as regras de flia.native sem precisar de um
+planejador: ``Task.optimum`` e um Dijkstra sobre a semantica do dominio e
+``Task.replay`` executa uma sequencia de direcoes do Pac-Man, escolhendo as
+acoes automaticas (fantasmas, portal, mortes) entre elas.
+"""
+import heapq
+import itertools
+import re
+
+from flia.plan import action_direction
+
+TRUE, FALSE = ("true",), ("false",)
+_COMPOUND = ("and", "or", "not", "exists", "forall")
+
+
+def parse(text):
+    """Texto PDDL como listas aninhadas de strings em minusculas."""
+    tokens = re.findall(r"\(|\)|[^\s()]+", re.sub(r";[^\n]*", "", text).lower())
+    stack = [[]]
+    for token in tokens:
+        if token == "(":
+            stack.append([])
+        elif token == ")":
+            done = stack.pop()
+            stack[-1].append(done)
+        else:
+            stack[-1].append(token)
+    return stack[0][0]
+
+
+def _typed(items):
+    """``a b - t c - u`` como lista de ``(nome, tipo)``."""
+    out, pending = [], []
+    it = iter(items)
+    for item in it:
+        if item == "-":
+            kind = next(it)
+            out += [(name, kind) for name in pending]
+            pending = []
+        else:
+            pending.append(item)
+    return out + [(name, "object") for name in pending]
+
+
+def _section(tree, key):
+    for part in tree:
+        if isinstance(part, list) and part and part[0] == key:
+            return part[1:]
+    return []
+
+
+def _and(parts):
+    out = []
+    for part in parts:
+        if part == FALSE:
+            return FALSE
+        if part != TRUE:
+            out.extend(part[1] if part[0] == "and" else [part])
+    return TRUE if not out else out[0] if len(out) == 1 else ("and", out)
+
+
+def _or(parts):
+    out = []
+    for part in parts:
+        if part == TRUE:
+            return TRUE
+        if part != FALSE:
+            out.extend(part[1] if part[0] == "or" else [part])
+    return FALSE if not out else out[0] if len(out) == 1 else ("or", out)
+
+
+class Task:
+    """Dominio e problema instanciados. Predicados que nenhum efeito muda
+    sao resolvidos na instanciacao; o estado guarda so os fluentes."""
+
+    def __init__(self, domain, problem):
+        domain, problem = parse(domain), parse(problem)
+        self.objects = {}
+        self._order = {}
+        for name, kind in _typed(_section(domain, ":constants") + _section(problem, ":objects")):
+            self.objects.setdefault(kind, []).append(name)
+        actions = [part for part in domain if isinstance(part, list) and part[0] == ":action"]
+        self.fluents = set()
+        for action in actions:
+            self._effect_predicates(dict(zip(action[2::2], action[3::2]))[":effect"])
+        init = set()
+        for atom in _section(problem, ":init"):
+            if atom[0] != "=":
+                init.add(tuple(atom))
+        self.static = {atom for atom in init if atom[0] not in self.fluents}
+        self.init = frozenset(atom for atom in init if atom[0] in self.fluents)
+        self.goal = self._formula(_section(problem, ":goal")[0], {})
+        self.actions = []
+        for action in actions:
+            self._ground(action)
+        self._by_trigger = {}
+        for grounded in self.actions:
+            self._by_trigger.setdefault(grounded[4], []).append(grounded)
+
+    def _effect_predicates(self, effect):
+        head = effect[0]
+        if head == "and":
+            for part in effect[1:]:
+                self._effect_predicates(part)
+        elif head == "forall":
+            self._effect_predicates(effect[2])
+        elif head == "when":
+            self._effect_predicates(effect[2])
+        elif head == "not":
+            self.fluents.add(effect[1][0])
+        elif head != "increase":
+            self.fluents.add(head)
+
+    def _bind(self, params, binding):
+        names = [name for name, _ in params]
+        for values in itertools.product(*(self.objects.get(kind, []) for _, kind in params)):
+            yield dict(binding, **dict(zip(names, values)))
+
+    def _atoms_first(self, tree):
+        order = self._order.get(id(tree))
+        if order is None:
+            order = self._order[id(tree)] = sorted(tree[1:], key=lambda p: p[0] in _COMPOUND)
+        return order
+
+    def _formula(self, tree, binding):
+        head = tree[0]
+        if head in ("and", "or"):
+            # Atomos primeiro: um estatico falso (ou verdadeiro, no or) evita
+            # expandir os quantificadores do resto.
+            stop = FALSE if head == "and" else TRUE
+            parts = []
+            for part in self._atoms_first(tree):
+                part = self._formula(part, binding)
+                if part == stop:
+                    return stop
+                parts.append(part)
+            return _and(parts) if head == "and" else _or(parts)
+        if head == "not":
+            inner = self._formula(tree[1], binding)
+            return FALSE if inner == TRUE else TRUE if inner == FALSE else ("not", inner)
+        if head in ("exists", "forall"):
+            stop = TRUE if head == "exists" else FALSE
+            parts = []
+            for b in self._bind(_typed(tree[1]), binding):
+                part = self._formula(tree[2], b)
+                if part == stop:
+                    return stop
+                parts.append(part)
+            return _or(parts) if head == "exists" else _and(parts)
+        atom = tuple(binding.get(arg, arg) for arg in tree)
+        if head == "=":
+            return TRUE if atom[1] == atom[2] else FALSE
+        if head not in self.fluents:
+            return TRUE if atom in self.static else FALSE
+        return ("atom", atom)
+
+    def _effects(self, tree, binding, condition, out):
+        head = tree[0]
+        if head == "and":
+            for part in tree[1:]:
+                self._effects(part, binding, condition, out)
+        elif head == "forall":
+            for b in self._bind(_typed(tree[1]), binding):
+                self._effects(tree[2], b, condition, out)
+        elif head == "when":
+            when = _and([condition, self._formula(tree[1], binding)])
+            if when != FALSE:
+                self._effects(tree[2], binding, when, out)
+        elif head == "increase":
+            out.append((condition, "cost", int(tree[2])))
+        elif head == "not":
+            out.append((condition, "del", tuple(binding.get(a, a) for a in tree[1])))
+        else:
+            out.append((condition, "add", tuple(binding.get(a, a) for a in tree)))
+
+    def _prefilter(self, params, precondition):
+        """Instancia os parametros um a um, cortando pelos atomos estaticos
+        do topo da precondicao assim que todas as suas variaveis tem valor."""
+        parts = precondition[1:] if precondition[0] == "and" else [precondition]
+        static = [part for part in parts if part[0] not in _COMPOUND
+                  and part[0] != "=" and part[0] not in self.fluents]
+        names = [name for name, _ in params]
+
+        def extend(index, binding):
+            if index == len(params):
+                yield binding
+                return
+            name, kind = params[index]
+            known = set(names[:index + 1])
+            checks = [atom for atom in static
+                      if name in atom[1:] and all(a in known for a in atom[1:] if a.startswith("?"))]
+            for value in self.objects.get(kind, []):
+                child = dict(binding, **{name: value})
+                if all(tuple(child.get(a, a) for a in atom) in self.static for atom in checks):
+                    yield from extend(index + 1, child)
+
+        return extend(0, {})
+
+    def _ground(self, action):
+        fields = dict(zip(action[2::2], action[3::2]))
+        params = _typed(fields.get(":parameters", []))
+        precondition = fields.get(":precondition", ["and"])
+        for binding in self._prefilter(params, precondition):
+            pre = self._formula(precondition, binding)
+            if pre == FALSE:
+                continue
+            effects = []
+            self._effects(fields[":effect"], binding, TRUE, effects)
+            name = " ".join([action[1]] + [binding[n] for n, _ in params])
+            parts = pre[1] if pre[0] == "and" else [pre]
+            trigger = next((p[1] for p in parts if p[0] == "atom"), None)
+            self.actions.append((name, pre, effects, action_direction(name), trigger))
+
+    def holds(self, formula, state):
+        head = formula[0]
+        if head == "atom":
+            return formula[1] in state
+        if head == "and":
+            return all(self.holds(part, state) for part in formula[1])
+        if head == "or":
+            return any(self.holds(part, state) for part in formula[1])
+        if head == "not":
+            return not self.holds(formula[1], state)
+        return formula == TRUE
+
+    def successors(self, state):
+        """``(nome, direcao ou None, custo, estado)`` de cada acao aplicavel."""
+        candidates = itertools.chain(self._by_trigger.get(None, ()),
+                                     *(self._by_trigger.get(atom, ()) for atom in state))
+        for name, pre, effects, direction, _ in candidates:
+            if not self.holds(pre, state):
+                continue
+            adds, dels, cost = set(), set(), 0
+            for condition, kind, value in effects:
+                if self.holds(condition, state):
+                    if kind == "cost":
+                        cost += value
+                    elif kind == "add":
+                        adds.add(value)
+                    else:
+                        dels.add(value)
+            yield name, direction, cost, frozenset((state - dels) | adds)
+
+    def _search(self, moves=None, limit=None):
+        counter = itertools.count()
+        start = (self.init, 0)
+        best = {start: 0}
+        frontier = [(0, next(counter), start)]
+        while frontier:
+            cost, _, node = heapq.heappop(frontier)
+            if cost > best[node]:
+                continue
+            state, done = node
+            if self.holds(self.goal, state) and (moves is None or done == len(moves)):
+                return cost
+            if limit is not None and len(best) > limit:
+                raise RuntimeError("estados demais para o Dijkstra dos testes")
+            for _, direction, step, child in self.successors(state):
+                if direction is not None and moves is not None:
+                    if done == len(moves) or direction != moves[done]:
+                        continue
+                key = (child, done + (direction is not None and moves is not None))
+                if cost + step < best.get(key, cost + step + 1):
+                    best[key] = cost + step
+                    heapq.heappush(frontier, (cost + step, next(counter), key))
+        return None
+
+    def optimum(self, limit=200000):
+        """Custo otimo do problema, ou None se nao tem solucao."""
+        return self._search(limit=limit)
+
+    def replay(self, moves, limit=200000):
+        """Menor custo de executar a sequencia ``moves`` (letras N/S/E/W) e
+        terminar no objetivo, ou None se o dominio nao permite."""
+        return self._search(list(moves), limit)
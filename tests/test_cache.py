@@ -0,0 +1,139 @@
+import os
+import subprocess
+import time
+
+import pytest
+
+from flia import planner as planner_module
+from flia.cache import (_plan_path, cached_domain, cached_plan, cached_problem,
+                        cached_translation, content_hash, evict_plans, plan_key, store_plan,
+                        write_once)
+from flia.planner import TRANSLATE_OUT_OF_TIME, Planner, run_planner
+
+
+def _counting_translator(tmp_path):
+    # Grava o --sas-file e conta as execucoes.
+    script = tmp_path / "translate.sh"
+    runs = tmp_path / "runs"
+    script.write_text(f"#!/bin/sh\necho run >> {runs}\necho sas > \"$2\"\n")
+    script.chmod(0o755)
+    return str(script), runs
+
+
+def _slow_translator(tmp_path):
+    # Como o driver do Fast Downward: o trabalho fica num processo filho.
+    script = tmp_path / "translate.sh"
+    pid_file = tmp_path / "child.pid"
+    script.write_text(f"#!/bin/sh\nsleep 30 &\necho $! > {pid_file}\nwait\n")
+    script.chmod(0o755)
+    return str(script), pid_file
+
+
+def _gone(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    with open(f"/proc/{pid}/stat") as f:
+        return f.read().split(")")[-1].split()[0] == "Z"
+
+
+def test_content_hash_separates_parts():
+    assert content_hash("ab", "c") != content_hash("a", "bc")
+    assert content_hash("a", "b") == content_hash("a", "b")
+    assert len(content_hash("a")) == 20
+
+
+def test_write_once_keeps_the_first_text(cache_dir):
+    path = str(cache_dir / "x" / "a.pddl")
+    assert write_once(path, "um") == path
+    write_once(path, "dois")
+    with open(path) as f:
+        assert f.read() == "um"
+    assert os.listdir(cache_dir / "x") == ["a.pddl"]
+
+
+def test_cached_domain_is_keyed_by_content():
+    first = cached_domain("SAT", "(domain a)")
+    assert cached_domain("SAT", "(domain a)") == first
+    assert cached_domain("SAT", "(domain b)") != first
+    assert cached_domain("movRN", "(domain a)") != first
+    assert cached_problem("SAT", "(domain a)", "(p)") != cached_problem("SAT", "(domain b)", "(p)")
+
+
+def test_translation_runs_once_per_input(tmp_path):
+    path, runs = _counting_translator(tmp_path)
+    sas = cached_translation(path, "SAT", "(domain)", "(problem)")
+    assert cached_translation(path, "SAT", "(domain)", "(problem)") == sas
+    with open(sas) as f:
+        assert f.read() == "sas\n"
+    assert runs.read_text().count("run") == 1
+    assert cached_translation(path, "SAT", "(domain)", "(outro)") != sas
+    assert runs.read_text().count("run") == 2
+
+
+def test_failed_translation_is_not_cached(tmp_path, cache_dir):
+    script = tmp_path / "falha.sh"
+    script.write_text("#!/bin/sh\nexit 1\n")
+    script.chmod(0o755)
+    assert cached_translation(str(script), "SAT", "(domain)", "(problem)") is None
+    assert os.listdir(cache_dir / "sas") == []
+
+
+def test_plan_key_ignores_formatting():
+    key = plan_key("SAT", "(define (domain d)) ; comentario", "(define (problem p)\n  (:init))")
+    assert plan_key("SAT", "(DEFINE  (domain d))", "(define (problem p) (:init)) ; fim") == key
+    assert plan_key("movRN", "(define (domain d))", "(define (problem p) (:init))") != key
+    assert plan_key("SAT", "(define (domain d))", "(define (problem q) (:init))") != key
+
+
+def test_store_plan_keeps_the_better_entry():
+    store_plan("k", "N;S", cost=20)
+    store_plan("k", "N;E", cost=30)
+    assert cached_plan("k")["moves"] == "N;S"
+    store_plan("k", "E;E", cost=18)
+    assert cached_plan("k")["cost"] == 18
+    store_plan("k", "W;W", cost=24, optimal=True)
+    store_plan("k", "S;S", cost=10)
+    entry = cached_plan("k")
+    assert entry["optimal"] and entry["moves"] == "W;W"
+    assert cached_plan("outra") is None
+
+
+def test_eviction_drops_the_least_recently_used():
+    for i, key in enumerate("abc"):
+        store_plan(key, "N", cost=i)
+        os.utime(_plan_path(key), (1000 + i, 1000 + i))
+    # Ler "a" renova a entrada; a menos usada passa a ser "b".
+    assert cached_plan("a") is not None
+    store_plan("d", "N", cost=3, max_entries=3)
+    assert cached_plan("b") is None
+    assert all(cached_plan(key) is not None for key in "acd")
+    evict_plans(1)
+    assert len(os.listdir(os.path.dirname(_plan_path("")))) == 1
+
+
+def test_translation_timeout_kills_the_group(tmp_path, cache_dir):
+    path, pid_file = _slow_translator(tmp_path)
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        cached_translation(path, "SAT", "(domain)", "(problem)", timeout=0.5)
+    assert time.monotonic() - start < 10
+    child = int(pid_file.read_text())
+    for _ in range(50):
+        if _gone(child):
+            break
+        time.sleep(0.1)
+    assert _gone(child)
+    assert not any(name.endswith(".tmp") for name in os.listdir(cache_dir / "sas"))
+
+
+def test_translation_timeout_is_a_timed_out_run(tmp_path, monkeypatch):
+    path, _ = _slow_translator(tmp_path)
+    monkeypatch.setitem(planner_module.PLANNERS, "lento",
+                        Planner("lento", path, (), translate=True))
+    run = run_planner("lento", "SAT", "(domain)", "(problem)", timeout=0.5)
+    assert run.timed_out and run.failed
+    assert run.returncode == TRANSLATE_OUT_OF_TIME
+    assert run.reader.best is None
+    assert not planner_module._running
@@ -0,0 +1,34 @@
+import pytest
+
+from flia.encodings import get_encoding
+from flia.game_map import EnhancedGameMap
+from flia.mapgen import generate_map
+
+from .pddl import Task
+from .test_native import RED_FIRST
+
+GB = generate_map(7, 5, ghosts="GB", seed=1)
+RB_PORTALS = generate_map(7, 5, ghosts="RB", portals=True, seed=12)
+
+
+def _optimum(name, lines):
+    return Task(*get_encoding(name).generate(EnhancedGameMap(lines))).optimum()
+
+
+@pytest.mark.parametrize("name, lines", [
+    ("SAT", GB),
+    ("SAT", RED_FIRST),
+    ("movRN", GB),
+    ("movG2", RB_PORTALS),
+    ("movG21", GB),
+    ("movR2", RB_PORTALS),
+])
+def test_compact_keeps_the_optimum(name, lines):
+    expected = _optimum(name, lines)
+    assert expected is not None
+    assert _optimum(f"{name}-compact", lines) == expected
+
+
+def test_compact_splits_the_ghost_turn():
+    domain, problem = get_encoding("SAT-compact").generate(EnhancedGameMap(GB))
+    assert "ghost-turn-north" in domain and "ghost-step-" in problem
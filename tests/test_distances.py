@@ -0,0 +1,81 @@
+import glob
+import os
+from collections import deque
+
+import pytest
+
+from flia import distances
+from flia.distances import UNREACHABLE, DistanceTable, distance_table
+from flia.game_map import DIRECTION_DELTAS, EnhancedGameMap
+from flia.ice import MOVE, SLIDE, DOUBLE
+from flia.mapgen import generate_map
+
+from .test_ice import _slide
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BOARDS = [os.path.basename(p) for p in sorted(glob.glob(os.path.join(REPO_DIR, "ent*.txt")))] + [
+    generate_map(7, 5, ghosts="B", ice=3, seed=5),
+    generate_map(8, 6, ghosts="GB", portals=True, seed=1),
+    generate_map(8, 6, ghosts="B", portals=True, ice=4, seed=3),
+]
+
+
+def _game_map(board, load_map):
+    return load_map(board) if isinstance(board, str) else EnhancedGameMap(board)
+
+
+def _bfs(game_map, source):
+    """Distancias de ``source`` andando pelo grid, sem a tabela de deslizes."""
+    portals = list(game_map.portals) if len(game_map.portals) == 2 else []
+    dist = {source: 0}
+    queue = deque([source])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in DIRECTION_DELTAS:
+            move = _slide(game_map, x, y, dx, dy)
+            if move is None or move[0] not in (MOVE, SLIDE, DOUBLE):
+                continue
+            to = move[2]
+            if move[0] == MOVE and to in portals:
+                to = portals[1 - portals.index(to)]
+            if to not in dist:
+                dist[to] = dist[(x, y)] + 1
+                queue.append(to)
+    return dist
+
+
+@pytest.mark.parametrize("board", BOARDS)
+@pytest.mark.parametrize("dense", [True, False])
+def test_distances_match_bfs(board, dense, load_map):
+    if dense:
+        pytest.importorskip("numpy")
+    game_map = _game_map(board, load_map)
+    table = DistanceTable(game_map, dense=dense)
+    cells = game_map.cells
+    for a, pos in enumerate(cells):
+        dist = _bfs(game_map, pos)
+        for b, other in enumerate(cells):
+            assert table.distance(a, b) == dist.get(other, UNREACHABLE)
+
+
+def test_via_and_nearest_via(load_map):
+    table = DistanceTable(load_map("ent.txt"))
+    a, b, c = 0, table.size // 2, table.size - 1
+    assert table.via(a, b, c) == table.distance(a, b) + table.distance(b, c)
+    assert table.nearest_via(a, [b, c], c) == min(table.via(a, b, c), table.distance(a, c))
+    assert table.nearest_via(a, [], c) == UNREACHABLE
+
+
+def test_distance_table_is_reused(load_map, cache_dir, monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(distances, "_tables", type(distances._tables)())
+    game_map = load_map("ent.txt")
+    table = distance_table(game_map)
+    assert distance_table(game_map) is table
+    assert os.listdir(cache_dir / "distances") == [f"{distances.map_key(game_map)}.npy"]
+
+    # Fora da memoria a matriz volta do disco.
+    distances._tables.clear()
+    again = distance_table(game_map)
+    assert again is not table
+    assert np.array_equal(again.matrix, table.matrix)
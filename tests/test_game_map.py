@@ -0,0 +1,48 @@
+import glob
+import os
+
+import pytest
+
+from flia.game_map import DIRECTION_DELTAS, DIRECTION_NAMES, EnhancedGameMap
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAPS = sorted(os.path.basename(p) for p in glob.glob(os.path.join(REPO_DIR, "ent*.txt")))
+
+# Linhas de tamanhos diferentes: a celula (4, 1) nao tem vizinha a sul.
+RAGGED = ["######",
+          "#P  $#",
+          "# B#",
+          "####"]
+
+
+def _free(game_map, x, y):
+    grid = game_map.grid
+    return 0 <= y < len(grid) and 0 <= x < len(grid[y]) and grid[y][x] != "#"
+
+
+def _check(game_map):
+    for i, (x, y) in enumerate(game_map.cells):
+        for d, (dx, dy) in enumerate(DIRECTION_DELTAS):
+            expected = (x + dx, y + dy) if _free(game_map, x + dx, y + dy) else None
+            j = game_map.neighbor_id(i, d)
+            assert (game_map.cells[j] if j >= 0 else None) == expected
+            assert game_map.get_neighbor(x, y, DIRECTION_NAMES[d]) == expected
+
+
+@pytest.mark.parametrize("name", MAPS)
+def test_neighbor_table_matches_grid(name, load_map):
+    _check(load_map(name))
+
+
+def test_neighbor_table_on_ragged_lines():
+    game_map = EnhancedGameMap(RAGGED)
+    _check(game_map)
+    assert game_map.get_neighbor(4, 1, "south") is None
+
+
+def test_get_neighbor_outside_the_cells():
+    game_map = EnhancedGameMap(RAGGED)
+    # Parede: cai na checagem direta do grid.
+    assert game_map.get_neighbor(0, 1, "east") == (1, 1)
+    assert game_map.get_neighbor(0, 1, "west") is None
+    assert game_map.get_neighbor(1, 1, "up") is None
@@ -0,0 +1,21 @@
+import pytest
+
+from flia.encodings import get_encoding
+from flia.game_map import EnhancedGameMap
+from flia.mapgen import generate_map
+
+from .pddl import Task
+from .test_native import RED_FIRST
+
+BOARDS = [RED_FIRST,
+          generate_map(7, 5, ghosts="RB", portals=True, seed=12),
+          generate_map(7, 5, ghosts="RGB", seed=3)]
+
+
+def _optimum(name, lines):
+    return Task(*get_encoding(name).generate(EnhancedGameMap(lines))).optimum()
+
+
+@pytest.mark.parametrize("lines", BOARDS)
+def test_grounded_matches_sat(lines):
+    assert _optimum("SAT-grounded", lines) == _optimum("SAT", lines)
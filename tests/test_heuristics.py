@@ -0,0 +1,66 @@
+import pytest
+
+from flia.game_map import EnhancedGameMap
+from flia.heuristics import HuntHeuristic
+from flia.mapgen import generate_map
+from flia.native import GameRules, LETTERS, solve
+from flia.reachability import prune_unreachable
+
+# (largura, altura, opcoes de generate_map), todos resolviveis e pequenos o
+# bastante para a busca de custo uniforme.
+MAPS = [
+    (6, 6, dict(ghosts="GB", seed=0)),
+    (7, 6, dict(ghosts="RB", seed=2)),
+    (7, 7, dict(ghosts="GG", seed=2)),
+    (7, 7, dict(ghosts="BG", pastilhas=0.5, seed=0)),
+    (7, 7, dict(ghosts="RGB", ice=2, seed=0)),
+    (8, 6, dict(ghosts="GB", portals=True, seed=1)),
+]
+
+
+def _uniform_cost(game_map):
+    return solve(game_map, optimal=True, heuristic=lambda rules, state: 0)
+
+
+@pytest.mark.parametrize("width, height, options", MAPS)
+@pytest.mark.parametrize("tour", [True, False])
+def test_hunt_heuristic_is_admissible(width, height, options, tour):
+    game_map = EnhancedGameMap(generate_map(width, height, **options))
+    plan = _uniform_cost(game_map)
+    assert plan is not None
+    moves, _, optimum = plan.rpartition(";")
+    rules = GameRules(prune_unreachable(game_map))
+    heuristic = HuntHeuristic(rules, tour=tour)
+
+    # Ao longo do plano otimo, h nunca passa do custo que ainda falta.
+    state, left = rules.initial_state(), int(optimum)
+    for letter in moves.split(";"):
+        assert heuristic(rules, state) <= left
+        cost, state = rules.apply(state, LETTERS.index(letter))
+        left -= cost
+    assert left == 0 and heuristic(rules, state) == 0
+
+    astar = solve(game_map, optimal=True, heuristic=heuristic)
+    assert astar.rpartition(";")[2] == optimum
+
+
+def test_pattern_table_matches_tour():
+    pytest.importorskip("numpy")
+    game_map = prune_unreachable(EnhancedGameMap(generate_map(7, 7, ghosts="GG", seed=2)))
+    rules = GameRules(game_map)
+    heuristic = HuntHeuristic(rules)
+    stored = HuntHeuristic(rules, patterns=heuristic.pattern_table())
+    state = rules.initial_state()
+    for d, _, child in rules.successors(state):
+        assert stored(rules, child) == heuristic(rules, child)
+    assert stored(rules, state) == heuristic(rules, state)
+
+
+def test_missing_fruit_is_a_dead_end():
+    rules = GameRules(EnhancedGameMap(["#######",
+                                       "#P G G#",
+                                       "#  @  #",
+                                       "#######"]))
+    heuristic = HuntHeuristic(rules)
+    pacman, ghosts, alive, active, fruits, points, step = rules.initial_state()
+    assert heuristic(rules, (pacman, ghosts, alive, active, 0, points, step)) >= 10 ** 6
@@ -0,0 +1,67 @@
+import pytest
+
+from flia.encodings import get_encoding
+from flia.game_map import DIRECTION_DELTAS, EnhancedGameMap
+from flia.ice import BOUNCE, DOUBLE, DUMMY, MOVE, SLIDE, slide_table
+from flia.mapgen import generate_map
+from flia.native import solve
+
+from .pddl import Task
+
+# Dois gelos seguidos a leste do Pac-Man e um gelo colado na parede a norte.
+DOUBLE_ICE = ["#######",
+              "##I  B#",
+              "#PII $#",
+              "#######"]
+ICE_BOARDS = [DOUBLE_ICE] + [generate_map(7, 5, ghosts="B", ice=3, seed=seed) for seed in range(8)]
+
+
+def _slide(game_map, x, y, dx, dy):
+    """Movimento andando pelo grid, uma celula por vez."""
+    def free(x, y):
+        return (x, y) in game_map.cell_id
+
+    def ice(x, y):
+        return (x, y) in game_map.ice
+
+    if not free(x + dx, y + dy):
+        return None if ice(x, y) else (DUMMY, (), (x, y))
+    x1, y1 = x + dx, y + dy
+    if not ice(x1, y1):
+        return MOVE, (), (x1, y1)
+    x2, y2 = x1 + dx, y1 + dy
+    if not free(x2, y2):
+        return BOUNCE, (), (x, y)
+    if not ice(x2, y2):
+        return SLIDE, ((x1, y1),), (x2, y2)
+    if not free(x2 + dx, y2 + dy):
+        return None
+    return DOUBLE, ((x1, y1), (x2, y2)), (x2 + dx, y2 + dy)
+
+
+@pytest.mark.parametrize("lines", ICE_BOARDS)
+def test_slide_table_matches_grid_walk(lines):
+    game_map = EnhancedGameMap(lines)
+    cells = game_map.cells
+    table = slide_table(game_map)
+    for c, (x, y) in enumerate(cells):
+        for d, (dx, dy) in enumerate(DIRECTION_DELTAS):
+            entry = table[4 * c + d]
+            if entry is not None:
+                kind, crossed, to = entry
+                entry = kind, tuple(cells[i] for i in crossed), cells[to]
+            assert entry == _slide(game_map, x, y, dx, dy)
+
+
+def test_double_slide():
+    game_map = EnhancedGameMap(DOUBLE_ICE)
+    kinds = {entry[0] for entry in slide_table(game_map) if entry is not None}
+    assert kinds == {MOVE, DUMMY, BOUNCE, SLIDE, DOUBLE}
+
+
+@pytest.mark.parametrize("seed", [0, 4, 5])
+def test_native_ice_matches_sat(seed):
+    lines = ICE_BOARDS[seed + 1]
+    plan = solve(EnhancedGameMap(lines), optimal=True)
+    sat = Task(*get_encoding("SAT").generate(EnhancedGameMap(lines))).optimum()
+    assert int(plan.rpartition(";")[2]) == sat
@@ -0,0 +1,39 @@
+from flia.encodings import get_encoding
+from flia.game_map import EnhancedGameMap
+from flia.native import solve
+from flia.validate import validate_plan
+
+from .pddl import Task
+
+# Com a fruta vermelha o Pac-Man alcanca o vermelho antes de ele andar; no
+# SAT o vermelho ainda deve o move-red e o azul esta vivo, entao nao morre ali.
+RED_FIRST = ["######",
+             "##B$##",
+             "#O# R#",
+             "#OP!##",
+             "######"]
+
+
+def test_solve_plans_replay(load_map):
+    for name in ("ent.txt", "entG.txt"):
+        game_map = load_map(name)
+        for optimal in (False, True):
+            plan = solve(game_map, optimal=optimal)
+            assert plan is not None
+            assert validate_plan(game_map, plan)[1] is None
+
+
+def test_red_waits_for_its_move():
+    plan = solve(EnhancedGameMap(RED_FIRST), optimal=True)
+    moves, _, cost = plan.rpartition(";")
+    sat = Task(*get_encoding("SAT").generate(EnhancedGameMap(RED_FIRST)))
+    assert sat.optimum() == int(cost) == 16
+    assert sat.replay(moves.split(";")) == 16
+
+
+def test_greedy_crosses_corridors_by_default(load_map):
+    # Celula a celula a gulosa passa de 300k expansoes no ent7.txt.
+    game_map = load_map("ent7.txt")
+    plan = solve(game_map, max_expansions=300000)
+    assert plan is not None
+    assert validate_plan(game_map, plan)[1] is None
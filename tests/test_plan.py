@@ -0,0 +1,61 @@
+from flia.plan import PlanReader, action_direction, extract_moves
+
+# Duas solucoes de uma configuracao anytime do Fast Downward.
+ANYTIME = """\
+Solution found!
+move-east c1 c2 (1)
+move-red c3 c4 (0)
+kill-ghost-red g1 c2 (0)
+move-south c2 c5 (1)
+Plan length: 4 step(s).
+Plan cost: 22
+Expanded 120 state(s).
+Solution found!
+dummy-move-east c1 c2 (1)
+Plan length: 1 step(s).
+Plan cost: 18
+Expanded 340 state(s).
+Search time: 0.25s
+Peak memory: 41220 KB
+"""
+
+
+def test_action_direction_formats():
+    assert action_direction("move-north c1 c2 (1)") == "N"
+    assert action_direction("(slide-west c1 c2)") == "W"
+    assert action_direction("STEP 3: dummy-move-south(c1,c2)") == "S"
+    assert action_direction("move-red-east c1 c2 (0)") is None
+    assert action_direction("move-portal c1 c2 (0)") is None
+    assert action_direction("Plan cost: 3") is None
+
+
+def test_reader_returns_each_plan_as_it_closes():
+    reader = PlanReader()
+    closed = [plan for plan in map(reader.feed, ANYTIME.splitlines()) if plan is not None]
+    assert closed == ["E;S;22", "E;18"]
+    assert reader.close() == reader.best == "E;18"
+    assert not reader.uncosted
+    assert reader.stats == {"plan_length": 1, "expanded": 340, "search_time": 0.25,
+                            "peak_memory_kb": 41220}
+
+
+def test_reader_without_cost():
+    reader = PlanReader(with_cost=False)
+    for line in ANYTIME.splitlines():
+        reader.feed(line)
+    assert reader.best == "E;0"
+
+
+def test_uncosted_plan_closes_at_the_end():
+    reader = PlanReader()
+    for line in ("STEP 0: move-north(c1,c2)", "STEP 1: move-east(c2,c3)"):
+        assert reader.feed(line) is None
+    assert reader.best is None
+    assert reader.close() == "N;E;0"
+    assert reader.uncosted
+
+
+def test_extract_moves_matches_the_reader():
+    assert extract_moves(ANYTIME) == "E;18"
+    assert extract_moves(ANYTIME, with_cost=False) == "E;0"
+    assert extract_moves("") == ";0"
@@ -0,0 +1,62 @@
+import pytest
+
+from flia.encodings import get_encoding
+from flia.game_map import EnhancedGameMap
+from flia.reachability import UnsolvableMap, check_killable, prune_unreachable
+
+from .pddl import Task
+
+# Dois fantasmas verdes e uma so fruta verde: no SAT cada morte gasta a
+# fruta ativa; no movG a fruta continua ativa.
+TWO_GREEN = ["#######",
+             "#P G G#",
+             "#  @  #",
+             "#######"]
+
+
+def test_walled_off_cells_are_pruned():
+    game_map = EnhancedGameMap(["#######",
+                                "#P  $B#",
+                                "#######",
+                                "# * @ #",
+                                "#######"])
+    pruned = prune_unreachable(game_map)
+    assert "".join(pruned.grid[3]) == "#######"
+    assert len(pruned.cells) == 5 and len(pruned.fruits) == 1
+
+
+def test_unreachable_ghost_is_unsolvable():
+    game_map = EnhancedGameMap(["#######",
+                                "#P  $ #",
+                                "#######",
+                                "#  B  #",
+                                "#######"])
+    with pytest.raises(UnsolvableMap):
+        prune_unreachable(game_map)
+    assert "".join(prune_unreachable(game_map, check=False).grid[3]) == "#  B  #"
+
+
+def test_three_portals_stay_inert():
+    # Com tres portais nenhum liga; cortar o isolado ligaria os outros dois.
+    game_map = EnhancedGameMap(["#######",
+                                "#PO$BO#",
+                                "#######",
+                                "# O * #",
+                                "#######"])
+    pruned = prune_unreachable(game_map)
+    assert len(pruned.portals) == 3
+    assert "".join(pruned.grid[3]) == "##O####"
+
+
+def test_fruit_per_kill_only_for_native_encodings():
+    game_map = EnhancedGameMap(TWO_GREEN)
+    with pytest.raises(UnsolvableMap):
+        check_killable(game_map)
+    check_killable(game_map, per_kill=False)
+
+    assert get_encoding("SAT").native is not None
+    assert Task(*get_encoding("SAT").generate(game_map)).optimum() is None
+    movg = get_encoding("movG")
+    assert movg.native is None
+    game_map = prune_unreachable(EnhancedGameMap(TWO_GREEN), per_kill=movg.native is not None)
+    assert Task(*movg.generate(game_map)).optimum() is not None
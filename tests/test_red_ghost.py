@@ -0,0 +1,47 @@
+import glob
+import os
+
+import pytest
+
+from flia.game_map import DIRECTION_NAMES
+from flia.red_ghost import detect_cycle_in_red_ghost_movement, red_ghost_table, simulate_red_ghost_move
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAPS = sorted(os.path.basename(p) for p in glob.glob(os.path.join(REPO_DIR, "ent*.txt")))
+
+
+def _walk(pos, direction, game_map):
+    """Prefixo e ciclo andando passo a passo, sem a tabela."""
+    seen, moves = {}, []
+    while (pos, direction) not in seen:
+        seen[(pos, direction)] = len(moves)
+        new_pos, direction = simulate_red_ghost_move(pos, direction, game_map)
+        moves.append((pos, new_pos))
+        pos = new_pos
+    k = seen[(pos, direction)]
+    return moves[:k], moves[k:]
+
+
+@pytest.mark.parametrize("name", MAPS)
+def test_table_matches_step_by_step_walk(name, load_map):
+    game_map = load_map(name)
+    table = red_ghost_table(game_map)
+    cell_id = game_map.cell_id
+    for i, pos in enumerate(game_map.cells):
+        for heading, direction in enumerate(DIRECTION_NAMES):
+            prefix, cycle = _walk(pos, direction, game_map)
+            assert table.prefix_length(i, heading) == len(prefix)
+            assert table.cycle_length(i, heading) == len(cycle)
+            moves = prefix + cycle + cycle
+            for t, (_, to) in enumerate(moves, 1):
+                assert table.cell_at(i, heading, t) == cell_id[to]
+            assert detect_cycle_in_red_ghost_movement(pos, direction, game_map) == (prefix, cycle)
+
+
+def test_long_trajectory_is_cut_at_max_steps(load_map):
+    game_map = load_map("ent.txt")
+    pos = game_map.cells[0]
+    prefix, cycle = _walk(pos, "east", game_map)
+    steps = len(prefix) + len(cycle) - 1
+    assert detect_cycle_in_red_ghost_movement(pos, "east", game_map, max_steps=steps) == \
+        ((prefix + cycle)[:steps], [])
@@ -0,0 +1,51 @@
+import glob
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from flia.native import GameRules  # noqa: E402
+from flia.rollout import RolloutEngine  # noqa: E402
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAPS = sorted(os.path.basename(p) for p in glob.glob(os.path.join(REPO_DIR, "ent*.txt")))
+
+
+def _play(rules, sequence):
+    """Joga ``sequence`` com GameRules.apply como RolloutEngine.run joga uma
+    linha: para no objetivo ou no primeiro movimento recusado."""
+    state, cost, failed = rules.initial_state(), 0, False
+    for d in sequence:
+        if rules.is_goal(state):
+            break
+        result = rules.apply(state, int(d))
+        if result is None:
+            failed = True
+            break
+        cost += result[0]
+        state = result[1]
+    return state, cost, failed
+
+
+@pytest.mark.parametrize("name", MAPS)
+def test_rollouts_match_game_rules(name, load_map):
+    game_map = load_map(name)
+    rules = GameRules(game_map)
+    engine = RolloutEngine(game_map, rules)
+    sequences, batch = engine.random_rollouts(300, 60, rng=np.random.default_rng(7))
+    for row, sequence in enumerate(sequences):
+        state, cost, failed = _play(rules, sequence)
+        assert batch.state(row) == state
+        assert int(batch.cost[row]) == cost
+        assert bool(batch.failed[row]) == failed
+        assert bool(batch.goal[row]) == rules.is_goal(state)
+
+
+def test_rollout_replays_a_plan(load_map):
+    game_map = load_map("ent.txt")
+    engine = RolloutEngine(game_map)
+    plan = [["NSEW".index(m) for m in "S;S;E;E;E;E;S;W".split(";")]]
+    batch = engine.run(np.array(plan, np.int8))
+    assert bool(batch.goal[0]) and not bool(batch.failed[0])
+    assert int(batch.cost[0]) == 18
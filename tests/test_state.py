@@ -0,0 +1,43 @@
+import glob
+import os
+import random
+
+import pytest
+
+from flia.native import GameRules
+from flia.state import StateCodec
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAPS = sorted(os.path.basename(p) for p in glob.glob(os.path.join(REPO_DIR, "ent*.txt")))
+
+
+@pytest.mark.parametrize("name", MAPS)
+def test_codec_round_trip_on_reachable_states(name, load_map):
+    rules = GameRules(load_map(name))
+    codec = rules.codec
+    seen, frontier = {}, [rules.initial_state()]
+    while frontier and len(seen) < 3000:
+        state = frontier.pop()
+        key = codec.pack(state)
+        if key in seen:
+            assert seen[key] == state
+            continue
+        seen[key] = state
+        assert codec.unpack(key) == state
+        assert key < 1 << codec.bits
+        frontier.extend(child for _, _, child in rules.successors(state))
+
+
+def test_codec_round_trip_at_the_limits(load_map):
+    game_map = load_map("entRPI.txt")
+    codec = StateCodec(game_map, red_steps=37)
+    n, ghosts = len(game_map.cells), len(game_map.ghosts)
+    rng = random.Random(3)
+    corners = [(n - 1, (n - 1,) * ghosts, (1 << ghosts) - 1, 7, (1 << len(game_map.fruits)) - 1,
+                (1 << len(game_map.points)) - 1, 36),
+               (0, (0,) * ghosts, 0, 0, 0, 0, 0)]
+    randoms = [(rng.randrange(n), tuple(rng.randrange(n) for _ in range(ghosts)),
+                rng.getrandbits(ghosts), rng.getrandbits(3), rng.getrandbits(len(game_map.fruits)),
+                rng.getrandbits(len(game_map.points)), rng.randrange(37)) for _ in range(500)]
+    for state in corners + randoms:
+        assert codec.unpack(codec.pack(state)) == state
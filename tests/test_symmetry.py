@@ -0,0 +1,62 @@
+import types
+
+import pytest
+
+from flia.cache import plan_key, store_plan
+from flia.encodings import get_encoding
+from flia.game_map import EnhancedGameMap
+from flia.native import solve
+from flia.symmetry import (SYMMETRIES, cached_symmetric_plan, grid_key, transform_lines,
+                           transform_moves, valid_symmetries)
+from flia.validate import validate_plan
+
+NAMES = [name for name, _, _ in SYMMETRIES]
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_plan_maps_back(name, load_map):
+    # O plano otimo da imagem, trazido de volta, resolve o original com o
+    # mesmo custo.
+    game_map = load_map("entG.txt")
+    image = EnhancedGameMap(transform_lines(game_map.grid, name))
+    moves, _, cost = solve(image, optimal=True).rpartition(";")
+    back = transform_moves(moves, name, inverse=True)
+    _, error = validate_plan(game_map, f"{back};{cost}")
+    assert error is None
+    assert solve(game_map, optimal=True).rpartition(";")[2] == cost
+
+
+def test_transforms_compose_to_identity(load_map):
+    grid = load_map("entG.txt").grid
+    lines = ["".join(row) for row in grid]
+    for name in NAMES:
+        twice = transform_lines(transform_lines(grid, name), name)
+        if name in ("rotate-90", "rotate-270"):
+            twice = transform_lines(transform_lines(twice, name), name)
+        assert twice == lines
+
+
+def test_red_trajectory_limits_symmetries(load_map):
+    assert [name for name, _ in valid_symmetries(load_map("entR.txt"))] == ["identity"]
+
+
+def test_symmetric_lookup_generates_only_on_a_hit(load_map):
+    sat = get_encoding("SAT")
+    calls = []
+
+    def generate(game_map):
+        calls.append(game_map)
+        return sat.generate(game_map)
+
+    encoding = types.SimpleNamespace(name="SAT", generate=generate, red_schedule=True)
+    game_map = load_map("entG.txt")
+    assert cached_symmetric_plan(encoding, game_map) is None
+    assert calls == []
+
+    image = EnhancedGameMap(transform_lines(game_map.grid, "rotate-90"))
+    moves, _, cost = solve(image, optimal=True).rpartition(";")
+    store_plan(plan_key("SAT", *sat.generate(image)), moves, int(cost), True, "teste",
+               grid=grid_key("SAT", image.grid, image.pastilhas))
+    entry = cached_symmetric_plan(encoding, game_map)
+    assert len(calls) == 1 and entry["symmetry"] == "rotate-90"
+    assert validate_plan(game_map, f"{entry['moves']};{cost}")[1] is None
@@ -0,0 +1,46 @@
+from flia.game_map import EnhancedGameMap
+from flia.validate import validate_plan
+
+from .test_native import RED_FIRST
+
+# Plano otimo de ent.txt: pega a fruta azul e mata o fantasma.
+ENT_PLAN = "S;S;E;E;E;E;S;W;18"
+
+# O Pac-Man comeca ao lado de um fantasma vermelho, sem fruta ativa.
+COLLISION = ["#######",
+             "#PR   #",
+             "#   ! #",
+             "#######"]
+
+
+def test_validate_accepts_known_plan(load_map):
+    result, error = validate_plan(load_map("ent.txt"), ENT_PLAN)
+    assert error is None
+    assert result.ok and result.cost == 18
+    assert [colour for _, _, colour in result.kills] == ["B"]
+
+
+def test_validate_rejects_wrong_cost(load_map):
+    _, error = validate_plan(load_map("ent.txt"), "S;S;E;E;E;E;S;W;17")
+    assert error == "custo informado 17, recalculado 18"
+
+
+def test_validate_rejects_collision():
+    result, error = validate_plan(EnhancedGameMap(COLLISION), "E;2")
+    assert not result.ok
+    assert result.step == 0
+    assert "pego por um fantasma" in error
+
+
+def test_validate_rejects_unfinished_plan(load_map):
+    _, error = validate_plan(load_map("ent.txt"), "S;S;E;4")
+    assert error == "os movimentos terminam com fantasmas vivos"
+
+
+def test_validate_rejects_red_killed_before_its_move():
+    # Plano que as regras antigas aceitavam: o N do passo 1 matava o
+    # vermelho antes do move-red, com o azul ainda vivo.
+    result, error = validate_plan(EnhancedGameMap(RED_FIRST), "E;N;N;W;12")
+    assert not result.ok and result.step == 2
+    assert result.kills == []
+    assert "pego por um fantasma" in error